@@ -1,32 +1,48 @@
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
+import json
 import os
 import sys
+import threading
+import time
 
 # Add the project root to sys.path for absolute imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.skill_scorer import MicroSkillScorer
-from models.benchmark_comparator import BenchmarkComparator
-from data.grid_client import GRIDClient
-from data.etl_pipeline import MicroSkillETL
-import pandas as pd
-from sqlalchemy import create_engine
+from api.components import COMPONENT_NAMES, AppComponents
+from data.queries import read_query
+from api.serialization import frame_payload, frame_response, json_response, records_response
+from api.profiling import init_profiling
 
-app = Flask(__name__)
-CORS(app)
+routes = Blueprint('micromentor', __name__)
 
-scorer = MicroSkillScorer()
-comparator = BenchmarkComparator()
-grid_client = GRIDClient()
-etl = MicroSkillETL()
+# Latest snapshot per live match, pushed by data/live_ingestion.py; a match
+# leaves once its final snapshot is loaded, or after LIVE_SNAPSHOT_TTL_SECONDS
+# without a push if its feed never finishes
+live_snapshots = {}
+live_lock = threading.Lock()
 
-# Database engine
-db_url = os.getenv('DATABASE_URL', 'sqlite:///micromentor.db')
-engine = create_engine(db_url)
+# Roster report jobs by id; each runs on a background thread
+report_jobs = {}
+report_lock = threading.Lock()
 
 
-@app.route('/', methods=['GET'])
+def create_app(components: AppComponents = None) -> Flask:
+    """Build the Flask app; scorer, comparator, ETL and engine are created on first use"""
+    app = Flask(__name__)
+    CORS(app)
+    app.extensions['micromentor'] = components or AppComponents()
+    app.register_blueprint(routes)
+    init_profiling(app)
+    return app
+
+
+def components() -> AppComponents:
+    """Shared components of the app serving the current request"""
+    return current_app.extensions['micromentor']
+
+
+@routes.route('/', methods=['GET'])
 def index():
     return jsonify({
         'name': 'MicroMentor API',
@@ -39,22 +55,25 @@ def index():
             'trends': '/api/players/<player_id>/trends',
             'insights': '/api/players/<player_id>/insights',
             'macro_review': '/api/players/<player_id>/macro-review',
-            'hypothetical': '/api/players/<player_id>/hypothetical'
+            'hypothetical': '/api/players/<player_id>/hypothetical',
+            'profiles': '/api/profiles',
+            'ingestion_runs': '/api/ingestion/runs',
+            'champion_matchups': '/api/champions/<champion>/matchups'
         }
     })
 
 
-@app.route('/favicon.ico')
+@routes.route('/favicon.ico')
 def favicon():
     return '', 204
 
 
-@app.route('/api/health', methods=['GET'])
+@routes.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'version': '1.0.0'})
 
 
-@app.route('/api/players/<player_id>/profile', methods=['GET'])
+@routes.route('/api/players/<player_id>/profile', methods=['GET'])
 def get_player_profile(player_id):
     """Get complete player profile with micro-skills"""
     try:
@@ -69,10 +88,8 @@ def get_player_profile(player_id):
             })
 
         # Try to get from database first
-        query = "SELECT * FROM player_micro_skills WHERE player_id = %s LIMIT 1"
         try:
-            # Using parameter substitution to avoid SQL injection
-            df = pd.read_sql(query, engine, params=(player_id,))
+            df = read_query('player_profile', components().engine, player_id=player_id)
             if not df.empty:
                 row = df.iloc[0]
                 player_data = {
@@ -101,14 +118,13 @@ def get_player_profile(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/micro-skills', methods=['GET'])
+@routes.route('/api/players/<player_id>/micro-skills', methods=['GET'])
 def get_micro_skills(player_id):
     """Get detailed micro-skill breakdown"""
     try:
         # Try to get average stats from database
-        query = "SELECT * FROM player_micro_skills WHERE player_id = %s"
         try:
-            df = pd.read_sql(query, engine, params=(player_id,))
+            df = read_query('player_rows', components().engine, player_id=player_id)
             if not df.empty:
                 # Calculate means for the player
                 stats = df.mean(numeric_only=True).to_dict()
@@ -116,7 +132,7 @@ def get_micro_skills(player_id):
                 # Fetch role-specific benchmarks to calculate actual percentiles
                 role = df.iloc[0]['role']
                 
-                benchmarks = comparator.calculate_role_benchmarks(role)
+                benchmarks = components().comparator.calculate_role_benchmarks(role)
                 
                 # Import json and os if not already at top, but they are.
                 import json
@@ -150,13 +166,13 @@ def get_micro_skills(player_id):
                             elif f"{skill_id}_percentile" not in stats:
                                 stats[f"{skill_id}_percentile"] = 70
                 
-                breakdown = scorer.get_skill_breakdown(stats)
+                breakdown = components().scorer.get_skill_breakdown(stats)
                 return jsonify(breakdown)
         except Exception as db_err:
             print(f"Database error: {db_err}")
 
         # Mock breakdown data for demo if DB is empty
-        breakdown = scorer.get_skill_breakdown({
+        breakdown = components().scorer.get_skill_breakdown({
             'cs_at_10': 85,
             'cs_at_10_percentile': 75,
             'gold_diff_at_10': 150,
@@ -177,12 +193,12 @@ def get_micro_skills(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/benchmarks', methods=['GET'])
+@routes.route('/api/players/<player_id>/benchmarks', methods=['GET'])
 def get_benchmarks(player_id):
     """Compare player to role benchmarks"""
     try:
         role = request.args.get('role', 'mid')
-        comparison = comparator.compare_to_role(player_id, role)
+        comparison = components().comparator.compare_to_role(player_id, role)
         
         return jsonify(comparison)
     
@@ -190,38 +206,24 @@ def get_benchmarks(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/similar', methods=['GET'])
+@routes.route('/api/players/<player_id>/similar', methods=['GET'])
 def get_similar_players(player_id):
     """Find similar players"""
     try:
         top_n = int(request.args.get('top_n', 5))
-        similar = comparator.find_similar_players(player_id, top_n)
+        similar = components().comparator.find_similar_players(player_id, top_n)
         
-        return jsonify(similar)
+        return records_response(similar)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/trends', methods=['GET'])
+@routes.route('/api/players/<player_id>/trends', methods=['GET'])
 def get_player_trends(player_id):
     """Get player performance trends over time with enhanced data"""
     try:
-        query = f"""
-            SELECT 
-                created_at as game_date,
-                cs_at_10,
-                vision_score_per_min,
-                kill_participation,
-                kda,
-                game_result,
-                champion
-            FROM player_micro_skills
-            WHERE player_id = '{player_id}'
-            ORDER BY created_at ASC
-            LIMIT 20
-        """
-        df = pd.read_sql(query, engine)
+        df = read_query('player_trends', components().engine, player_id=player_id)
         
         if df.empty:
             # Enhanced mock trends
@@ -241,25 +243,18 @@ def get_player_trends(player_id):
                     'game_result': random.choice(['WIN', 'LOSS']),
                     'champion': random.choice(champions)
                 })
-            return jsonify(trends)
+            return records_response(trends)
             
-        return jsonify(df.to_dict('records'))
+        return frame_response(df)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/insights', methods=['GET'])
+@routes.route('/api/players/<player_id>/insights', methods=['GET'])
 def get_player_insights(player_id):
     """Generate automated performance insights with data-backed feedback"""
     try:
-        query = """
-            SELECT cs_at_10, vision_score_per_min, kill_participation, kda, created_at as game_date, gold_diff_at_10
-            FROM player_micro_skills
-            WHERE player_id = %s
-            ORDER BY created_at DESC
-            LIMIT 20
-        """
-        df = pd.read_sql(query, engine, params=(player_id,))
+        df = read_query('player_recent_form', components().engine, player_id=player_id)
         
         insights = []
         if df.empty:
@@ -333,19 +328,12 @@ def get_player_insights(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/macro-review', methods=['GET'])
+@routes.route('/api/players/<player_id>/macro-review', methods=['GET'])
 def get_macro_review(player_id):
     """Generate an automated Game Review Agenda based on concluded match data"""
     try:
         # Fetch last match data
-        query = """
-            SELECT match_id, champion, game_result, cs_at_10, gold_diff_at_10, kda, tower_damage_contribution, first_blood_participation
-            FROM player_micro_skills
-            WHERE player_id = %s
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        df = pd.read_sql(query, engine, params=(player_id,))
+        df = read_query('player_last_match', components().engine, player_id=player_id)
         
         if df.empty:
             # Automated Macro Review from official doc examples
@@ -391,59 +379,71 @@ def get_macro_review(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/hypothetical', methods=['POST'])
-def get_hypothetical_prediction(player_id):
-    """Answer 'what if' questions about past strategic decisions"""
-    try:
-        data = request.json
-        question = data.get('question', '').lower()
-        
-        # Simple AI-like reasoning for 'what if' questions based on the document examples
-        scenarios = []
-        if 'drake' in question or 'dragon' in question:
-            prediction = "Analyzing the game state (gold, items, levels, vision, other objectives)... 85% probability of 2 turret kills and +200 XP advantage per player if conceded, versus 22% probability of winning the fight. Saving weapons/HP was the superior strategic choice."
-            scenarios = [
-                {"label": "Scenario A: Concede & Push", "probability": 85, "outcome": "+200 XP/player, 2 Turrets"},
-                {"label": "Scenario B: Force Contest", "probability": 22, "outcome": "High wipe risk, objective coinflip"},
-                {"label": "Scenario C: Late Rotate", "probability": 38, "outcome": "May secure objective, likely lose 2-3 players"}
-            ]
-        elif 'retake' in question or 'save' in question:
-            prediction = "The 3v5 retake had a 15% probability of success. Conceding the round and saving 3 rifles would have given the team a 60% chance to win the following gun round, versus the 35% chance they had on a broken buy. Saving was the superior strategic choice."
-            scenarios = [
-                {"label": "Scenario A: Concede & Save", "probability": 60, "outcome": "Full buy next round"},
-                {"label": "Scenario B: Force Retake", "probability": 15, "outcome": "Round win unlikely, broken economy"},
-                {"label": "Scenario C: Play for exit kills", "probability": 45, "outcome": "Damage enemy economy, save 1-2 rifles"}
-            ]
-        elif 'baron' in question or 'nashor' in question:
-            if 'bot' in question or 'push' in question:
-                prediction = "Pushing bot lane at 25:30 while Baron was up created a cross-map trade opportunity. However, the enemy team secured Baron in 22 seconds, which is faster than your team could take the Tier-2 tower. Contesting would have been 15% successful, but a 4-1 split with better vision would have given a 55% win probability."
-                scenarios = [
-                    {"label": "Scenario A: 4-1 Split Push", "probability": 55, "outcome": "Tier-2 tower, Mid priority"},
-                    {"label": "Scenario B: Direct Contest", "probability": 15, "outcome": "Low steal chance, likely wipe"},
-                    {"label": "Scenario C: Pushing Bot (Actual)", "probability": 42, "outcome": "Traded Tier-2 for Baron"}
-                ]
-            else:
-                prediction = "Contesting Baron at that state had a 15% success rate. A 4-1 split push would have guaranteed a Tier-2 tower and mid priority, leading to a 55% win probability in the subsequent teamfight."
-                scenarios = [
-                    {"label": "Scenario A: 4-1 Split Push", "probability": 55, "outcome": "Tier-2 tower, Mid priority"},
-                    {"label": "Scenario B: Direct Contest", "probability": 15, "outcome": "Low steal chance, likely wipe"},
-                    {"label": "Scenario C: Bait & Engage", "probability": 42, "outcome": "Possible pick-off before objective"}
-                ]
-        elif 'cs' in question or 'lane' in question:
-            prediction = "If you had focused on the wave instead of the trade at 8:45, you would have entered the first back with +450 gold, enabling a completed core item for the first objective fight."
+def analyze_hypothetical(question: str):
+    """Prediction text and scenario breakdown for a 'what if' question"""
+    question = question.lower()
+    
+    # Simple AI-like reasoning for 'what if' questions based on the document examples
+    scenarios = []
+    if 'drake' in question or 'dragon' in question:
+        prediction = "Analyzing the game state (gold, items, levels, vision, other objectives)... 85% probability of 2 turret kills and +200 XP advantage per player if conceded, versus 22% probability of winning the fight. Saving weapons/HP was the superior strategic choice."
+        scenarios = [
+            {"label": "Scenario A: Concede & Push", "probability": 85, "outcome": "+200 XP/player, 2 Turrets"},
+            {"label": "Scenario B: Force Contest", "probability": 22, "outcome": "High wipe risk, objective coinflip"},
+            {"label": "Scenario C: Late Rotate", "probability": 38, "outcome": "May secure objective, likely lose 2-3 players"}
+        ]
+    elif 'retake' in question or 'save' in question:
+        prediction = "The 3v5 retake had a 15% probability of success. Conceding the round and saving 3 rifles would have given the team a 60% chance to win the following gun round, versus the 35% chance they had on a broken buy. Saving was the superior strategic choice."
+        scenarios = [
+            {"label": "Scenario A: Concede & Save", "probability": 60, "outcome": "Full buy next round"},
+            {"label": "Scenario B: Force Retake", "probability": 15, "outcome": "Round win unlikely, broken economy"},
+            {"label": "Scenario C: Play for exit kills", "probability": 45, "outcome": "Damage enemy economy, save 1-2 rifles"}
+        ]
+    elif 'baron' in question or 'nashor' in question:
+        if 'bot' in question or 'push' in question:
+            prediction = "Pushing bot lane at 25:30 while Baron was up created a cross-map trade opportunity. However, the enemy team secured Baron in 22 seconds, which is faster than your team could take the Tier-2 tower. Contesting would have been 15% successful, but a 4-1 split with better vision would have given a 55% win probability."
             scenarios = [
-                {"label": "Scenario A: Wave Focus", "probability": 72, "outcome": "+450 gold, Core item power spike"},
-                {"label": "Scenario B: Trade/Kill Focus", "probability": 48, "outcome": "Possible kill, high risk of missing 2 waves"},
-                {"label": "Scenario C: Freeze & Call Jungle", "probability": 65, "outcome": "Secure XP lead, safe farm"}
+                {"label": "Scenario A: 4-1 Split Push", "probability": 55, "outcome": "Tier-2 tower, Mid priority"},
+                {"label": "Scenario B: Direct Contest", "probability": 15, "outcome": "Low steal chance, likely wipe"},
+                {"label": "Scenario C: Pushing Bot (Actual)", "probability": 42, "outcome": "Traded Tier-2 for Baron"}
             ]
         else:
-            prediction = "Based on historical data for this role and matchup, the alternative decision had a 65% higher probability of a positive outcome. Detailed simulation suggests better objective priority was needed."
+            prediction = "Contesting Baron at that state had a 15% success rate. A 4-1 split push would have guaranteed a Tier-2 tower and mid priority, leading to a 55% win probability in the subsequent teamfight."
             scenarios = [
-                {"label": "Scenario A: Current Play", "probability": 40, "outcome": "Current result"},
-                {"label": "Scenario B: Alternative Path", "probability": 65, "outcome": "Improved objective priority"},
-                {"label": "Scenario C: Defensive Reset", "probability": 52, "outcome": "Preserve tempo, reset vision"}
+                {"label": "Scenario A: 4-1 Split Push", "probability": 55, "outcome": "Tier-2 tower, Mid priority"},
+                {"label": "Scenario B: Direct Contest", "probability": 15, "outcome": "Low steal chance, likely wipe"},
+                {"label": "Scenario C: Bait & Engage", "probability": 42, "outcome": "Possible pick-off before objective"}
             ]
-            
+    elif 'cs' in question or 'lane' in question:
+        prediction = "If you had focused on the wave instead of the trade at 8:45, you would have entered the first back with +450 gold, enabling a completed core item for the first objective fight."
+        scenarios = [
+            {"label": "Scenario A: Wave Focus", "probability": 72, "outcome": "+450 gold, Core item power spike"},
+            {"label": "Scenario B: Trade/Kill Focus", "probability": 48, "outcome": "Possible kill, high risk of missing 2 waves"},
+            {"label": "Scenario C: Freeze & Call Jungle", "probability": 65, "outcome": "Secure XP lead, safe farm"}
+        ]
+    else:
+        prediction = "Based on historical data for this role and matchup, the alternative decision had a 65% higher probability of a positive outcome. Detailed simulation suggests better objective priority was needed."
+        scenarios = [
+            {"label": "Scenario A: Current Play", "probability": 40, "outcome": "Current result"},
+            {"label": "Scenario B: Alternative Path", "probability": 65, "outcome": "Improved objective priority"},
+            {"label": "Scenario C: Defensive Reset", "probability": 52, "outcome": "Preserve tempo, reset vision"}
+        ]
+    
+    return prediction, scenarios
+
+
+def _sse(event: str, data) -> str:
+    """One server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@routes.route('/api/players/<player_id>/hypothetical', methods=['POST'])
+def get_hypothetical_prediction(player_id):
+    """Answer 'what if' questions about past strategic decisions"""
+    try:
+        data = request.json
+        prediction, scenarios = analyze_hypothetical(data.get('question', ''))
+        
         return jsonify({
             "prediction": prediction,
             "scenarios": scenarios
@@ -452,7 +452,46 @@ def get_hypothetical_prediction(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/improvement-plan', methods=['GET'])
+@routes.route('/api/players/<player_id>/hypothetical/stream', methods=['GET', 'POST'])
+def stream_hypothetical_prediction(player_id):
+    """Server-sent event variant of the hypothetical endpoint
+
+    Emits `scenarios` as soon as they are known, then the prediction as a
+    series of `token` events, then `done`. GET (?question=) serves
+    EventSource clients; POST takes the same JSON body as the plain endpoint.
+    """
+    if request.method == 'POST':
+        question = (request.get_json(silent=True) or {}).get('question', '')
+    else:
+        question = request.args.get('question', '')
+    chunk_words = max(1, request.args.get('chunk_words', 3, type=int))
+
+    def generate():
+        try:
+            prediction, scenarios = analyze_hypothetical(question)
+            yield _sse('scenarios', {'player_id': player_id, 'scenarios': scenarios})
+            words = prediction.split(' ')
+            for start in range(0, len(words), chunk_words):
+                text = ' '.join(words[start:start + chunk_words])
+                if start + chunk_words < len(words):
+                    text += ' '
+                yield _sse('token', {'text': text})
+            yield _sse('done', {'length': len(prediction)})
+        except Exception as e:
+            yield _sse('error', {'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Keep reverse proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@routes.route('/api/players/<player_id>/improvement-plan', methods=['GET'])
 def get_improvement_plan(player_id):
     """Generate personalized improvement plan with priority and success metrics"""
     try:
@@ -507,23 +546,11 @@ def get_improvement_plan(player_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/history', methods=['GET'])
+@routes.route('/api/players/<player_id>/history', methods=['GET'])
 def get_match_history(player_id):
     """Get recent match history with detailed stats"""
     try:
-        query = """
-            SELECT 
-                created_at as game_date,
-                game_result,
-                champion,
-                kda,
-                cs_at_10
-            FROM player_micro_skills
-            WHERE player_id = %s
-            ORDER BY created_at DESC
-            LIMIT 10
-        """
-        df = pd.read_sql(query, engine, params=(player_id,))
+        df = read_query('player_history', components().engine, player_id=player_id)
         
         if df.empty:
             # Mock history
@@ -545,30 +572,18 @@ def get_match_history(player_id):
                     'kda': (k + a) / max(d, 1),
                     'cs_at_10': 75 + random.randint(-10, 15)
                 })
-            return jsonify(history)
+            return records_response(history)
             
-        return jsonify(df.to_dict('records'))
+        return frame_response(df)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/players/<player_id>/champions', methods=['GET'])
+@routes.route('/api/players/<player_id>/champions', methods=['GET'])
 def get_champion_stats(player_id):
     """Get performance breakdown by champion"""
     try:
-        query = """
-            SELECT 
-                champion,
-                COUNT(*) as games,
-                AVG(kda) as avg_kda,
-                AVG(cs_at_10) as avg_cs_at_10,
-                SUM(CASE WHEN game_result = 'WIN' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as win_rate
-            FROM player_micro_skills
-            WHERE player_id = %s
-            GROUP BY champion
-            ORDER BY games DESC
-        """
-        df = pd.read_sql(query, engine, params=(player_id,))
+        df = read_query('player_champions', components().engine, player_id=player_id)
         
         if df.empty:
             # Mock champion stats
@@ -585,63 +600,246 @@ def get_champion_stats(player_id):
                     'win_rate': random.uniform(45, 65),
                     'percentile': random.randint(50, 95)
                 })
-            return jsonify(stats)
+            return records_response(stats)
             
         # In a real app, we'd calculate percentiles here too
-        stats = df.to_dict('records')
-        for s in stats:
-            s['percentile'] = 60 + (s['win_rate'] / 10) # Simple mock percentile
+        df['percentile'] = 60 + (df['win_rate'] / 10) # Simple mock percentile
             
-        return jsonify(stats)
+        return frame_response(df)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@routes.route('/api/champions/<champion>/matchups', methods=['GET'])
+def get_champion_matchups(champion):
+    """Best and worst lane matchups for a champion, read from the matchup matrix"""
+    try:
+        min_games = max(1, request.args.get('min_games', 3, type=int))
+        limit = max(1, min(request.args.get('limit', 5, type=int), 50))
+        df = read_query('champion_matchups', components().engine, champion=champion)
+        if df.empty:
+            return jsonify({'error': f'No matchups recorded for {champion}'}), 404
+
+        # Default to the role the champion is played in most
+        role = request.args.get('role') or df.groupby('role')['games'].sum().idxmax()
+        df = df[(df['role'] == role) & (df['games'] >= min_games)]
+        games = df['games']
+        matchups = df.assign(
+            win_rate=df['wins'] * 100.0 / games,
+            avg_gold_diff_at_10=df['gold_diff_at_10_sum'] / games,
+            avg_xp_diff_at_10=df['xp_diff_at_10_sum'] / games,
+            avg_cs_at_10=df['cs_at_10_sum'] / games,
+            avg_cs_diff_at_10=(df['cs_at_10_sum'] - df['opponent_cs_at_10_sum']) / games,
+        )[['opponent', 'games', 'win_rate', 'avg_gold_diff_at_10', 'avg_xp_diff_at_10', 'avg_cs_at_10',
+           'avg_cs_diff_at_10']].sort_values(['win_rate', 'avg_gold_diff_at_10', 'games'], ascending=False)
+
+        # Worst are taken from what is left, so a short list never repeats a matchup
+        best = matchups.iloc[:limit]
+        worst = matchups.iloc[limit:].iloc[::-1].iloc[:limit]
+        return json_response({
+            'champion': champion,
+            'role': role,
+            'min_games': min_games,
+            'matchups': len(matchups),
+            'best': frame_payload(best, 'records', precision=2),
+            'worst': frame_payload(worst, 'records', precision=2),
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/sync', methods=['POST'])
+@routes.route('/api/sync', methods=['POST'])
 def sync_grid_data():
     """Trigger data sync from GRID API to database"""
     try:
-        limit = request.json.get('limit', 10) if request.json else 10
+        payload = request.get_json(silent=True) or {}
+        limit = payload.get('limit', 10)
         
-        # Run the ETL pipeline
-        etl.run_ingestion(title_id=3, limit=limit)
+        # Run the ETL pipeline from the stored watermark (or from scratch on full_sync)
+        etl = components().etl
+        processed = etl.run_ingestion(
+            title_id=3,
+            limit=limit,
+            full_sync=bool(payload.get('full_sync', False)),
+            since=payload.get('since')
+        )
         
+        report = etl.last_run_report
         return jsonify({
             'status': 'success',
-            'message': f'Synced {limit} series from GRID API'
+            'message': f'Synced {processed} series from GRID API',
+            'sync_state': etl.sync_state.get('title:3'),
+            'run': {key: report.get(key) for key in ('run_id', 'wall_seconds', 'rows_loaded', 'rows', 'http', 'memory')}
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/init-db', methods=['POST'])
-def init_database():
-    """Initialize database tables"""
+def _run_report(value):
+    # JSONB comes back as a dict, SQLite TEXT as a string
+    return json.loads(value) if isinstance(value, str) else (value or {})
+
+
+@routes.route('/api/ingestion/runs', methods=['GET'])
+def get_ingestion_runs():
+    """Recent ingestion runs, newest first, with per-stage throughput for trend charts"""
+    try:
+        limit = max(1, min(request.args.get('limit', 20, type=int), 500))
+        df = read_query('ingestion_runs_recent', components().engine, limit=limit)
+        runs = []
+        for run in df.to_dict('records'):
+            report = _run_report(run.pop('report'))
+            run.update({key: report.get(key, {}) for key in ('stages', 'http', 'memory')})
+            runs.append(run)
+        return records_response(runs)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@routes.route('/api/ingestion/runs/<run_id>', methods=['GET'])
+def get_ingestion_run(run_id):
+    """The full report of one ingestion run"""
+    try:
+        df = read_query('ingestion_run', components().engine, run_id=run_id)
+        if df.empty:
+            return jsonify({'error': 'Unknown ingestion run'}), 404
+        return json_response(_run_report(df['report'].iloc[0]))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@routes.route('/api/live/matches/<match_id>', methods=['POST'])
+def push_live_snapshot(match_id):
+    """Store a live match snapshot; the final one is loaded into the database"""
     try:
-        from sqlalchemy import text
+        snapshot = request.get_json(silent=True) or {}
+        if 'match' not in snapshot:
+            return jsonify({'error': 'Snapshot must include the match payload'}), 400
+        snapshot['match_id'] = match_id
+        snapshot['received_at'] = time.monotonic()
+
+        ttl = float(os.getenv('LIVE_SNAPSHOT_TTL_SECONDS', 6 * 3600))
+        with live_lock:
+            live_snapshots[match_id] = snapshot
+            for stale_id in [key for key, value in live_snapshots.items()
+                             if snapshot['received_at'] - value['received_at'] > ttl]:
+                del live_snapshots[stale_id]
+
+        loaded = 0
+        if snapshot.get('final'):
+            # Same transform and upsert as batch ingestion, so every player
+            # endpoint sees the game as soon as it ends
+            etl = components().etl
+            df = etl.transform_to_dataframe([snapshot['match']])
+            new_rows = etl.load_to_database(df)
+            loaded = len(new_rows)
+            # The database serves the game from here on; a failed load keeps it for a retry
+            with live_lock:
+                if live_snapshots.get(match_id) is snapshot:
+                    del live_snapshots[match_id]
+            if etl.online_learning:
+                etl.update_model(new_rows)
+
+        return jsonify({'status': 'success', 'final': bool(snapshot.get('final')), 'loaded': loaded})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@routes.route('/api/live/matches/<match_id>', methods=['GET'])
+def get_live_snapshot(match_id):
+    """Latest micro-skill snapshot for a match still in progress"""
+    with live_lock:
+        snapshot = live_snapshots.get(match_id)
+    if snapshot is None:
+        return jsonify({'error': 'No live data for this match'}), 404
+    return jsonify({
+        'match_id': match_id,
+        'game_time': snapshot.get('game_time'),
+        'final': bool(snapshot.get('final')),
+        'players': snapshot.get('players', {})
+    })
+
+
+@routes.route('/api/reports/roster', methods=['POST'])
+def create_roster_report():
+    """Start a report job for a roster and, optionally, the opponent roster"""
+    try:
+        from api.reports import RosterReportJob
         
-        # Read and execute schema
-        schema_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'database_schema.sql')
+        payload = request.get_json(silent=True) or {}
+        roster = payload.get('roster') or []
+        if not roster:
+            return jsonify({'error': 'roster must list at least one player id'}), 400
         
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
+        job = RosterReportJob(
+            roster,
+            opponents=payload.get('opponents') or [],
+            fmt=payload.get('format', 'html'),
+            processes=payload.get('processes')
+        )
+        with report_lock:
+            report_jobs[job.job_id] = job
+        threading.Thread(target=job.run, name=f'report-{job.job_id}', daemon=True).start()
         
-        # Execute each statement separately
-        with engine.connect() as conn:
-            for statement in schema_sql.split(';'):
-                statement = statement.strip()
-                if statement:
-                    conn.execute(text(statement))
-            conn.commit()
+        return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@routes.route('/api/reports/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    """Status and per-player timings of a report job"""
+    with report_lock:
+        job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown report job'}), 404
+    return jsonify(job.summary())
+
+
+@routes.route('/api/reports/<job_id>/download', methods=['GET'])
+def download_report_job(job_id):
+    """The finished job's archive"""
+    with report_lock:
+        job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown report job'}), 404
+    if job.status != 'done':
+        return jsonify({'error': f'Report job is {job.status}'}), 409
+    return send_file(job.archive_path, mimetype='application/zip', as_attachment=True,
+                     download_name=f'micromentor-reports-{job_id}.zip')
+
+
+@routes.route('/api/init-db', methods=['POST'])
+def init_database():
+    """Create or upgrade database tables through the versioned migrations"""
+    try:
+        from data.migrations import SchemaMigrator
+        
+        migrator = SchemaMigrator(components().engine)
+        applied = migrator.upgrade()
         
         return jsonify({
             'status': 'success',
-            'message': 'Database tables created successfully'
+            'message': 'Database tables created successfully',
+            'applied_migrations': applied,
+            'schema_version': migrator.current_version()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+app = create_app()
+
+
+def __getattr__(name):
+    """api.app.etl, api.app.engine, ...: the default app's shared components"""
+    if name in COMPONENT_NAMES:
+        return getattr(app.extensions['micromentor'], name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
 
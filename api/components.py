@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+from functools import cached_property
+from typing import Dict, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+COMPONENT_NAMES = ('engine', 'taxonomy', 'grid_client', 'etl', 'scorer', 'comparator')
+
+
+class AppComponents:
+    """The API's heavy collaborators, each built on first use and shared
+
+    Nothing here is imported or constructed when the app module loads, so a
+    worker that only serves /api/health never pulls in sklearn or the GRID
+    client. Components that need the same resource get the same instance:
+    one engine, one taxonomy, one GRIDClient.
+    """
+
+    def __init__(self, db_url: Optional[str] = None):
+        self.db_url = db_url or os.getenv('DATABASE_URL', 'sqlite:///micromentor.db')
+        # Two requests touching a component for the first time build it once
+        self._lock = threading.RLock()
+
+    def _build(self, name: str, factory):
+        with self._lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = factory()
+            return self.__dict__[name]
+
+    @cached_property
+    def engine(self):
+        from data.queries import get_engine
+        return self._build('engine', lambda: get_engine(self.db_url))
+
+    @cached_property
+    def taxonomy(self) -> Dict:
+        def load():
+            with open(os.path.join(DATA_DIR, 'micro_skills_taxonomy.json'), 'r') as f:
+                return json.load(f)
+        return self._build('taxonomy', load)
+
+    @cached_property
+    def grid_client(self):
+        from data.grid_client import GRIDClient
+        # Sized for the ETL's extraction workers, its main user
+        return self._build('grid_client', lambda: GRIDClient(pool_size=int(os.getenv('ETL_MAX_WORKERS', 8))))
+
+    @cached_property
+    def etl(self):
+        from data.db_loader import MicroSkillLoader
+        from data.etl_pipeline import MicroSkillETL
+        return self._build('etl', lambda: MicroSkillETL(
+            client=self.grid_client, loader=MicroSkillLoader(self.engine), taxonomy=self.taxonomy
+        ))
+
+    @cached_property
+    def scorer(self):
+        from models.skill_scorer import MicroSkillScorer
+        return self._build('scorer', lambda: MicroSkillScorer(taxonomy=self.taxonomy))
+
+    @cached_property
+    def comparator(self):
+        from models.benchmark_comparator import BenchmarkComparator
+        return self._build('comparator', lambda: BenchmarkComparator(engine=self.engine))
+
+    def built(self):
+        """Names of the components constructed so far"""
+        return [name for name in COMPONENT_NAMES if name in self.__dict__]
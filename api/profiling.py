@@ -0,0 +1,247 @@
+import hmac
+import json
+import os
+import random
+import sys
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from flask import Blueprint, Flask, g, jsonify, request, send_file
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-MicroMentor-Profile'
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+INDEX_FILE = 'index.jsonl'
+
+profiling_routes = Blueprint('profiling', __name__)
+
+
+class RequestProfiler:
+    """Records every Python and C call on the current thread as open/close events
+
+    The events map one-to-one onto speedscope's "evented" profile, which
+    renders as a flamegraph and a time-ordered call chart. Recording stops
+    opening frames after max_events so a pathological request cannot
+    exhaust memory; frames already open are still closed.
+    """
+
+    def __init__(self, max_events: int = 500_000):
+        self.max_events = max_events
+        self.frames: List[Dict] = []
+        self._frame_index: Dict[tuple, int] = {}
+        self.events: List[Dict] = []
+        self._stack: List[Optional[int]] = []
+        self.truncated = False
+        self.started = None
+        self.duration = None
+
+    def _frame(self, name: str, file: Optional[str], line: Optional[int]) -> int:
+        key = (name, file, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            frame = {'name': name}
+            if file:
+                frame.update({'file': file, 'line': line})
+            self.frames.append(frame)
+        return index
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def _callback(self, frame, event, arg):
+        if event in ('call', 'c_call'):
+            if len(self.events) >= self.max_events:
+                self.truncated = True
+                self._stack.append(None)
+                return
+            if event == 'call':
+                code = frame.f_code
+                index = self._frame(getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno)
+            else:
+                module = getattr(arg, '__module__', None) or 'builtins'
+                index = self._frame(f"{module}.{getattr(arg, '__qualname__', repr(arg))}", None, None)
+            self._stack.append(index)
+            self.events.append({'type': 'O', 'frame': index, 'at': self._now()})
+        elif event in ('return', 'c_return', 'c_exception'):
+            # Returns from frames that were already running at start() are ignored
+            if not self._stack:
+                return
+            index = self._stack.pop()
+            if index is not None:
+                self.events.append({'type': 'C', 'frame': index, 'at': self._now()})
+
+    def start(self):
+        self.started = time.perf_counter()
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        sys.setprofile(None)
+        end = self._now()
+        while self._stack:
+            index = self._stack.pop()
+            if index is not None:
+                self.events.append({'type': 'C', 'frame': index, 'at': end})
+        self.duration = end
+
+    def to_speedscope(self, name: str) -> Dict:
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'micromentor',
+            'activeProfileIndex': 0,
+            'shared': {'frames': self.frames},
+            'profiles': [{
+                'type': 'evented',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': self.duration,
+                'events': self.events,
+            }],
+        }
+
+
+def _profile_dir() -> str:
+    return os.getenv('PROFILE_DIR', os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'profiles'
+    ))
+
+
+def _authorized() -> bool:
+    """The request's profile header carries PROFILE_TOKEN; nobody qualifies while it is unset"""
+    token = os.getenv('PROFILE_TOKEN')
+    header = request.headers.get(PROFILE_HEADER)
+    return bool(token and header) and hmac.compare_digest(header.encode(), token.encode())
+
+
+def _wants_profile() -> bool:
+    """Header opt-in with PROFILE_TOKEN, or server-side PROFILE_SAMPLE_RATE"""
+    if request.headers.get(PROFILE_HEADER):
+        return _authorized()
+    rate = float(os.getenv('PROFILE_SAMPLE_RATE', 0) or 0)
+    return rate > 0 and random.random() < rate
+
+
+def _start_profile():
+    if request.blueprint == profiling_routes.name or not _wants_profile():
+        return
+    g.profiler = RequestProfiler(int(os.getenv('PROFILE_MAX_EVENTS', 500_000)))
+    g.profiler.start()
+
+
+def _finish_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.stop()
+    try:
+        capture = save_capture(profiler, request.method, request.path, response.status_code)
+        response.headers['X-Profile-Id'] = capture['id']
+    except Exception as e:
+        logger.error(f"Could not save profile for {request.path}: {e}")
+    return response
+
+
+def _discard_profile(exc):
+    """Never leave the profiler installed on a worker thread after an unhandled error"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+
+
+def save_capture(profiler: RequestProfiler, method: str, path: str, status: int,
+                 profile_dir: Optional[str] = None) -> Dict:
+    """Write the speedscope file and append its summary to the directory's index"""
+    profile_dir = profile_dir or _profile_dir()
+    os.makedirs(profile_dir, exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+    capture_id = f"{created_at.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    file_name = f'{capture_id}.speedscope.json'
+    with open(os.path.join(profile_dir, file_name), 'w') as f:
+        json.dump(profiler.to_speedscope(f'{method} {path}'), f)
+
+    capture = {
+        'id': capture_id,
+        'method': method,
+        'path': path,
+        'status': status,
+        'duration_ms': round(profiler.duration, 3),
+        'events': len(profiler.events),
+        'truncated': profiler.truncated,
+        'created_at': created_at.isoformat(),
+        'file': file_name,
+    }
+    # One short line per append, so concurrent workers never interleave
+    with open(os.path.join(profile_dir, INDEX_FILE), 'a') as f:
+        f.write(json.dumps(capture) + '\n')
+    _prune(profile_dir, int(os.getenv('PROFILE_MAX_FILES', 200)))
+    return capture
+
+
+def _prune(profile_dir: str, keep: int):
+    """Drop the oldest files past `keep`, and their lines from the index"""
+    files = sorted(name for name in os.listdir(profile_dir) if name.endswith('.speedscope.json'))
+    removed = files[:-keep] if keep else files
+    if not removed:
+        return
+    for name in removed:
+        try:
+            os.remove(os.path.join(profile_dir, name))
+        except OSError:
+            pass
+
+    index_path = os.path.join(profile_dir, INDEX_FILE)
+    with open(index_path, 'r') as f:
+        lines = [line for line in f if line.strip()]
+    kept = [line for line in lines if os.path.exists(os.path.join(profile_dir, json.loads(line)['file']))]
+    # Rewrite through a temporary file so readers never see a half-written index
+    tmp_path = f'{index_path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.writelines(kept)
+    os.replace(tmp_path, index_path)
+
+
+def list_captures(limit: Optional[int] = 50, profile_dir: Optional[str] = None) -> List[Dict]:
+    """Most recent captures first, skipping any whose file has been pruned"""
+    profile_dir = profile_dir or _profile_dir()
+    index_path = os.path.join(profile_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, 'r') as f:
+        captures = [json.loads(line) for line in f if line.strip()]
+    existing = [c for c in reversed(captures) if os.path.exists(os.path.join(profile_dir, c['file']))]
+    return existing[:limit]
+
+
+@profiling_routes.route('/api/profiles', methods=['GET'])
+def get_profiles():
+    """Recent request profiles with their durations"""
+    if not _authorized():
+        return jsonify({'error': f'Send PROFILE_TOKEN in the {PROFILE_HEADER} header'}), 403
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({'profile_dir': _profile_dir(), 'captures': list_captures(limit)})
+
+
+@profiling_routes.route('/api/profiles/<capture_id>', methods=['GET'])
+def download_profile(capture_id):
+    """The speedscope file; open it at https://www.speedscope.app"""
+    if not _authorized():
+        return jsonify({'error': f'Send PROFILE_TOKEN in the {PROFILE_HEADER} header'}), 403
+    for capture in list_captures(limit=None):
+        if capture['id'] == capture_id:
+            return send_file(os.path.join(_profile_dir(), capture['file']), mimetype='application/json',
+                             as_attachment=True, download_name=capture['file'])
+    return jsonify({'error': 'Unknown profile'}), 404
+
+
+def init_profiling(app: Flask):
+    """Install the per-request hooks and the /api/profiles endpoints"""
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_discard_profile)
+    app.register_blueprint(profiling_routes)
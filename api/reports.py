@@ -0,0 +1,263 @@
+import html
+import json
+import os
+import re
+import sys
+import time
+import uuid
+import zipfile
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+# Add the project root to sys.path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMATS = ('html', 'pdf')
+# (section key, endpoint suffix, title) in report order
+SECTIONS = [
+    ('profile', 'profile', 'Profile'),
+    ('micro_skills', 'micro-skills', 'Micro-Skills'),
+    ('benchmarks', 'benchmarks', 'Role Benchmarks'),
+    ('insights', 'insights', 'Insights'),
+    ('macro_review', 'macro-review', 'Macro Review'),
+    ('improvement_plan', 'improvement-plan', 'Improvement Plan'),
+]
+
+_client = None
+
+
+def _api_client():
+    """Flask test client over the real API, created once per worker process"""
+    global _client
+    if _client is None:
+        from api.app import app
+        _client = app.test_client()
+    return _client
+
+
+def build_player_report(player_id: str, role: Optional[str] = None) -> Dict:
+    """Assemble every report section through the same handlers the frontend calls"""
+    client = _api_client()
+    report = {'player_id': player_id, 'generated_at': datetime.now(timezone.utc).isoformat(), 'sections': {}}
+    for key, suffix, _ in SECTIONS:
+        url = f'/api/players/{player_id}/{suffix}'
+        if key == 'benchmarks':
+            role = role or report['sections'].get('profile', {}).get('role') or 'mid'
+            url = f'{url}?role={str(role).lower()}'
+        response = client.get(url)
+        report['sections'][key] = response.get_json() if response.status_code == 200 else {
+            'error': (response.get_json(silent=True) or {}).get('error', f'HTTP {response.status_code}')
+        }
+    return report
+
+
+def _flatten(value, indent: int = 0) -> List[str]:
+    """Readable text lines for nested JSON, shared by both renderers"""
+    pad = '  ' * indent
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                lines.append(f'{pad}{key}:')
+                lines.extend(_flatten(item, indent + 1))
+            else:
+                lines.append(f'{pad}{key}: {_format_value(item)}')
+        return lines
+    if isinstance(value, list):
+        lines = []
+        for item in value:
+            if isinstance(item, (dict, list)):
+                lines.extend(_flatten(item, indent))
+                lines.append('')
+            else:
+                lines.append(f'{pad}- {_format_value(item)}')
+        return lines
+    return [f'{pad}{_format_value(value)}']
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return str(value)
+
+
+def render_html(report: Dict) -> bytes:
+    parts = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8">',
+        f"<title>MicroMentor report: {html.escape(report['player_id'])}</title>",
+        '<style>body{font-family:Helvetica,Arial,sans-serif;margin:2em;color:#333}'
+        'h1{color:#667eea}pre{background:#f6f7fb;padding:1em;white-space:pre-wrap}</style>',
+        '</head><body>',
+        f"<h1>Player Development Report: {html.escape(report['player_id'])}</h1>",
+        f"<p>Generated {html.escape(report['generated_at'])}</p>",
+    ]
+    for key, _, title in SECTIONS:
+        parts.append(f'<h2>{title}</h2>')
+        parts.append(f"<pre>{html.escape(chr(10).join(_flatten(report['sections'].get(key, {}))))}</pre>")
+    parts.append('</body></html>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def render_pdf(report: Dict) -> bytes:
+    """Text-only PDF through matplotlib's PDF backend"""
+    try:
+        import io
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib.backends.backend_pdf import PdfPages
+        import matplotlib.pyplot as plt
+    except ImportError as e:
+        raise ImportError("matplotlib is required for PDF reports (pip install matplotlib)") from e
+
+    lines = [f"Player Development Report: {report['player_id']}", f"Generated {report['generated_at']}", '']
+    for key, _, title in SECTIONS:
+        lines.extend([title.upper(), *_flatten(report['sections'].get(key, {})), ''])
+
+    buffer = io.BytesIO()
+    lines_per_page = 60
+    with PdfPages(buffer) as pdf:
+        for start in range(0, len(lines), lines_per_page):
+            fig = plt.figure(figsize=(8.27, 11.69))  # A4
+            fig.text(0.06, 0.97, '\n'.join(lines[start:start + lines_per_page]),
+                     va='top', ha='left', family='monospace', fontsize=7)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_player(player_id: str, group: str, fmt: str, output_dir: str, role: Optional[str] = None) -> Dict:
+    """Build and render one player's report to output_dir; runs inside a worker"""
+    started = time.perf_counter()
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', player_id)
+    relative_path = f'{group}/{safe_name}.{fmt}'
+    try:
+        report = build_player_report(player_id, role)
+        assembled = time.perf_counter()
+        content = render_pdf(report) if fmt == 'pdf' else render_html(report)
+        path = os.path.join(output_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        finished = time.perf_counter()
+        return {
+            'player_id': player_id, 'group': group, 'status': 'ok', 'file': relative_path,
+            'assemble_seconds': round(assembled - started, 4),
+            'render_seconds': round(finished - assembled, 4),
+            'seconds': round(finished - started, 4)
+        }
+    except Exception as e:
+        return {
+            'player_id': player_id, 'group': group, 'status': 'error', 'error': str(e),
+            'seconds': round(time.perf_counter() - started, 4)
+        }
+
+
+class RosterReportJob:
+    """Reports for a roster (and optionally an opponent roster) in one archive
+
+    Players are spread over a process pool, so assembling and rendering
+    run on every core instead of one player after another in the browser.
+    The archive holds one file per player under roster/ or opponents/ and
+    a manifest.json with per-player timings.
+    """
+
+    def __init__(self,
+                 roster: List[str],
+                 opponents: Optional[List[str]] = None,
+                 fmt: str = 'html',
+                 processes: Optional[int] = None,
+                 output_root: Optional[str] = None):
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {fmt}")
+        self.job_id = uuid.uuid4().hex[:12]
+        self.roster = list(roster)
+        self.opponents = list(opponents or [])
+        self.fmt = fmt
+        self.processes = processes or int(os.getenv('REPORT_PROCESSES', os.cpu_count() or 1))
+        self.output_root = output_root or os.getenv(
+            'REPORT_OUTPUT_DIR',
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports')
+        )
+        self.status = 'pending'
+        self.results: List[Dict] = []
+        self.archive_path = None
+        self.error = None
+        self.seconds = None
+
+    @property
+    def work_dir(self) -> str:
+        return os.path.join(self.output_root, self.job_id)
+
+    def _tasks(self):
+        return [(pid, 'roster') for pid in self.roster] + [(pid, 'opponents') for pid in self.opponents]
+
+    def run(self) -> Dict:
+        started = time.perf_counter()
+        self.status = 'running'
+        try:
+            tasks = self._tasks()
+            if self.processes == 1 or len(tasks) == 1:
+                self.results = [render_player(pid, group, self.fmt, self.work_dir) for pid, group in tasks]
+            else:
+                # spawn: workers never inherit the server's threads or open connections
+                with ProcessPoolExecutor(max_workers=min(self.processes, len(tasks)),
+                                         mp_context=get_context('spawn')) as pool:
+                    futures = [pool.submit(render_player, pid, group, self.fmt, self.work_dir)
+                               for pid, group in tasks]
+                    self.results = [future.result() for future in as_completed(futures)]
+            order = {task: index for index, task in enumerate(tasks)}
+            self.results.sort(key=lambda r: order[(r['player_id'], r['group'])])
+            self.seconds = round(time.perf_counter() - started, 4)
+            # Pollers see 'done' only once the archive is complete on disk
+            self.archive_path = self._write_archive({**self.summary(), 'status': 'done'})
+            self.status = 'done'
+        except Exception as e:
+            logger.error(f"Report job {self.job_id} failed: {e}")
+            self.error = str(e)
+            self.status = 'failed'
+        return self.summary()
+
+    def _write_archive(self, manifest: Dict) -> str:
+        archive_path = os.path.join(self.output_root, f'{self.job_id}.zip')
+        tmp_path = f'{archive_path}.tmp'
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for result in self.results:
+                if result['status'] == 'ok':
+                    archive.write(os.path.join(self.work_dir, result['file']), result['file'])
+            archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+        os.replace(tmp_path, archive_path)
+        return archive_path
+
+    def summary(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'format': self.fmt,
+            'processes': self.processes,
+            'players': self.results,
+            'seconds': self.seconds,
+            'error': self.error
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render coach reports for whole rosters')
+    parser.add_argument('--roster', nargs='+', required=True)
+    parser.add_argument('--opponents', nargs='*', default=[])
+    parser.add_argument('--format', choices=REPORT_FORMATS, default='html')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output-dir', default=None)
+    args = parser.parse_args()
+
+    job = RosterReportJob(args.roster, args.opponents, args.format, args.processes, args.output_dir)
+    summary = job.run()
+    for player in summary['players']:
+        print(f"{player['group']:<10} {player['player_id']:<20} {player['status']:<6} {player['seconds']:.3f}s")
+    print(f"Archive: {job.archive_path} ({summary['seconds']}s total)")
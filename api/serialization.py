@@ -0,0 +1,161 @@
+import gzip
+import json
+import math
+import os
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from flask import Response, request
+from werkzeug.http import http_date
+
+# orjson encodes straight to bytes, handles numpy natively and is several
+# times faster than the stdlib encoder; the stdlib path keeps the API working
+# without it
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FORMATS = ('records', 'columns')
+# Bodies below this size are not worth a compression pass
+MIN_COMPRESS_BYTES = int(os.getenv('API_MIN_COMPRESS_BYTES', 1024))
+
+
+def _default(value):
+    """Encode the non-JSON types pandas and numpy hand back"""
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        # Flask's encoder sends dates as RFC 1123 (http_date); keep the API's wire format
+        return http_date(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _clean_nan(value):
+    """NaN is not valid JSON; the stdlib encoder would emit it verbatim"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _clean_nan(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clean_nan(v) for v in value]
+    return value
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        # Dates go through _default rather than orjson's own RFC 3339 output
+        return orjson.dumps(payload, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(_clean_nan(payload), default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def frame_payload(df: pd.DataFrame, fmt: str = 'records', precision: Optional[int] = None) -> Union[List, dict]:
+    """Rows as a list of dicts, or one array per column with the keys sent once
+
+    The columns form is {'columns': [...], 'data': {column: [values]}, 'length': n}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if precision is not None:
+        floats = df.select_dtypes(include='float').columns
+        if len(floats):
+            df = df.copy()
+            df[floats] = df[floats].round(precision)
+    # Object columns (mixed values, NULLs) go through the encoder's default
+    # hook; numeric columns are plain lists of Python numbers
+    data = {name: _column_values(df[name]) for name in df.columns}
+    if fmt == 'columns':
+        return {'columns': list(df.columns), 'data': data, 'length': len(df)}
+    names = list(df.columns)
+    return [dict(zip(names, row)) for row in zip(*(data[name] for name in names))]
+
+
+def _column_values(series: pd.Series) -> List:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return [None if pd.isna(v) else http_date(v) for v in series]
+    if pd.api.types.is_float_dtype(series):
+        return [None if v != v else v for v in series.tolist()]
+    if series.hasnans:
+        # string and object columns report missing values as NaN
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+
+def _request_options():
+    """(format, precision) from the query string; raises ValueError on bad input"""
+    fmt = request.args.get('format', 'records')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt} (expected one of {', '.join(FORMATS)})")
+    precision = request.args.get('precision', os.getenv('API_FLOAT_PRECISION'))
+    try:
+        precision = int(precision) if precision not in (None, '') else None
+    except ValueError:
+        raise ValueError(f"precision must be an integer, got {precision!r}") from None
+    return fmt, precision
+
+
+def _negotiate_encoding() -> Optional[str]:
+    """Prefer brotli when it is installed and accepted, then gzip"""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0'):
+            accepted.add(name.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Encode with the fast encoder and compress when the client accepts it"""
+    body = dumps(payload)
+    headers = {'Vary': 'Accept-Encoding'}
+    if len(body) >= MIN_COMPRESS_BYTES:
+        encoding = _negotiate_encoding()
+        if encoding == 'br':
+            body = brotli.compress(body, quality=4)
+        elif encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=5)
+        if encoding:
+            headers['Content-Encoding'] = encoding
+    return Response(body, status=status, mimetype='application/json', headers=headers)
+
+
+def frame_response(df: pd.DataFrame) -> Response:
+    """DataFrame response honouring ?format=records|columns and ?precision=N
+
+    Defaults keep the historical shape: a list of row objects at full precision.
+    """
+    try:
+        fmt, precision = _request_options()
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    return json_response(frame_payload(df, fmt, precision))
+
+
+def records_response(records: List[dict]) -> Response:
+    """Same options for handlers that build plain row dicts"""
+    try:
+        fmt, precision = _request_options()
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    if fmt != 'records' or precision is not None:
+        return json_response(frame_payload(pd.DataFrame(records), fmt, precision))
+    return json_response(records)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from data.etl_pipeline import SKILL_COLUMNS
+
+ROLES = ['top', 'jungle', 'mid', 'bot', 'support']
+CHAMPIONS = ['Azir', 'Ahri', 'Syndra', 'Orianna', 'LeBlanc', 'Jayce', 'Lee Sin', 'Jinx', 'Thresh', 'Gnar']
+# Roughly a pro's season per player, so per-player rolling windows have history
+GAMES_PER_PLAYER = 200
+PLAYERS_PER_MATCH = 10
+
+# (mean, std) of each generated skill metric; anything unlisted is N(1, 0.25)
+SKILL_DISTRIBUTIONS = {
+    'cs_at_10': (80, 10), 'gold_diff_at_10': (0, 400), 'xp_diff_at_10': (0, 300),
+    'vision_score_per_min': (1.2, 0.3), 'kill_participation': (60, 12), 'damage_per_gold': (1.2, 0.3),
+    'death_share': (20, 6), 'kda': (4, 1.5), 'average_combat_rating': (800, 120),
+    'objective_damage_share': (25, 8), 'tower_damage_contribution': (3000, 900),
+}
+
+
+def _player_slots(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """Player index per row; the ten players of a match are always distinct
+
+    Players come in fixed lobbies of ten, so (match_id, player_id) stays unique
+    like the real table's key.
+    """
+    lobbies = max(1, rows // GAMES_PER_PLAYER // PLAYERS_PER_MATCH)
+    n_matches = -(-rows // PLAYERS_PER_MATCH)
+    lobby = np.repeat(rng.integers(0, lobbies, n_matches), PLAYERS_PER_MATCH)[:rows]
+    return lobby * PLAYERS_PER_MATCH + np.arange(rows) % PLAYERS_PER_MATCH
+
+
+def skill_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    """player_micro_skills-shaped rows, in chronological order"""
+    rng = np.random.default_rng(seed)
+    player_index = _player_slots(rng, rows)
+    columns = {
+        'match_id': np.char.add('m', (np.arange(rows) // PLAYERS_PER_MATCH).astype(str)),
+        'player_id': np.char.add('p', player_index.astype(str)),
+        'player_name': np.char.add('Player ', player_index.astype(str)),
+        'role': np.array(ROLES)[player_index % len(ROLES)],
+        'champion': np.array(CHAMPIONS)[rng.integers(0, len(CHAMPIONS), rows)],
+        'game_result': np.where(rng.random(rows) < 0.5, 'WIN', 'LOSS'),
+        'created_at': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(rows), unit='s'),
+    }
+    for name in SKILL_COLUMNS:
+        if name == 'first_blood_participation':
+            columns[name] = rng.random(rows) < 0.2
+        else:
+            mean, std = SKILL_DISTRIBUTIONS.get(name, (1.0, 0.25))
+            columns[name] = rng.normal(mean, std, rows).astype(np.float32)
+    return pd.DataFrame(columns)
+
+
+def raw_matches(rows: int, seed: int = 7) -> List[Dict]:
+    """GRID-style match payloads totalling `rows` players, as extract_match_data returns them"""
+    rng = np.random.default_rng(seed)
+    n_matches = max(1, rows // PLAYERS_PER_MATCH)
+    n = n_matches * PLAYERS_PER_MATCH
+    slot = np.arange(n) % PLAYERS_PER_MATCH
+    players = pd.DataFrame({
+        'id': np.char.add('p', _player_slots(rng, n).astype(str)),
+        'name': 'Player',
+        'role': np.array(ROLES)[slot % len(ROLES)],
+        'champion': np.array(CHAMPIONS)[rng.integers(0, len(CHAMPIONS), n)],
+        'game_result': np.where(slot < 5, 'WIN', 'LOSS'),
+        'cs_at_10': rng.normal(80, 10, n).round(),
+        'gold_at_10': rng.normal(4000, 300, n).round(),
+        'opponent_gold_at_10': rng.normal(4000, 300, n).round(),
+        'xp_at_10': rng.normal(3300, 250, n).round(),
+        'opponent_xp_at_10': rng.normal(3300, 250, n).round(),
+        'solo_kills': rng.poisson(0.6, n),
+        'deaths_in_lane': rng.poisson(0.8, n),
+        'vision_score': rng.normal(40, 12, n).round(),
+        'game_duration': rng.integers(1500, 2700, n),
+        'control_wards_purchased': rng.poisson(4, n),
+        'wards_placed_total': rng.poisson(14, n),
+        'wards_cleared': rng.poisson(6, n),
+        'vision_denial_efficiency': rng.random(n),
+        'kills': rng.poisson(4, n),
+        'assists': rng.poisson(7, n),
+        'team_kills': rng.integers(10, 35, n),
+        'total_damage': rng.normal(20000, 6000, n).round(),
+        'gold_spent': rng.normal(11000, 2000, n).round(),
+        'deaths': rng.poisson(3, n),
+        'team_deaths': rng.integers(10, 35, n),
+        'kda': rng.gamma(2.0, 2.0, n),
+        'first_blood_participation': rng.random(n) < 0.2,
+        'tower_damage_contribution': rng.normal(3000, 900, n).round(),
+    }).to_dict('records')
+    return [
+        {'id': f'm{i}', 'players': players[i * PLAYERS_PER_MATCH:(i + 1) * PLAYERS_PER_MATCH]}
+        for i in range(n_matches)
+    ]
+
+
+def seed_database(engine, frame: pd.DataFrame) -> int:
+    """Migrate the database to the current schema and bulk-insert the rows"""
+    from data.migrations import migrate
+    migrate(engine)
+    frame.to_sql('player_micro_skills', engine, if_exists='append', index=False, chunksize=50_000)
+    return len(frame)
@@ -0,0 +1,264 @@
+import json
+import os
+import sys
+import time
+import random
+import socket
+import shutil
+import tempfile
+import threading
+import subprocess
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Add the project root to sys.path for absolute imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import numpy as np
+import requests
+from sqlalchemy import create_engine
+
+from benchmarks import datasets
+
+logger = logging.getLogger(__name__)
+
+# What the frontend requests per page view, route template -> (method, body).
+# The dashboard is App.js's fetchPlayerData; comparison is PlayerComparison.js
+# for two players; the scenario page is HypotheticalScenarios.js.
+PAGE_VIEWS = {
+    'dashboard': [
+        ('GET', '/api/players/{id}/profile', None),
+        ('GET', '/api/players/{id}/micro-skills', None),
+        ('GET', '/api/players/{id}/benchmarks?role=mid', None),
+        ('GET', '/api/players/{id}/improvement-plan', None),
+        ('GET', '/api/players/{id}/trends', None),
+        ('GET', '/api/players/{id}/insights', None),
+        ('GET', '/api/players/{id}/history', None),
+        ('GET', '/api/players/{id}/champions', None),
+        ('GET', '/api/players/{id}/macro-review', None),
+    ],
+    'comparison': [
+        ('GET', '/api/players/{id}/profile', None),
+        ('GET', '/api/players/{id}/micro-skills', None),
+        ('GET', '/api/players/{id}/benchmarks?role=mid', None),
+        ('GET', '/api/players/{other}/profile', None),
+        ('GET', '/api/players/{other}/micro-skills', None),
+        ('GET', '/api/players/{other}/benchmarks?role=mid', None),
+    ],
+    'scenario': [
+        ('POST', '/api/players/{id}/hypothetical', {'question': 'What if we contest dragon at 20 minutes?'}),
+    ],
+}
+# Share of page views of each kind
+PAGE_MIX = {'dashboard': 0.75, 'comparison': 0.15, 'scenario': 0.10}
+DEFAULT_LEVELS = [1, 4, 16, 32]
+
+
+def _route(method: str, template: str) -> str:
+    """Report key: the path with ids as placeholders and no query string"""
+    path = template.split('?')[0].replace('{id}', '<player_id>').replace('{other}', '<player_id>')
+    return f'{method} {path}'
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_healthy(base_url: str, timeout: float = 30.0, process: Optional[subprocess.Popen] = None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode} before becoming healthy")
+        try:
+            if requests.get(f'{base_url}/api/health', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"API at {base_url} did not become healthy within {timeout}s")
+
+
+@contextmanager
+def seeded_database(rows: int, db_path: Optional[str] = None) -> Iterator[Dict]:
+    """A SQLite database holding `rows` generated games; yields its URL and player ids"""
+    work_dir = None
+    if db_path is None:
+        work_dir = tempfile.mkdtemp(prefix='micromentor-load-')
+        db_path = os.path.join(work_dir, 'load.db')
+    url = f'sqlite:///{db_path}'
+    engine = create_engine(url)
+    frame = datasets.skill_frame(rows)
+    datasets.seed_database(engine, frame)
+    engine.dispose()
+    try:
+        yield {'url': url, 'rows': rows, 'player_ids': sorted(frame['player_id'].unique().tolist())}
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+@contextmanager
+def running_api(db_url: str, port: Optional[int] = None, threads: int = 32, workers: int = 1) -> Iterator[str]:
+    """Start the API under gunicorn with the Procfile's gthread worker; yields its base URL"""
+    port = port or _free_port()
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app', '--chdir', os.path.join(ROOT, 'api'),
+        '--worker-class', 'gthread', '--threads', str(threads), '--workers', str(workers),
+        '--bind', f'127.0.0.1:{port}', '--timeout', '120', '--log-level', 'warning',
+    ]
+    env = {**os.environ, 'DATABASE_URL': db_url}
+    process = subprocess.Popen(command, env=env, cwd=ROOT)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        _wait_healthy(base_url, process=process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _virtual_user(base_url: str, player_ids: Sequence[str], stop: threading.Event,
+                  samples: List, seed: int):
+    """Loop page views until stopped; one keep-alive session, requests in page order"""
+    rng = random.Random(seed)
+    kinds, weights = zip(*PAGE_MIX.items())
+    session = requests.Session()
+    while not stop.is_set():
+        kind = rng.choices(kinds, weights)[0]
+        ids = {'id': rng.choice(player_ids), 'other': rng.choice(player_ids)}
+        page_started = time.perf_counter()
+        page_status = 200
+        for method, template, body in PAGE_VIEWS[kind]:
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + template.format(**ids), json=body, timeout=60)
+                status = response.status_code
+            except requests.RequestException:
+                status = None
+            samples.append((_route(method, template), time.perf_counter() - started, status))
+            if status is None or status >= 500:
+                # A page view fails when any of its requests does
+                page_status = status
+        samples.append((f'page {kind}', time.perf_counter() - page_started, page_status))
+    session.close()
+
+
+def _latency_stats(entries: List, seconds: float) -> Dict:
+    latencies = np.array([latency for latency, _ in entries]) * 1000
+    errors = sum(1 for _, status in entries if status is None or status >= 500)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': len(entries),
+        'throughput_rps': round(len(entries) / seconds, 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'mean_ms': round(float(latencies.mean()), 2),
+        'errors': errors,
+        'error_rate': round(errors / len(entries), 4),
+    }
+
+
+def summarize(samples: List, seconds: float) -> Dict:
+    """Throughput, latency percentiles (ms) and error rate per route and per page view"""
+    grouped = defaultdict(list)
+    for name, latency, status in samples:
+        grouped[name].append((latency, status))
+    stats = {name: _latency_stats(entries, seconds) for name, entries in sorted(grouped.items())}
+
+    routes = {name: value for name, value in stats.items() if not name.startswith('page ')}
+    pages = {name[len('page '):]: value for name, value in stats.items() if name.startswith('page ')}
+    requests_total = sum(value['requests'] for value in routes.values())
+    errors_total = sum(value['errors'] for value in routes.values())
+    return {
+        'seconds': round(seconds, 3),
+        'requests': requests_total,
+        'throughput_rps': round(requests_total / seconds, 2),
+        'page_views_per_second': round(sum(value['requests'] for value in pages.values()) / seconds, 2),
+        'error_rate': round(errors_total / requests_total, 4) if requests_total else 0.0,
+        'routes': routes,
+        'pages': pages,
+    }
+
+
+def run_level(base_url: str, player_ids: Sequence[str], concurrency: int, duration: float) -> Dict:
+    """`concurrency` virtual users replaying page views for `duration` seconds"""
+    stop = threading.Event()
+    samples: List = []  # list.append is atomic, so users share one list
+    users = [
+        threading.Thread(target=_virtual_user, args=(base_url, player_ids, stop, samples, seed), daemon=True)
+        for seed in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for user in users:
+        user.start()
+    time.sleep(duration)
+    stop.set()
+    for user in users:
+        user.join()
+    return {'concurrency': concurrency, **summarize(samples, time.perf_counter() - started)}
+
+
+def run_load_test(base_url: str,
+                  player_ids: Sequence[str],
+                  levels: Sequence[int] = DEFAULT_LEVELS,
+                  duration: float = 10.0,
+                  warmup: float = 2.0) -> Dict:
+    """Replay the frontend mix at each concurrency level in turn"""
+    if warmup:
+        # First requests build the lazy components and warm the page cache
+        run_level(base_url, player_ids, 1, warmup)
+    results = []
+    for concurrency in levels:
+        result = run_level(base_url, player_ids, concurrency, duration)
+        logger.info(f"concurrency {concurrency}: {result['throughput_rps']} req/s, "
+                    f"{result['page_views_per_second']} page views/s, error rate {result['error_rate']:.2%}")
+        results.append(result)
+    return {
+        'base_url': base_url,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'duration_per_level': duration,
+        'page_mix': PAGE_MIX,
+        'levels': results,
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Replay the dashboard request mix against the API at rising concurrency')
+    parser.add_argument('--rows', type=int, default=100_000, help='Games to seed into a fresh SQLite database')
+    parser.add_argument('--levels', type=int, nargs='+', default=DEFAULT_LEVELS)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+    parser.add_argument('--threads', type=int, default=32, help='gunicorn gthread threads per worker')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--base-url', default=None,
+                        help='Target an already running API instead (its database is not seeded)')
+    parser.add_argument('--player-ids', nargs='+', default=None, help='Players to request with --base-url')
+    parser.add_argument('--output', default=None, help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    if args.base_url:
+        report = run_load_test(args.base_url.rstrip('/'), args.player_ids or ['faker_id'], args.levels, args.duration)
+    else:
+        with seeded_database(args.rows) as db, running_api(db['url'], threads=args.threads,
+                                                          workers=args.workers) as base_url:
+            report = run_load_test(base_url, db['player_ids'], args.levels, args.duration)
+            report.update({'rows': db['rows'], 'threads': args.threads, 'workers': args.workers})
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
@@ -0,0 +1,317 @@
+import json
+import os
+import sys
+import time
+import shutil
+import platform
+import tempfile
+import logging
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Callable, Dict, List, Optional
+
+# Add the project root to sys.path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from benchmarks import datasets
+
+logger = logging.getLogger(__name__)
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+# A case is a regression when it is this much slower than its baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and slower by at least this many seconds, so timer noise on
+# sub-millisecond cases never fails a run
+NOISE_FLOOR_SECONDS = 0.005
+
+
+class Workload:
+    """Generated data for one scale, built on first use and shared by the cases"""
+
+    def __init__(self, rows: int, work_dir: str):
+        self.rows = rows
+        self.work_dir = work_dir
+
+    def capped(self, cap: Optional[int]) -> int:
+        return self.rows if cap is None else min(self.rows, cap)
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        return datasets.skill_frame(self.rows)
+
+    def matches(self, rows: int) -> List[Dict]:
+        return datasets.raw_matches(rows)
+
+    @cached_property
+    def engine(self):
+        """SQLite database at the current schema, holding every generated row"""
+        engine = create_engine(f"sqlite:///{os.path.join(self.work_dir, 'benchmark.db')}")
+        datasets.seed_database(engine, self.frame)
+        return engine
+
+    @cached_property
+    def player_id(self) -> str:
+        """The player with the most games"""
+        return self.frame['player_id'].value_counts().index[0]
+
+    @cached_property
+    def trained_predictor(self):
+        from models.performance_predictor import PerformancePredictor
+        predictor = PerformancePredictor()
+        predictor.train(self.frame.head(min(self.rows, 50_000)).copy(), **TRAIN_ARGS)
+        return predictor
+
+
+# Small fixed search so training time tracks data volume, not grid size
+TRAIN_ARGS = {'param_grid': {'n_estimators': [20], 'max_depth': [8]}, 'n_splits': 2}
+
+
+def _transform(work: Workload, rows: int) -> Callable:
+    from data.etl_pipeline import MicroSkillETL
+    etl = MicroSkillETL()
+    matches = work.matches(rows)
+    return lambda: etl.transform_to_dataframe(matches)
+
+
+def _percentile_ranks(work: Workload, rows: int) -> Callable:
+    from models.skill_scorer import MicroSkillScorer
+    scorer = MicroSkillScorer()
+    frame = work.frame.head(rows)
+    return lambda: [scorer.calculate_percentile_ranks(frame, role) for role in datasets.ROLES]
+
+
+def _overall_scores(work: Workload, rows: int) -> Callable:
+    from models.skill_scorer import MicroSkillScorer
+    scorer = MicroSkillScorer()
+    records = scorer.calculate_percentile_ranks(work.frame.head(rows), 'mid').to_dict('records')
+    return lambda: [scorer.calculate_overall_score(record) for record in records]
+
+
+def _role_benchmarks(work: Workload, rows: int) -> Callable:
+    from models.benchmark_comparator import BenchmarkComparator
+    comparator = BenchmarkComparator(engine=work.engine)
+    return lambda: [comparator.compare_to_role(work.player_id, role) for role in datasets.ROLES]
+
+
+def _similar_players(work: Workload, rows: int) -> Callable:
+    from models.benchmark_comparator import BenchmarkComparator
+    comparator = BenchmarkComparator(engine=work.engine)
+    return lambda: comparator.find_similar_players(work.player_id, 5)
+
+
+def _prepare_features(work: Workload, rows: int) -> Callable:
+    from models.performance_predictor import PerformancePredictor, TRAINING_COLUMNS
+    predictor = PerformancePredictor()
+    # The generated frame has no matches table, so no game_date
+    frame = work.frame.head(rows)[[c for c in TRAINING_COLUMNS if c in work.frame.columns]]
+    # prepare_features adds columns in place, so every run gets a fresh copy
+    return lambda: predictor.prepare_features(frame.copy())
+
+
+def _train(work: Workload, rows: int) -> Callable:
+    from models.performance_predictor import PerformancePredictor
+    frame = work.frame.head(rows)
+    return lambda: PerformancePredictor().train(frame.copy(), **TRAIN_ARGS)
+
+
+def _predict(work: Workload, rows: int) -> Callable:
+    predictor = work.trained_predictor
+    recent = work.frame[work.frame['player_id'] == work.player_id].tail(20)
+    return lambda: predictor.predict_next_performance(recent.copy())
+
+
+# name -> (setup, row cap). Setup returns the callable that is timed; the cap
+# keeps cases that hold every row as Python objects (payload dicts, records)
+# or fit a forest within memory and a sane runtime at the larger scales.
+CASES: Dict[str, tuple] = {
+    'etl.transform_to_dataframe': (_transform, 1_000_000),
+    'scorer.percentile_ranks': (_percentile_ranks, None),
+    'scorer.overall_scores': (_overall_scores, 100_000),
+    'comparator.compare_to_role': (_role_benchmarks, None),
+    'comparator.similar_players': (_similar_players, None),
+    'predictor.prepare_features': (_prepare_features, None),
+    'predictor.train': (_train, 1_000_000),
+    'predictor.predict': (_predict, None),
+}
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Seconds for a fixed NumPy + interpreter workload on this machine right now
+
+    Comparisons divide by it, so a baseline recorded on a faster or less
+    busy machine does not read as a regression everywhere.
+    """
+    import numpy as np
+    values = np.random.default_rng(0).random(500_000)
+
+    def workload():
+        np.sort(values)
+        total = 0.0
+        for value in values[:200_000].tolist():
+            total += value
+        return total
+
+    return round(min(_time(workload, repeat)), 6)
+
+
+def _time(fn: Callable, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_suite(scale: str = '10k',
+              rows: Optional[int] = None,
+              cases: Optional[List[str]] = None,
+              repeat: Optional[int] = None) -> Dict:
+    """Time every case on generated data; the best of `repeat` runs is the result"""
+    rows = rows or SCALES[scale]
+    # Large scales take long enough per run that one run is stable
+    repeat = repeat or (5 if rows <= 100_000 else 1)
+    work_dir = tempfile.mkdtemp(prefix='micromentor-bench-')
+    work = Workload(rows, work_dir)
+    calibration = calibrate()
+    results = {}
+    try:
+        for name in cases or CASES:
+            setup, cap = CASES[name]
+            case_rows = work.capped(cap)
+            fn = setup(work, case_rows)
+            timings = _time(fn, repeat)
+            best = min(timings)
+            results[name] = {
+                'rows': case_rows,
+                'seconds': round(best, 6),
+                'mean_seconds': round(sum(timings) / len(timings), 6),
+                'repeat': repeat,
+                'rows_per_second': round(case_rows / best) if best > 0 else None,
+            }
+            logger.info(f"{name}: {best:.4f}s over {case_rows} rows")
+    finally:
+        if 'engine' in work.__dict__:
+            work.engine.dispose()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'scale': scale,
+        'rows': rows,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'calibration_seconds': calibration,
+        'results': results,
+    }
+
+
+def baseline_path(scale: str) -> str:
+    return os.path.join(BASELINE_DIR, f'{scale}.json')
+
+
+def load_baseline(scale: str, path: Optional[str] = None) -> Optional[Dict]:
+    path = path or baseline_path(scale)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(run: Dict, path: Optional[str] = None) -> str:
+    path = path or baseline_path(run['scale'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+def compare(run: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> Dict:
+    """Per-case change against the baseline; `regressions` lists the flagged cases
+
+    Baseline timings are first scaled by how much slower or faster this
+    machine ran the calibration workload than the baseline's machine did.
+    """
+    speed = 1.0
+    if run.get('calibration_seconds') and baseline.get('calibration_seconds'):
+        speed = run['calibration_seconds'] / baseline['calibration_seconds']
+    cases = {}
+    for name, result in run['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None or previous['rows'] != result['rows']:
+            cases[name] = {'status': 'new', 'seconds': result['seconds']}
+            continue
+        expected = previous['seconds'] * speed
+        change = (result['seconds'] - expected) / expected if expected else 0.0
+        slower_by = result['seconds'] - expected
+        if change > threshold and slower_by > NOISE_FLOOR_SECONDS:
+            status = 'slower'
+        elif change < -threshold and -slower_by > NOISE_FLOOR_SECONDS:
+            status = 'faster'
+        else:
+            status = 'ok'
+        cases[name] = {
+            'status': status,
+            'baseline_seconds': previous['seconds'],
+            'seconds': result['seconds'],
+            'change': round(change, 4),
+        }
+    return {
+        'scale': run['scale'],
+        'threshold': threshold,
+        'baseline_created_at': baseline.get('created_at'),
+        'machine_factor': round(speed, 4),
+        'cases': cases,
+        'regressions': [name for name, case in cases.items() if case['status'] == 'slower'],
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"Benchmarks at {report['scale']} vs baseline from {report['baseline_created_at']} "
+             f"(threshold {report['threshold']:.0%}, machine factor {report['machine_factor']:.2f})"]
+    for name, case in report['cases'].items():
+        if case['status'] == 'new':
+            lines.append(f"  {name:<30} {case['seconds']:>10.4f}s  (no baseline)")
+        else:
+            lines.append(f"  {name:<30} {case['baseline_seconds']:>10.4f}s -> {case['seconds']:>10.4f}s "
+                         f"{case['change']:>+8.1%}  {case['status'].upper() if case['status'] != 'ok' else ''}")
+    lines.append(f"{len(report['regressions'])} regression(s)" +
+                 (f": {', '.join(report['regressions'])}" if report['regressions'] else ''))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Benchmark the analytics and ETL hot paths on generated data')
+    parser.add_argument('--scale', choices=SCALES, default='10k')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=None)
+    parser.add_argument('--repeat', type=int, default=None)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown that counts as a regression (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=None, help='Baseline file (default benchmarks/baselines/<scale>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--output', default=None, help='Also write the run and comparison to this JSON file')
+    args = parser.parse_args()
+
+    run = run_suite(args.scale, cases=args.cases, repeat=args.repeat)
+    baseline = load_baseline(args.scale, args.baseline)
+    report = compare(run, baseline, args.threshold) if baseline else None
+    if report:
+        print(format_report(report))
+    else:
+        print(json.dumps(run['results'], indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'run': run, 'comparison': report}, f, indent=2)
+    if args.save_baseline:
+        print(f"Baseline saved to {save_baseline(run, args.baseline)}")
+    sys.exit(1 if report and report['regressions'] else 0)
@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+# Add the project root to sys.path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.etl_pipeline import MicroSkillETL
+from data.sync_state import SyncStateStore
+
+logger = logging.getLogger(__name__)
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def plan_shards(start: str, end: str, shards: int, title_id: int = 3) -> List[Dict]:
+    """Split [start, end) into equal, non-overlapping start-time windows
+
+    GRID's startTimeScheduled filter is inclusive on both ends, so each
+    window stops one second before the next one begins.
+    """
+    start_at, end_at = _parse(start), _parse(end)
+    if end_at <= start_at:
+        raise ValueError("Backfill end must be after start")
+    shards = max(1, shards)
+    step = (end_at - start_at) / shards
+
+    plan = []
+    for index in range(shards):
+        since = start_at + step * index
+        until = end_at if index == shards - 1 else start_at + step * (index + 1)
+        since_iso = since.strftime(ISO_FORMAT)
+        plan.append({
+            'title_id': title_id,
+            'since': since_iso,
+            'until': (until - timedelta(seconds=1)).strftime(ISO_FORMAT),
+            'key': f'backfill:title:{title_id}:{since_iso}'
+        })
+    return plan
+
+
+def run_shard(shard: Dict,
+              state_dir: str,
+              replay: Optional[bool] = None,
+              restart: bool = False,
+              etl_factory: Callable[..., MicroSkillETL] = MicroSkillETL) -> Dict:
+    """Ingest one window in this process, checkpointing to the shard's own state file
+
+    A separate file per shard keeps concurrent processes from overwriting
+    each other's checkpoints. Completed shards are skipped on a re-run;
+    interrupted ones resume from their cursor. Rows that overlap earlier
+    runs are deduplicated by the loader's (match_id, player_id) upsert.
+    """
+    started = time.perf_counter()
+    state_file = os.path.join(state_dir, f"{shard['key'].replace(':', '_')}.json")
+    sync_state = SyncStateStore(state_file)
+    if restart:
+        sync_state.reset(shard['key'])
+
+    state = sync_state.get(shard['key'])
+    if state.get('completed'):
+        return {**shard, 'series': 0, 'seconds': 0.0, 'skipped': True}
+
+    etl = etl_factory(replay=replay)
+    etl.sync_state = sync_state
+    processed = etl.run_ingestion(
+        title_id=shard['title_id'],
+        limit=None,
+        # An unfinished shard without a cursor restarts at its watermark
+        since=state.get('watermark') or shard['since'],
+        until=shard['until'],
+        state_key=shard['key']
+    )
+    sync_state.update(shard['key'], completed=True)
+    return {
+        **shard,
+        'series': processed,
+        'seconds': round(time.perf_counter() - started, 3),
+        'skipped': False
+    }
+
+
+def run_backfill(start: str,
+                 end: str,
+                 title_id: int = 3,
+                 shards: Optional[int] = None,
+                 processes: Optional[int] = None,
+                 state_dir: Optional[str] = None,
+                 replay: Optional[bool] = None,
+                 restart: bool = False,
+                 etl_factory: Callable[..., MicroSkillETL] = MicroSkillETL) -> List[Dict]:
+    """Backfill a date range with one ingestion process per core
+
+    The range is cut into `shards` windows (default: four per process) so a
+    slow, busy tournament period does not leave the other cores idle.
+    """
+    processes = processes or int(os.getenv('BACKFILL_PROCESSES', os.cpu_count() or 1))
+    shards = shards or processes * 4
+    state_dir = state_dir or os.getenv(
+        'BACKFILL_STATE_DIR',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backfill_state')
+    )
+    os.makedirs(state_dir, exist_ok=True)
+    plan = plan_shards(start, end, shards, title_id)
+    logger.info(f"Backfilling {start} -> {end} in {len(plan)} shards on {processes} processes")
+
+    if processes == 1:
+        return [run_shard(shard, state_dir, replay, restart, etl_factory) for shard in plan]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            pool.submit(run_shard, shard, state_dir, replay, restart, etl_factory): shard
+            for shard in plan
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            logger.info(f"Shard {result['since']} -> {result['until']}: {result['series']} series "
+                        f"in {result['seconds']}s")
+            results.append(result)
+    return sorted(results, key=lambda result: result['since'])
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Sharded multi-process historical backfill')
+    parser.add_argument('--start', required=True, help='Earliest series start time (ISO 8601)')
+    parser.add_argument('--end', default=datetime.now(timezone.utc).strftime(ISO_FORMAT),
+                        help='End of the range, exclusive (default: now)')
+    parser.add_argument('--title-id', type=int, default=3)  # LoL
+    parser.add_argument('--shards', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--state-dir', default=None)
+    parser.add_argument('--replay', action='store_true', help='Serve every GRID call from the payload cache')
+    parser.add_argument('--restart', action='store_true', help='Ignore shard checkpoints')
+    args = parser.parse_args()
+
+    results = run_backfill(
+        args.start, args.end,
+        title_id=args.title_id,
+        shards=args.shards,
+        processes=args.processes,
+        state_dir=args.state_dir,
+        replay=args.replay or None,
+        restart=args.restart
+    )
+    total = sum(result['series'] for result in results)
+    print(f"Backfilled {total} series across {len(results)} shards")
@@ -0,0 +1,219 @@
+import math
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import MetaData, Table, create_engine, tuple_, select
+from data.migrations import migrate
+from data.matchups import LANE_COLUMNS, PAIR_COLUMNS, SUM_COLUMNS, matchup_deltas
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ('match_id', 'player_id')
+# Filled in by the database, never written by the loader
+SERVER_COLUMNS = ('id', 'created_at')
+
+
+class MicroSkillLoader:
+    """Chunked, idempotent upserts of micro-skill rows and their parent players/matches"""
+
+    def __init__(self, engine=None, chunk_size: Optional[int] = None):
+        self.engine = engine or create_engine(os.getenv('DATABASE_URL', 'sqlite:///micromentor.db'))
+        self.chunk_size = chunk_size or int(os.getenv('LOADER_CHUNK_SIZE', 1000))
+        self.metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+
+    def _insert(self, table: Table):
+        """Dialect-specific INSERT that supports ON CONFLICT"""
+        dialect = self.engine.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Upserts are not supported for {dialect}")
+        return insert(table)
+
+    def _ensure_tables(self):
+        """Bring the schema up to date, then reflect the tables"""
+        if self._tables:
+            return
+        migrate(self.engine)
+        for name in ('players', 'matches', 'player_micro_skills', 'champion_matchups'):
+            self._tables[name] = Table(name, self.metadata, autoload_with=self.engine)
+
+    @staticmethod
+    def _records(df: pd.DataFrame, columns: List[str]) -> List[Dict]:
+        """Plain Python records with NaN mapped to NULL"""
+        frame = df[columns].astype(object)
+        return frame.where(frame.notna(), None).to_dict('records')
+
+    @staticmethod
+    def _same(left, right) -> bool:
+        if isinstance(left, float) or isinstance(right, float):
+            if left is None or right is None:
+                return left is right
+            return math.isclose(float(left), float(right), rel_tol=1e-6, abs_tol=1e-9)
+        return left == right
+
+    def _upsert_parents(self, conn, chunk: pd.DataFrame):
+        players = self._tables['players']
+        player_rows = chunk.drop_duplicates('player_id', keep='last')
+        records = [
+            {
+                'player_id': row['player_id'],
+                'player_name': row.get('player_name') or row['player_id'],
+                'role': row.get('role')
+            }
+            for row in self._records(player_rows, [c for c in ('player_id', 'player_name', 'role') if c in chunk])
+        ]
+        stmt = self._insert(players)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=['player_id'],
+                set_={'player_name': stmt.excluded.player_name, 'role': stmt.excluded.role}
+            ),
+            records
+        )
+
+        matches = self._tables['matches']
+        match_columns = [c for c in matches.columns.keys() if c in chunk.columns and c not in SERVER_COLUMNS]
+        match_rows = chunk.drop_duplicates('match_id', keep='last')
+        stmt = self._insert(matches)
+        update_columns = [c for c in match_columns if c != 'match_id']
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['match_id'],
+                set_={c: stmt.excluded[c] for c in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=['match_id'])
+        conn.execute(stmt, self._records(match_rows, match_columns))
+
+    def _load_chunk(self, chunk: pd.DataFrame, columns: List[str]) -> Tuple[List[Tuple], List[Tuple], int, int]:
+        table = self._tables['player_micro_skills']
+        records = self._records(chunk, columns)
+        keys = [(r['match_id'], r['player_id']) for r in records]
+
+        with self.engine.begin() as conn:
+            existing = {
+                (row.match_id, row.player_id): row._mapping
+                for row in conn.execute(
+                    select(*[table.c[c] for c in columns]).where(
+                        tuple_(table.c.match_id, table.c.player_id).in_(keys)
+                    )
+                )
+            }
+
+            to_write, inserted_keys, updated_keys, skipped = [], [], [], 0
+            for key, record in zip(keys, records):
+                current = existing.get(key)
+                if current is None:
+                    inserted_keys.append(key)
+                elif all(self._same(current[c], record[c]) for c in columns):
+                    skipped += 1
+                    continue
+                else:
+                    updated_keys.append(key)
+                to_write.append(record)
+
+            cells = 0
+            if to_write:
+                self._upsert_parents(conn, chunk)
+                # Same transaction as the rows, so the matrix can never miss or double count them
+                cells = self._update_matchups(conn, to_write)
+                stmt = self._insert(table)
+                update_columns = [c for c in columns if c not in KEY_COLUMNS]
+                conn.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=list(KEY_COLUMNS),
+                        set_={c: stmt.excluded[c] for c in update_columns}
+                    ),
+                    to_write
+                )
+        return inserted_keys, updated_keys, skipped, cells
+
+    def _update_matchups(self, conn, to_write: List[Dict]) -> int:
+        """Move champion_matchups by what the pending upsert changes; returns cells touched
+
+        Reads the stored rows of every match being written, before the
+        upsert, and applies the difference between their matchups and the
+        matchups once the new values are in.
+        """
+        table = self._tables['player_micro_skills']
+        match_ids = list({record['match_id'] for record in to_write})
+        result = conn.execute(
+            select(*[table.c[c] for c in LANE_COLUMNS]).where(table.c.match_id.in_(match_ids))
+        )
+        before = pd.DataFrame(result.fetchall(), columns=LANE_COLUMNS, dtype=object).set_index(list(KEY_COLUMNS))
+        written = pd.DataFrame(to_write, dtype=object).set_index(list(KEY_COLUMNS))
+        # Columns the upsert does not write keep their stored values
+        columns = [c for c in LANE_COLUMNS if c in written.columns and c not in KEY_COLUMNS]
+        after = before.reindex(before.index.union(written.index))
+        after.loc[written.index, columns] = written[columns]
+
+        deltas = matchup_deltas(before.reset_index(), after.reset_index())
+        if deltas.empty:
+            return 0
+        matchups = self._tables['champion_matchups']
+        stmt = self._insert(matchups)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=PAIR_COLUMNS,
+                set_={c: matchups.c[c] + stmt.excluded[c] for c in SUM_COLUMNS}
+            ),
+            self._records(deltas, PAIR_COLUMNS + SUM_COLUMNS)
+        )
+        # Pairs that no longer occur, e.g. after a champion was corrected
+        conn.execute(matchups.delete().where(
+            matchups.c.champion.in_(deltas['champion'].unique().tolist()), matchups.c.games <= 0
+        ))
+        return len(deltas)
+
+    @staticmethod
+    def _match_chunks(df: pd.DataFrame, size: int) -> List[pd.DataFrame]:
+        """Chunks of about `size` rows that never split a match"""
+        # Group each match's rows together, keeping first-seen order
+        codes = pd.factorize(df['match_id'])[0]
+        df = df.iloc[np.argsort(codes, kind='stable')]
+        codes = np.sort(codes)
+        chunks, start = [], 0
+        while start < len(df):
+            end = min(start + size, len(df))
+            while end < len(df) and codes[end] == codes[end - 1]:
+                end += 1
+            chunks.append(df.iloc[start:end])
+            start = end
+        return chunks
+
+    def load(self, df: pd.DataFrame) -> Dict:
+        """Upsert rows in fixed-size transactional chunks
+
+        Returns counts of inserted, updated and skipped rows (unchanged,
+        duplicated within the batch or missing a key), plus the keys of the
+        rows that were new and of the rows that changed. Chunks are cut on match boundaries and each one
+        updates champion_matchups in its own transaction.
+        """
+        self._ensure_tables()
+        table = self._tables['player_micro_skills']
+        columns = [c for c in table.columns.keys() if c in df.columns and c not in SERVER_COLUMNS]
+
+        valid = df.dropna(subset=list(KEY_COLUMNS)).drop_duplicates(list(KEY_COLUMNS), keep='last')
+        stats = {'inserted': 0, 'updated': 0, 'skipped': len(df) - len(valid),
+                 'inserted_keys': [], 'updated_keys': [], 'matchups': 0}
+
+        for chunk in self._match_chunks(valid, self.chunk_size):
+            inserted_keys, updated_keys, skipped, cells = self._load_chunk(chunk, columns)
+            stats['inserted'] += len(inserted_keys)
+            stats['updated'] += len(updated_keys)
+            stats['skipped'] += skipped
+            stats['inserted_keys'].extend(inserted_keys)
+            stats['updated_keys'].extend(updated_keys)
+            stats['matchups'] += cells
+
+        logger.info(
+            f"Upserted player_micro_skills: {stats['inserted']} inserted, "
+            f"{stats['updated']} updated, {stats['skipped']} skipped"
+        )
+        return stats
@@ -1,21 +1,102 @@
 import pandas as pd
+import numpy as np
 import json
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 from data.grid_client import GRIDClient
+from data.sync_state import SyncStateStore
+from data.db_loader import MicroSkillLoader
+from data.streaming import StreamingPipeline
+from data.parquet_store import ParquetStore
+from data.series_index import IngestedSeriesIndex
+from data.run_report import IngestionRunReport, PeakMemorySampler, save_report
+from data.queries import recent_games
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 import logging
+import time
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Raw payload fields used by the transform, with the defaults calculate_micro_skills applies
+RAW_DEFAULTS = {
+    'cs_at_10': 0, 'gold_at_10': 0, 'opponent_gold_at_10': 0, 'xp_at_10': 0, 'opponent_xp_at_10': 0,
+    'solo_kills': 0, 'deaths_in_lane': 0, 'game_duration': 1800, 'vision_score': 0,
+    'control_wards_purchased': 0, 'wards_placed_total': 0, 'wards_cleared': 0,
+    'vision_denial_efficiency': 0, 'kills': 0, 'assists': 0, 'team_kills': 1, 'total_damage': 0,
+    'gold_spent': 1, 'deaths': 1, 'team_deaths': 1, 'kda': 0, 'average_combat_rating': 0,
+    'objective_damage_share': 0, 'first_blood_participation': False, 'epic_monster_participation': 0,
+    'tower_damage_contribution': 0, 'epic_monster_steals': 0, 'performance_variance': 0,
+    'clutch_performance': 0
+}
+
+# Raw payload fields carried as labels rather than numbers
+RAW_TEXT_FIELDS = ['id', 'name', 'role', 'champion', 'game_result']
+
+MATCH_META_COLUMNS = ['tournament_id', 'game_date']
+IDENTITY_COLUMNS = ['match_id', 'player_id', 'player_name', 'role', 'champion', 'game_result']
+CATEGORICAL_COLUMNS = ['role', 'champion', 'game_result']
+SKILL_COLUMNS = [
+    'cs_at_10', 'gold_diff_at_10', 'xp_diff_at_10', 'solo_kills', 'deaths_in_lane',
+    'vision_score_per_min', 'control_wards_purchased', 'wards_placed_total', 'wards_cleared',
+    'vision_denial_efficiency', 'kill_participation', 'damage_per_gold', 'death_share', 'kda',
+    'average_combat_rating', 'objective_damage_share', 'first_blood_participation',
+    'epic_monster_participation', 'tower_damage_contribution', 'epic_monster_steals',
+    'performance_variance', 'clutch_performance'
+]
+# Raw fields that pass through to a skill column unchanged
+PASSTHROUGH_COLUMNS = [
+    'cs_at_10', 'solo_kills', 'deaths_in_lane', 'control_wards_purchased', 'wards_placed_total',
+    'wards_cleared', 'vision_denial_efficiency', 'kda', 'average_combat_rating',
+    'objective_damage_share', 'epic_monster_participation', 'tower_damage_contribution',
+    'epic_monster_steals', 'performance_variance', 'clutch_performance'
+]
+
 
 class MicroSkillETL:
     """Extract, Transform, Load pipeline for micro-skill calculation"""
     
-    def __init__(self):
-        self.client = GRIDClient()
-        taxonomy_path = os.path.join(os.path.dirname(__file__), 'micro_skills_taxonomy.json')
-        with open(taxonomy_path, 'r') as f:
-            self.taxonomy = json.load(f)
+    def __init__(self,
+                 online_learning: Optional[bool] = None,
+                 max_workers: Optional[int] = None,
+                 replay: Optional[bool] = None,
+                 client: Optional[GRIDClient] = None,
+                 loader: Optional[MicroSkillLoader] = None,
+                 taxonomy: Optional[Dict] = None):
+        # Bounded concurrency for extraction; the client's pool is sized to match
+        self.max_workers = max_workers or int(os.getenv('ETL_MAX_WORKERS', 8))
+        # In replay mode every GRID response comes from the local payload cache;
+        # the API passes in the client, loader and taxonomy it already holds
+        self.client = client or GRIDClient(pool_size=self.max_workers, replay=replay)
+        # Micro-batch size and queue depth bound how much is in flight between stages
+        self.batch_size = int(os.getenv('ETL_BATCH_SIZE', 25))
+        self.queue_size = int(os.getenv('ETL_QUEUE_SIZE', 4))
+        self.sync_state = SyncStateStore()
+        # Series already loaded, checked before any extraction
+        self.series_index = IngestedSeriesIndex()
+        self.loader = loader
+        self.last_load_stats = {}
+        self.last_run_report = {}
+        if taxonomy is None:
+            taxonomy_path = os.path.join(os.path.dirname(__file__), 'micro_skills_taxonomy.json')
+            with open(taxonomy_path, 'r') as f:
+                taxonomy = json.load(f)
+        self.taxonomy = taxonomy
+
+        # Keep the performance model current by feeding it each load's new rows
+        if online_learning is None:
+            online_learning = os.getenv('ONLINE_MODEL_UPDATES', '').lower() in ('1', 'true', 'yes')
+        self.online_learning = online_learning
+        self.predictor = None
+        # Online updates are registered at most this often, and only this many versions are kept
+        self.model_save_interval = float(os.getenv('ONLINE_MODEL_SAVE_SECONDS', 300))
+        self.model_versions_kept = int(os.getenv('MODEL_REGISTRY_KEEP', 20))
+        self._model_saved_at = None
+        self._model_unsaved = False
+
+        # Optional columnar copy of ingested rows for long-range analytics
+        self.parquet_store = ParquetStore() if os.getenv('PARQUET_DATASET_DIR') else None
     
     def extract_match_data(self, series_id: str) -> Dict:
         """Extract detailed match data from GRID REST API"""
@@ -100,7 +181,17 @@ class MicroSkillETL:
             logger.error(f"Error extracting match data: {e}")
             return {}
     
-    def calculate_micro_skills(self, player_data: Dict) -> Dict:
+    def extract_many(self, series_ids: List[str]) -> List[Dict]:
+        """Extract several series concurrently, keeping input order"""
+        if not series_ids:
+            return []
+        workers = min(self.max_workers, len(series_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='grid-extract') as pool:
+            results = list(pool.map(self.extract_match_data, series_ids))
+        return [match for match in results if match]
+    
+    @staticmethod
+    def calculate_micro_skills(player_data: Dict) -> Dict:
         """Calculate all micro-skills for a player"""
         skills = {}
         
@@ -143,64 +234,375 @@ class MicroSkillETL:
         return skills
     
     def transform_to_dataframe(self, matches: List[Dict]) -> pd.DataFrame:
-        """Transform raw match data into structured DataFrame"""
-        rows = []
-        
-        for match in matches:
-            for player in match.get('players', []):
-                row = {
-                    'match_id': match.get('id'),
-                    'player_id': player.get('id'),
-                    'player_name': player.get('name'),
-                    'role': player.get('role', 'unknown'),
-                    'champion': player.get('champion', ''),
-                    'game_result': player.get('game_result', 'WIN'),
-                    **self.calculate_micro_skills(player)
-                }
-                rows.append(row)
-        
-        return pd.DataFrame(rows)
+        """Transform raw match data into a typed, columnar DataFrame
+
+        Equivalent to applying calculate_micro_skills to every player, but only
+        the RAW_DEFAULTS fields are pulled out of the payloads, each straight
+        into a typed array, and each metric is a whole-column NumPy expression
+        (float32 metrics, categorical labels).
+        """
+        matches = [match for match in matches if match.get('players')]
+        if not matches:
+            return pd.DataFrame(columns=IDENTITY_COLUMNS + SKILL_COLUMNS)
+
+        raw = self.raw_columns([player for match in matches for player in match['players']])
+        players_per_match = [len(match['players']) for match in matches]
+
+        def per_player(field: str) -> np.ndarray:
+            return np.repeat(np.array([match.get(field) for match in matches], dtype=object), players_per_match)
+
+        df = self.derive_micro_skills(raw, per_player('id'))
+        # Series details (tournament, scheduled start) feed the matches table upsert
+        for field in MATCH_META_COLUMNS:
+            if any(field in match for match in matches):
+                df[field] = per_player(field)
+        if 'game_date' in df.columns:
+            df['game_date'] = pd.to_datetime(df['game_date'], utc=True).dt.tz_localize(None)
+        return df
+
+    @staticmethod
+    def raw_columns(players: List[Dict]) -> pd.DataFrame:
+        """Columnar frame of only the fields the transform reads
+
+        The numeric RAW_DEFAULTS fields go straight into one float64 array in
+        a single pass (defaults merged under each payload, then one C-level
+        itemgetter), with nulls replaced by their defaults afterwards; the
+        payloads' other fields are never touched.
+        """
+        n = len(players)
+        numeric = itemgetter(*RAW_DEFAULTS)
+        values = np.fromiter(
+            (numeric({**RAW_DEFAULTS, **player}) for player in players),
+            dtype=(np.float64, len(RAW_DEFAULTS)), count=n
+        )
+        defaults = np.array(list(RAW_DEFAULTS.values()), dtype=np.float64)
+        values = np.where(np.isnan(values), defaults, values).T
+
+        columns = dict(zip(RAW_DEFAULTS, values))
+        for name in RAW_TEXT_FIELDS:
+            columns[name] = np.array([player.get(name) for player in players], dtype=object)
+        return pd.DataFrame(columns, copy=False)
+
+    @staticmethod
+    def derive_micro_skills(raw: pd.DataFrame, match_ids: np.ndarray) -> pd.DataFrame:
+        """Compute every micro-skill column from a frame of raw player payloads"""
+        n = len(raw)
+
+        def col(name: str) -> np.ndarray:
+            if name not in raw.columns:
+                return np.full(n, RAW_DEFAULTS[name], dtype=np.float64)
+            return raw[name].fillna(RAW_DEFAULTS[name]).to_numpy(dtype=np.float64)
+
+        def text(name: str, default=None) -> pd.Series:
+            if name not in raw.columns:
+                return pd.Series([default] * n, index=raw.index, dtype=object)
+            return raw[name] if default is None else raw[name].fillna(default)
+
+        skills = {name: col(name) for name in PASSTHROUGH_COLUMNS}
+        skills['gold_diff_at_10'] = col('gold_at_10') - col('opponent_gold_at_10')
+        skills['xp_diff_at_10'] = col('xp_at_10') - col('opponent_xp_at_10')
+        skills['vision_score_per_min'] = col('vision_score') / (col('game_duration') / 60)
+        skills['kill_participation'] = (col('kills') + col('assists')) / np.maximum(col('team_kills'), 1) * 100
+        skills['damage_per_gold'] = col('total_damage') / np.maximum(col('gold_spent'), 1)
+        skills['death_share'] = col('deaths') / np.maximum(col('team_deaths'), 1) * 100
+
+        columns = {
+            'match_id': match_ids,
+            'player_id': text('id'),
+            'player_name': text('name'),
+            'role': text('role', 'unknown'),
+            'champion': text('champion', ''),
+            'game_result': text('game_result', 'WIN')
+        }
+        for name in SKILL_COLUMNS:
+            if name == 'first_blood_participation':
+                columns[name] = col(name).astype(bool)
+            else:
+                columns[name] = skills[name].astype(np.float32)
+
+        for name in CATEGORICAL_COLUMNS:
+            columns[name] = columns[name].astype('category')
+        return pd.DataFrame(columns, index=raw.index)
     
-    def load_to_database(self, df: pd.DataFrame):
-        """Load processed data to database"""
-        # Using SQLAlchemy
-        from sqlalchemy import create_engine
-        db_url = os.getenv('DATABASE_URL', 'sqlite:///micromentor.db')
-        if not db_url:
-            logger.error("DATABASE_URL not set")
+    def load_to_database(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Upsert processed data to database and return the newly inserted rows"""
+        if self.loader is None:
+            self.loader = MicroSkillLoader()
+
+        self.last_load_stats = self.loader.load(df)
+        logger.info(
+            f"Loaded {len(df)} records to database "
+            f"({self.last_load_stats['inserted']} new, {self.last_load_stats['updated']} updated, "
+            f"{self.last_load_stats['skipped']} skipped)"
+        )
+        keys = list(zip(df['match_id'], df['player_id']))
+        inserted = set(self.last_load_stats['inserted_keys'])
+        new_rows = df[[key in inserted for key in keys]]
+        if self.parquet_store is not None:
+            # Changed rows are appended as newer versions; reads keep the latest
+            written = inserted | set(self.last_load_stats['updated_keys'])
+            self.parquet_store.write(df[[key in written for key in keys]])
+        return new_rows
+
+    def update_model(self, new_rows: pd.DataFrame):
+        """Incrementally update the performance model with newly loaded rows
+
+        The players' latest stored games are loaded alongside, so a batch
+        with a single new game per player still yields training targets.
+        """
+        if new_rows.empty:
             return
-            
-        engine = create_engine(db_url)
-        df.to_sql('player_micro_skills', engine, if_exists='append', index=False)
-        logger.info(f"Loaded {len(df)} records to database")
+        if self.predictor is None:
+            # Imported lazily so plain ingestion never pays for sklearn
+            from models.performance_predictor import PerformancePredictor
+            self.predictor = PerformancePredictor()
 
+        try:
+            from models.performance_predictor import HISTORY_GAMES
+            new_keys = set(zip(new_rows['match_id'], new_rows['player_id']))
+            per_player = HISTORY_GAMES + int(new_rows['player_id'].value_counts().max())
+            stored = recent_games(new_rows['player_id'].unique().tolist(), per_player, self.loader.engine)
+            if not stored.empty:
+                stored = stored[[key not in new_keys for key in zip(stored['match_id'], stored['player_id'])]]
+            used = self.predictor.partial_fit(new_rows.copy(), stored)
+            if used:
+                self._model_unsaved = True
+                version = self.save_model_update()
+                logger.info(f"Updated performance model with {used} rows"
+                            f"{f' (version {version})' if version else ''}")
+        except Exception as e:
+            logger.error(f"Online model update failed: {e}")
 
-    def run_ingestion(self, title_id: int = 3, limit: int = 50):
-        """Run the ingestion pipeline using GraphQL for series"""
-        logger.info(f"Starting ingestion for title {title_id}...")
-        series_data = self.client.fetch_series(title_id=title_id, limit=limit)
-        
-        total_count = series_data.get('data', {}).get('allSeries', {}).get('totalCount', 0)
-        logger.info(f"Found {total_count} series in total.")
-        
-        edges = series_data.get('data', {}).get('allSeries', {}).get('edges', [])
-        logger.info(f"Fetched {len(edges)} series nodes.")
-        
-        all_match_data = []
-        for edge in edges:
-            node = edge.get('node', {})
-            series_id = node.get('id')
-            match_details = self.extract_match_data(series_id)
-            if match_details:
-                all_match_data.append(match_details)
-        
-        if all_match_data:
-            df = self.transform_to_dataframe(all_match_data)
-            self.load_to_database(df)
-            logger.info("Ingestion complete.")
+    def save_model_update(self, force: bool = False) -> Optional[str]:
+        """Register the online-updated model, at most once per ONLINE_MODEL_SAVE_SECONDS
+
+        Each save writes a full model and its compact export, so micro-batches
+        are folded together in memory and old versions are pruned down to
+        MODEL_REGISTRY_KEEP. `force` flushes pending updates, e.g. at the end
+        of a run.
+        """
+        if not self._model_unsaved or self.predictor is None:
+            return None
+        now = time.monotonic()
+        if not force and self._model_saved_at is not None and now - self._model_saved_at < self.model_save_interval:
+            return None
+        from models.model_registry import ModelRegistry
+        try:
+            registry = ModelRegistry()
+            version = self.predictor.save_to_registry(registry, {'source': 'online'})
+            self._model_saved_at, self._model_unsaved = now, False
+            registry.prune(self.model_versions_kept)
+            return version
+        except Exception as e:
+            logger.error(f"Could not register the updated performance model: {e}")
+            return None
+
+    def _series_batches(self,
+                        pages: Iterator[Dict],
+                        limit: Optional[int],
+                        watermark: Optional[str],
+                        start_after: Optional[str]) -> Iterator[Dict]:
+        """Split series pages into micro-batches; a page's last batch carries its checkpoint"""
+        processed = 0
+        for page_number, page in enumerate(pages):
+            if page_number == 0:
+                logger.info(f"Found {page.get('totalCount', 0)} series in total.")
+
+            edges = page.get('edges', [])
+            truncated = limit is not None and len(edges) > limit - processed
+            if truncated:
+                edges = edges[:limit - processed]
+            nodes = [edge.get('node', {}) for edge in edges]
+            logger.info(f"Fetched {len(nodes)} series nodes.")
+
+            processed += len(nodes)
+            start_times = [node['startTimeScheduled'] for node in nodes if node.get('startTimeScheduled')]
+            if start_times:
+                watermark = max([watermark, *start_times]) if watermark else max(start_times)
+
+            # A page cut short by limit checkpoints at its last processed edge
+            page_info = page.get('pageInfo') or {}
+            finished = not page_info.get('hasNextPage') and not truncated
+            cursor = edges[-1].get('cursor') if truncated and edges else page_info.get('endCursor')
+            checkpoint = {
+                'watermark': watermark,
+                'cursor': None if finished else cursor,
+                'cursor_since': None if finished else start_after
+            }
+
+            series_ids = [node.get('id') for node in nodes if node.get('id')]
+            starts = range(0, max(len(series_ids), 1), self.batch_size)
+            for start in starts:
+                is_last = start + self.batch_size >= len(series_ids)
+                yield {
+                    'series_ids': series_ids[start:start + self.batch_size],
+                    'series_count': len(nodes) if is_last else 0,
+                    'checkpoint': checkpoint if is_last else None
+                }
+
+            if limit is not None and processed >= limit:
+                return
+
+    def run_ingestion(self,
+                      title_id: int = 3,
+                      limit: Optional[int] = 50,
+                      full_sync: bool = False,
+                      since: Optional[str] = None,
+                      until: Optional[str] = None,
+                      state_key: Optional[str] = None,
+                      page_size: int = 50,
+                      skip_ingested: Optional[bool] = None) -> int:
+        """Run the ingestion pipeline, paging through series newer than the watermark
+
+        Series are walked oldest-first from the persisted watermark (or from
+        `since`) and streamed through extract -> transform -> load stages in
+        micro-batches of ETL_BATCH_SIZE series, connected by bounded queues,
+        so memory stays flat and rows land while paging continues. After
+        every loaded page the cursor is checkpointed, so a run that stops
+        early, or hits `limit`, resumes where it left off. `until` defaults
+        to now: series scheduled in the future have not been played, and
+        letting them move the watermark would skip every game played before
+        them. Series already in
+        the ingested-series index are dropped before extraction unless
+        `skip_ingested` is False; it defaults to False in replay mode, whose
+        point is re-deriving history that is already ingested. Returns the
+        number of series processed.
+
+        Every run, failed ones included, leaves a report with per-stage time
+        and throughput, GRID call counts and latencies, and peak memory in
+        `last_run_report`, the ingestion_runs table and INGESTION_REPORT_DIR.
+        """
+        # Replays checkpoint separately so they never move the live sync's cursor
+        state_key = state_key or f"{'replay:' if self.client.replay else ''}title:{title_id}"
+        if skip_ingested is None:
+            skip_ingested = not self.client.replay
+        state = self.sync_state.get(state_key)
+        until = until or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        if state.get('cursor') and not full_sync:
+            after = state['cursor']
+            start_after = state.get('cursor_since')
+            logger.info(f"Resuming ingestion for {state_key} after cursor {after}...")
+        else:
+            after = None
+            start_after = since or (None if full_sync else state.get('watermark'))
+            logger.info(f"Starting ingestion for {state_key} from {start_after or 'the beginning'}...")
+
+        pages = self.client.iter_series(
+            title_id=title_id,
+            page_size=page_size if limit is None else max(1, min(page_size, limit)),
+            after=after,
+            start_after=start_after,
+            start_before=until
+        )
+        processed = 0
+        skipped = 0
+        if skip_ingested:
+            if self.loader is None:
+                self.loader = MicroSkillLoader()
+            self.series_index.sync_with(self.loader.engine)
+
+        report = IngestionRunReport(state_key, params={
+            'title_id': title_id, 'limit': limit, 'full_sync': full_sync, 'since': start_after,
+            'until': until, 'after': after, 'skip_ingested': skip_ingested,
+        })
+        # Test doubles and other clients may not count their calls
+        http_stats = getattr(self.client, 'stats', None)
+        http_mark = http_stats.mark() if http_stats is not None else None
+
+        def extract(batch: Dict) -> Dict:
+            nonlocal skipped
+            started = time.perf_counter()
+            series_ids = batch['series_ids']
+            if skip_ingested:
+                series_ids = self.series_index.new_ids(series_ids)
+                skipped += len(batch['series_ids']) - len(series_ids)
+            batch['matches'] = self.extract_many(series_ids)
+            # One aliased GraphQL request covers the details of the whole batch
+            details = self.client.fetch_series_details(series_ids) if series_ids else {}
+            for match in batch['matches']:
+                detail = details.get(match.get('id')) or {}
+                if detail:
+                    match['tournament_id'] = (detail.get('tournament') or {}).get('id')
+                    match['game_date'] = detail.get('startTimeScheduled')
+            report.record_stage('extract', time.perf_counter() - started,
+                                series=len(series_ids), rows=len(batch['matches']))
+            return batch
+
+        def transform(batch: Dict) -> Dict:
+            started = time.perf_counter()
+            matches = batch.pop('matches')
+            batch['df'] = self.transform_to_dataframe(matches) if matches else None
+            report.record_stage('transform', time.perf_counter() - started, series=len(matches),
+                                rows=0 if batch['df'] is None else len(batch['df']))
+            return batch
+
+        written = {'inserted': 0, 'updated': 0, 'skipped': 0}
+
+        def load(batch: Dict) -> Dict:
+            nonlocal processed
+            started = time.perf_counter()
+            df = batch.pop('df')
+            rows = 0 if df is None else len(df)
+            if df is not None and not df.empty:
+                inserted = self.load_to_database(df)
+                for key in written:
+                    written[key] += self.last_load_stats.get(key, 0)
+                self.series_index.add(df['match_id'].unique())
+                if self.online_learning:
+                    self.update_model(inserted)
+            processed += batch['series_count']
+            if batch['checkpoint']:
+                self.series_index.save()
+                self.sync_state.update(state_key, **batch['checkpoint'])
+            report.record_stage('load', time.perf_counter() - started, series=batch['series_count'], rows=rows)
+            return batch
+
+        pipeline = StreamingPipeline(
+            [('extract', extract), ('transform', transform), ('load', load)],
+            queue_size=self.queue_size
+        )
+        memory = PeakMemorySampler()
+        status, error = 'success', None
+        try:
+            with memory:
+                pipeline.run(self._series_batches(pages, limit, state.get('watermark'), start_after))
+            if self.online_learning:
+                self.save_model_update(force=True)
+        except Exception as e:
+            status, error = 'failed', f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            self.last_run_report = report.finish(
+                status, processed, skipped, written,
+                http=http_stats.since(http_mark) if http_stats is not None else None,
+                memory=memory.summary(), error=error
+            )
+            save_report(self.last_run_report, self.loader.engine if self.loader is not None else None)
+
+        summary = self.last_run_report
+        logger.info(
+            f"Ingestion complete ({summary['run_id']}): {processed} series processed ({skipped} already ingested), "
+            f"{summary['rows_loaded']} rows in {summary['wall_seconds']:.1f}s, "
+            f"{summary['http'].get('calls', 0)} GRID calls, peak memory {summary['memory']['peak_mb']} MB."
+        )
+        return processed
 
 if __name__ == '__main__':
-    etl = MicroSkillETL()
-    
-    # Run the new ingestion flow
-    etl.run_ingestion(title_id=3) # LoL
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ingest GRID series into player_micro_skills')
+    parser.add_argument('--title-id', type=int, default=3)  # LoL
+    parser.add_argument('--limit', type=int, default=None, help='Max series this run (default: all new)')
+    parser.add_argument('--full-sync', action='store_true', help='Ignore the watermark and walk all history')
+    parser.add_argument('--replay', action='store_true', help='Serve every GRID call from the payload cache')
+    parser.add_argument('--refetch', action='store_true',
+                        help='Re-extract series that are already ingested (always on with --replay)')
+    parser.add_argument('--rebuild-index', action='store_true', help='Rebuild the ingested-series index from the database')
+    args = parser.parse_args()
+
+    etl = MicroSkillETL(replay=args.replay or None)
+    if args.rebuild_index:
+        etl.series_index.rebuild(MicroSkillLoader().engine)
+    etl.run_ingestion(title_id=args.title_id, limit=args.limit, full_sync=args.full_sync,
+                      skip_ingested=False if args.refetch else None)
@@ -1,18 +1,45 @@
 import requests
 import os
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from data.payload_cache import PayloadCache
+from data.run_report import HttpStats
 import logging
+import time
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Aliased roots per request; GRID rejects queries past its complexity limit
+MAX_BATCH_SIZE = 50
+
+SERIES_DETAIL_FIELDS = """
+    id
+    startTimeScheduled
+    format { name }
+    tournament { id name }
+    teams { baseInfo { id name } }
+"""
+
+PLAYER_DETAIL_FIELDS = """
+    id
+    nickname
+    team { id name }
+"""
+
 
 class GRIDClient:
     """Client for interacting with GRID API"""
     
-    def __init__(self):
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 pool_size: Optional[int] = None,
+                 cache: Optional[PayloadCache] = None,
+                 replay: Optional[bool] = None):
         self.api_key = os.getenv('GRID_API_KEY')
         if self.api_key == "your_api_key_here":
             self.api_key = None
@@ -35,15 +62,86 @@ class GRIDClient:
             # Actually, let's keep it as is but add a fallback in execute_query maybe?
             # For now, let's try to use the key with Open Access URL
             self.graphql_url = "https://api-op.grid.gg/central-data/graphql"
+
+        self.timeout = timeout if timeout is not None else float(os.getenv('GRID_TIMEOUT', 10))
+        self.batch_size = min(int(os.getenv('GRID_BATCH_SIZE', 25)), MAX_BATCH_SIZE)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('GRID_MAX_RETRIES', 3))
+        self.session = self._build_session(
+            self.max_retries,
+            pool_size if pool_size is not None else int(os.getenv('GRID_POOL_SIZE', 16))
+        )
+        # Call counts, latencies and retries for ingestion run reports
+        self.stats = HttpStats()
+
+        # Raw responses are cached when GRID_CACHE_DIR is set; replay serves only from cache
+        if replay is None:
+            replay = os.getenv('GRID_REPLAY', '').lower() in ('1', 'true', 'yes')
+        if cache is None and (replay or os.getenv('GRID_CACHE_DIR')):
+            cache = PayloadCache()
+        self.cache = cache
+        self.replay = replay
+
+    def _build_session(self, max_retries: int, pool_size: int) -> requests.Session:
+        """Keep-alive session with a connection pool and exponential-backoff retries"""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # GraphQL reads go over POST, so POST is safe to retry here
+            allowed_methods=frozenset({'GET', 'POST'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
+    def _cached(self, kind: str, url: str, request: Dict, fetch: Callable[[], Any], empty: Any) -> Any:
+        """Serve a request from the payload cache, or fetch it and store the raw response"""
+        if self.cache is None:
+            return fetch()
+
+        key = PayloadCache.key(kind, url, request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.record_cache_hit()
+            return cached
+        if self.replay:
+            logger.warning(f"Replay cache miss for {kind} {url}")
+            return empty
+
+        result = fetch()
+        # Only successful responses are worth replaying
+        if result and not (isinstance(result, dict) and result.get('errors')):
+            self.cache.put(key, result)
+        return result
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """One timed request; retries are read back from urllib3's retry history"""
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            # Connection errors surface only once every retry is used up
+            self.stats.record(time.perf_counter() - started, None, self.max_retries)
+            raise
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', None) or ()
+        self.stats.record(time.perf_counter() - started, response.status_code, len(retries))
+        return response
+
     def execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute a GraphQL query"""
         payload = {'query': query}
         if variables:
             payload['variables'] = variables
-            
+        return self._cached('graphql', self.graphql_url, payload, lambda: self._post_graphql(payload), {})
+
+    def _post_graphql(self, payload: Dict) -> Dict:
         try:
-            response = requests.post(self.graphql_url, headers=self.headers, json=payload)
+            response = self._send('POST', self.graphql_url, json=payload)
             if response.status_code != 200:
                 logger.error(f"GraphQL error {response.status_code}: {response.text}")
             response.raise_for_status()
@@ -55,12 +153,17 @@ class GRIDClient:
     def fetch_series(self, 
                      title_id: int = 3,  # Default LoL
                      limit: int = 50,
-                     types: str = 'ESPORTS') -> Dict:
-        """Fetch series from GRID GraphQL API"""
+                     types: str = 'ESPORTS',
+                     after: Optional[str] = None,
+                     start_after: Optional[str] = None,
+                     start_before: Optional[str] = None,
+                     order_direction: str = 'DESC') -> Dict:
+        """Fetch one page of series from GRID GraphQL API"""
         query = """
-        query AllSeries($first: Int, $filter: SeriesFilter, $orderBy: SeriesOrderBy, $orderDirection: OrderDirection) {
+        query AllSeries($first: Int, $after: Cursor, $filter: SeriesFilter, $orderBy: SeriesOrderBy, $orderDirection: OrderDirection) {
             allSeries (
                 first: $first,
+                after: $after,
                 filter: $filter,
                 orderBy: $orderBy,
                 orderDirection: $orderDirection
@@ -73,8 +176,10 @@ class GRIDClient:
                     endCursor
                 }
                 edges {
+                    cursor
                     node {
                         id
+                        startTimeScheduled
                         title {
                             id
                         }
@@ -87,16 +192,96 @@ class GRIDClient:
             }
         }
         """
+        series_filter = {
+            "titleId": title_id,
+            "types": types
+        }
+        if start_after or start_before:
+            series_filter["startTimeScheduled"] = {
+                key: value for key, value in (("gte", start_after), ("lte", start_before)) if value
+            }
         variables = {
             "first": limit,
-            "filter": {
-                "titleId": title_id,
-                "types": types
-            },
+            "filter": series_filter,
             "orderBy": "StartTimeScheduled",
-            "orderDirection": "DESC"
+            "orderDirection": order_direction
         }
+        if after:
+            variables["after"] = after
         return self.execute_query(query, variables)
+
+    def iter_series(self,
+                    title_id: int = 3,
+                    page_size: int = 50,
+                    types: str = 'ESPORTS',
+                    after: Optional[str] = None,
+                    start_after: Optional[str] = None,
+                    start_before: Optional[str] = None,
+                    order_direction: str = 'ASC') -> Iterator[Dict]:
+        """Walk every page of allSeries via endCursor, yielding each page
+
+        Pages are yielded whole (totalCount, pageInfo, edges) so callers can
+        checkpoint pageInfo.endCursor and resume with after= later.
+        """
+        while True:
+            response = self.fetch_series(
+                title_id=title_id,
+                limit=page_size,
+                types=types,
+                after=after,
+                start_after=start_after,
+                start_before=start_before,
+                order_direction=order_direction
+            )
+            page = (response.get('data') or {}).get('allSeries')
+            if not page:
+                if response.get('errors'):
+                    logger.error(f"Series pagination stopped: {response['errors']}")
+                return
+            yield page
+
+            page_info = page.get('pageInfo') or {}
+            if not page_info.get('hasNextPage') or not page_info.get('endCursor'):
+                return
+            after = page_info['endCursor']
+    
+    def build_batch_query(self, root_field: str, id_type: str, count: int, selection: str) -> str:
+        """Multi-root query with one aliased root per ID: r0: series(id: $id0) { ... }"""
+        params = ', '.join(f'$id{i}: {id_type}' for i in range(count))
+        roots = '\n'.join(f'r{i}: {root_field}(id: $id{i}) {{ {selection} }}' for i in range(count))
+        return f'query Batch_{root_field}({params}) {{\n{roots}\n}}'
+
+    def batched_lookup(self,
+                       root_field: str,
+                       ids: List[str],
+                       selection: str,
+                       id_type: str = 'ID!',
+                       batch_size: Optional[int] = None) -> Dict[str, Optional[Dict]]:
+        """Fetch many entities by ID, batch_size per request, split back out per ID
+
+        IDs missing from a response (not found, or a failed request) map to None.
+        """
+        batch_size = max(1, min(batch_size or self.batch_size, MAX_BATCH_SIZE))
+        unique_ids = list(dict.fromkeys(ids))
+        results = {}
+        for start in range(0, len(unique_ids), batch_size):
+            chunk = unique_ids[start:start + batch_size]
+            query = self.build_batch_query(root_field, id_type, len(chunk), selection)
+            response = self.execute_query(query, {f'id{i}': entity_id for i, entity_id in enumerate(chunk)})
+            if response.get('errors'):
+                logger.warning(f"Batched {root_field} lookup returned errors: {response['errors']}")
+            data = response.get('data') or {}
+            for i, entity_id in enumerate(chunk):
+                results[entity_id] = data.get(f'r{i}')
+        return results
+
+    def fetch_series_details(self, series_ids: List[str], batch_size: Optional[int] = None) -> Dict[str, Optional[Dict]]:
+        """Fetch details for many series in aliased multi-root requests"""
+        return self.batched_lookup('series', series_ids, SERIES_DETAIL_FIELDS, batch_size=batch_size)
+
+    def fetch_players(self, player_ids: List[str], batch_size: Optional[int] = None) -> Dict[str, Optional[Dict]]:
+        """Fetch many players in aliased multi-root requests"""
+        return self.batched_lookup('player', player_ids, PLAYER_DETAIL_FIELDS, batch_size=batch_size)
     
     def fetch_matches(self, 
                      game: str = 'lol',
@@ -112,13 +297,10 @@ class GRIDClient:
         if player_id:
             params['player_id'] = player_id
         
-        try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return []
+        return self._cached(
+            'rest', endpoint, params,
+            lambda: self._get_json(endpoint, params, [], "API request failed"), []
+        )
     
     def fetch_player_stats(self, player_id: str, season: Optional[str] = None) -> Dict:
         """Fetch detailed player statistics"""
@@ -127,13 +309,19 @@ class GRIDClient:
         if season:
             params['season'] = season
         
+        return self._cached(
+            'rest', endpoint, params,
+            lambda: self._get_json(endpoint, params, {}, "Failed to fetch player stats"), {}
+        )
+
+    def _get_json(self, endpoint: str, params: Dict, empty: Any, error_message: str) -> Any:
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = self._send('GET', endpoint, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch player stats: {e}")
-            return {}
+            logger.error(f"{error_message}: {e}")
+            return empty
     
     def fetch_team_matches(self, team_id: str, limit: int = 50) -> List[Dict]:
         """Fetch all matches for a specific team"""
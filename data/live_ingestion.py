@@ -0,0 +1,276 @@
+import json
+import os
+import socket
+import sys
+import time
+import logging
+import requests
+from typing import Dict, Iterator, List, Optional
+
+# Add the project root to sys.path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.etl_pipeline import MicroSkillETL
+
+logger = logging.getLogger(__name__)
+
+TEN_MINUTES = 600
+# Deaths before the first tower usually falls count as laning-phase deaths
+LANE_PHASE_END = 840
+
+
+class FileEventSource:
+    """In-game events from a JSON-lines file, optionally following appends like tail -f"""
+
+    def __init__(self, path: str, follow: bool = False, poll_interval: float = 0.25):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open(self.path, 'r') as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    if not self.follow:
+                        return
+                    time.sleep(self.poll_interval)
+                    continue
+                if line.strip():
+                    yield json.loads(line)
+
+
+class SocketEventSource:
+    """In-game events as JSON lines read from a TCP socket"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+    def __iter__(self) -> Iterator[Dict]:
+        with socket.create_connection((self.host, self.port)) as conn:
+            with conn.makefile('r', encoding='utf-8') as stream:
+                for line in stream:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class LiveMatchState:
+    """Running counters for one match; every event updates them in O(1)"""
+
+    def __init__(self, match_id: str, players: List[Dict]):
+        self.match_id = match_id
+        self.game_time = 0
+        self.finished = False
+        self.first_blood_taken = False
+        self.team_kills: Dict[str, int] = {}
+        self.team_deaths: Dict[str, int] = {}
+        self.players: Dict[str, Dict] = {}
+        for player in players:
+            self.add_player(player)
+
+    def add_player(self, player: Dict):
+        team = player.get('team', 'unknown')
+        self.team_kills.setdefault(team, 0)
+        self.team_deaths.setdefault(team, 0)
+        self.players[player['id']] = {
+            'id': player['id'],
+            'name': player.get('name', player['id']),
+            'role': player.get('role', 'unknown'),
+            'champion': player.get('champion', ''),
+            'team': team,
+            'cs': 0, 'cs_at_10': 0, 'gold': 0, 'gold_at_10': 0, 'xp': 0, 'xp_at_10': 0,
+            'kills': 0, 'assists': 0, 'deaths': 0, 'solo_kills': 0, 'deaths_in_lane': 0,
+            'vision_score': 0, 'wards_placed_total': 0, 'wards_cleared': 0,
+            'control_wards_purchased': 0, 'total_damage': 0, 'gold_spent': 0,
+            'tower_damage_contribution': 0, 'first_blood_participation': False,
+            'game_result': None
+        }
+
+    def _player(self, player_id: Optional[str]) -> Optional[Dict]:
+        return self.players.get(player_id) if player_id else None
+
+    def apply(self, event: Dict):
+        self.game_time = max(self.game_time, event.get('game_time', self.game_time))
+        before_ten = self.game_time <= TEN_MINUTES
+        kind = event.get('type')
+        player = self._player(event.get('player_id'))
+
+        if kind == 'player_joined':
+            self.add_player(event['player'])
+        elif kind == 'cs' and player:
+            player['cs'] += event.get('amount', 1)
+            if before_ten:
+                player['cs_at_10'] = player['cs']
+        elif kind == 'stats' and player:
+            # Periodic totals; the last value seen before 10:00 is the @10 figure
+            for field in ('gold', 'xp', 'vision_score', 'total_damage', 'gold_spent'):
+                if field in event:
+                    player[field] = event[field]
+            if before_ten:
+                player['gold_at_10'] = player['gold']
+                player['xp_at_10'] = player['xp']
+        elif kind == 'ward_placed' and player:
+            player['wards_placed_total'] += 1
+        elif kind == 'ward_cleared' and player:
+            player['wards_cleared'] += 1
+        elif kind == 'control_ward_purchased' and player:
+            player['control_wards_purchased'] += 1
+        elif kind == 'tower_damage' and player:
+            player['tower_damage_contribution'] += event.get('amount', 0)
+        elif kind == 'kill':
+            self._apply_kill(event)
+        elif kind == 'game_end':
+            self.finished = True
+            for p in self.players.values():
+                p['game_result'] = 'WIN' if p['team'] == event.get('winning_team') else 'LOSS'
+
+    def _apply_kill(self, event: Dict):
+        killer = self._player(event.get('killer_id'))
+        victim = self._player(event.get('victim_id'))
+        assists = [p for p in (self._player(pid) for pid in event.get('assist_ids', [])) if p]
+        first_blood = not self.first_blood_taken
+
+        if killer:
+            killer['kills'] += 1
+            self.team_kills[killer['team']] += 1
+            if not assists:
+                killer['solo_kills'] += 1
+        for assist in assists:
+            assist['assists'] += 1
+        if victim:
+            victim['deaths'] += 1
+            self.team_deaths[victim['team']] += 1
+            if self.game_time <= LANE_PHASE_END:
+                victim['deaths_in_lane'] += 1
+        if first_blood:
+            self.first_blood_taken = True
+            for participant in [killer, *assists]:
+                if participant:
+                    participant['first_blood_participation'] = True
+
+    def _lane_opponent(self, player: Dict) -> Optional[Dict]:
+        for other in self.players.values():
+            if other['role'] == player['role'] and other['team'] != player['team']:
+                return other
+        return None
+
+    def raw_payload(self) -> Dict:
+        """Match in the same shape extract_match_data produces, for the batch transform"""
+        players = []
+        for p in self.players.values():
+            opponent = self._lane_opponent(p) or {}
+            players.append({
+                'id': p['id'],
+                'name': p['name'],
+                'role': p['role'],
+                'champion': p['champion'],
+                'cs_at_10': p['cs_at_10'],
+                'gold_at_10': p['gold_at_10'],
+                'opponent_gold_at_10': opponent.get('gold_at_10', 0),
+                'xp_at_10': p['xp_at_10'],
+                'opponent_xp_at_10': opponent.get('xp_at_10', 0),
+                'solo_kills': p['solo_kills'],
+                'deaths_in_lane': p['deaths_in_lane'],
+                'vision_score': p['vision_score'],
+                'game_duration': max(self.game_time, 60),
+                'control_wards_purchased': p['control_wards_purchased'],
+                'wards_placed_total': p['wards_placed_total'],
+                'wards_cleared': p['wards_cleared'],
+                'kills': p['kills'],
+                'assists': p['assists'],
+                'deaths': p['deaths'],
+                'team_kills': self.team_kills[p['team']],
+                'team_deaths': self.team_deaths[p['team']],
+                'total_damage': p['total_damage'],
+                'gold_spent': p['gold_spent'],
+                'kda': (p['kills'] + p['assists']) / max(p['deaths'], 1),
+                'first_blood_participation': p['first_blood_participation'],
+                'tower_damage_contribution': p['tower_damage_contribution'],
+                'game_result': p['game_result'] or 'IN_PROGRESS'
+            })
+        return {'id': self.match_id, 'players': players}
+
+
+class ApiSnapshotSink:
+    """Pushes live snapshots to the MicroMentor API"""
+
+    def __init__(self, api_url: str = None, timeout: float = 5):
+        self.api_url = (api_url or os.getenv('MICROMENTOR_API_URL', 'http://localhost:5001')).rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def push(self, snapshot: Dict):
+        url = f"{self.api_url}/api/live/matches/{snapshot['match_id']}"
+        try:
+            self.session.post(url, json=snapshot, timeout=self.timeout).raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to push live snapshot for {snapshot['match_id']}: {e}")
+
+
+class LiveIngestor:
+    """Consumes an event stream, keeps per-match counters and pushes snapshots"""
+
+    def __init__(self, sink, snapshot_interval: int = 60):
+        self.sink = sink
+        # Game-time seconds between pushes; the final snapshot is always sent
+        self.snapshot_interval = snapshot_interval
+        self.matches: Dict[str, LiveMatchState] = {}
+        self._last_push: Dict[str, int] = {}
+
+    def snapshot(self, state: LiveMatchState) -> Dict:
+        match = state.raw_payload()
+        players = {
+            player['id']: MicroSkillETL.calculate_micro_skills(player)
+            for player in match['players']
+        }
+        return {
+            'match_id': state.match_id,
+            'game_time': state.game_time,
+            'final': state.finished,
+            'match': match,
+            'players': players
+        }
+
+    def handle(self, event: Dict):
+        match_id = event.get('match_id')
+        if event.get('type') == 'game_start':
+            self.matches[match_id] = LiveMatchState(match_id, event.get('players', []))
+            self._last_push[match_id] = 0
+            return
+        state = self.matches.get(match_id)
+        if state is None:
+            logger.warning(f"Event for unknown match {match_id}: {event.get('type')}")
+            return
+
+        state.apply(event)
+        if state.finished or state.game_time - self._last_push[match_id] >= self.snapshot_interval:
+            self.sink.push(self.snapshot(state))
+            self._last_push[match_id] = state.game_time
+        if state.finished:
+            del self.matches[match_id]
+            del self._last_push[match_id]
+
+    def run(self, source):
+        for event in source:
+            self.handle(event)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stream live match events into MicroMentor')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--file', help='JSON-lines event file')
+    group.add_argument('--socket', help='host:port serving JSON-lines events')
+    parser.add_argument('--follow', action='store_true', help='Keep reading as the file grows')
+    parser.add_argument('--api-url', default=None)
+    parser.add_argument('--snapshot-interval', type=int, default=60)
+    args = parser.parse_args()
+
+    if args.file:
+        source = FileEventSource(args.file, follow=args.follow)
+    else:
+        host, port = args.socket.rsplit(':', 1)
+        source = SocketEventSource(host, int(port))
+    LiveIngestor(ApiSnapshotSink(args.api_url), args.snapshot_interval).run(source)
@@ -0,0 +1,65 @@
+import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from data.migrations import MATCHUP_REBUILD_SQL
+
+logger = logging.getLogger(__name__)
+
+PAIR_COLUMNS = ['champion', 'role', 'opponent']
+SUM_COLUMNS = ['games', 'wins', 'gold_diff_at_10_sum', 'xp_diff_at_10_sum', 'cs_at_10_sum', 'opponent_cs_at_10_sum']
+
+
+LANE_COLUMNS = ['match_id', 'player_id', 'role', 'champion', 'game_result', 'gold_diff_at_10', 'xp_diff_at_10', 'cs_at_10']
+
+
+def matchup_cells(lanes: pd.DataFrame) -> pd.DataFrame:
+    """Matrix contributions of whole matches: every same-role pair, from both sides"""
+    if lanes.empty:
+        return pd.DataFrame(columns=PAIR_COLUMNS + SUM_COLUMNS)
+    rows = pd.DataFrame({
+        'match_id': lanes['match_id'].astype(str).to_numpy(),
+        'player_id': lanes['player_id'].astype(str).to_numpy(),
+        'role': lanes['role'].astype(object).to_numpy(),
+        'champion': lanes['champion'].astype(object).to_numpy(),
+        'win': (lanes['game_result'].astype(object) == 'WIN').to_numpy(),
+        'gold_diff_at_10': pd.to_numeric(lanes['gold_diff_at_10']).astype(float).fillna(0).to_numpy(),
+        'xp_diff_at_10': pd.to_numeric(lanes['xp_diff_at_10']).astype(float).fillna(0).to_numpy(),
+        'cs_at_10': pd.to_numeric(lanes['cs_at_10']).astype(float).fillna(0).to_numpy(),
+    }).dropna(subset=['role', 'champion'])
+
+    pairs = rows.merge(rows[['match_id', 'role', 'player_id', 'champion', 'cs_at_10']],
+                       on=['match_id', 'role'], suffixes=('', '_opp'))
+    pairs = pairs[pairs['player_id'] != pairs['player_id_opp']]
+    return (
+        pairs.rename(columns={'champion_opp': 'opponent'})
+        .groupby(PAIR_COLUMNS, sort=False)
+        .agg(games=('win', 'size'), wins=('win', 'sum'), gold_diff_at_10_sum=('gold_diff_at_10', 'sum'),
+             xp_diff_at_10_sum=('xp_diff_at_10', 'sum'), cs_at_10_sum=('cs_at_10', 'sum'),
+             opponent_cs_at_10_sum=('cs_at_10_opp', 'sum'))
+        .reset_index()
+    )
+
+
+def matchup_deltas(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """What to add to the matrix when the stored lanes of some matches go from `before` to `after`
+
+    Both frames hold every stored row of the affected matches, so inserts,
+    in-place updates and matches that arrive over several loads all net
+    out to exactly what a full rebuild would hold. Cells that do not
+    change are dropped.
+    """
+    deltas = matchup_cells(after).set_index(PAIR_COLUMNS).subtract(
+        matchup_cells(before).set_index(PAIR_COLUMNS), fill_value=0
+    )
+    deltas = deltas[~np.isclose(deltas[SUM_COLUMNS].to_numpy(dtype=float), 0, atol=1e-9).all(axis=1)]
+    return deltas.reset_index()[PAIR_COLUMNS + SUM_COLUMNS]
+
+
+def rebuild_matchups(engine):
+    """Recompute every cell from player_micro_skills, e.g. after rows were edited in place"""
+    with engine.begin() as conn:
+        conn.execute(text('DELETE FROM champion_matchups'))
+        conn.execute(text(MATCHUP_REBUILD_SQL))
+    logger.info("Rebuilt champion_matchups from player_micro_skills")
@@ -0,0 +1,319 @@
+import os
+import sys
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_TABLES = ['role_benchmarks', 'player_aggregated_stats', 'player_micro_skills', 'matches', 'players']
+PARITY_COLUMNS = [
+    ('solo_kills', 'FLOAT'), ('deaths_in_lane', 'FLOAT'), ('wards_placed_total', 'INT'),
+    ('vision_denial_efficiency', 'FLOAT'), ('average_combat_rating', 'FLOAT'),
+    ('epic_monster_participation', 'FLOAT'), ('tower_damage_contribution', 'FLOAT'),
+    ('epic_monster_steals', 'INT'), ('player_name', 'VARCHAR(255)'),
+    ('performance_variance', 'FLOAT'), ('clutch_performance', 'FLOAT'),
+]
+# Lane opponents are the players of the other team in the same role of a
+# match; each pair is counted from both champions' side. The UNIQUE
+# (match_id, player_id) index serves the self-join.
+MATCHUP_REBUILD_SQL = """
+    INSERT INTO champion_matchups (
+        champion, role, opponent, games, wins, gold_diff_at_10_sum, xp_diff_at_10_sum,
+        cs_at_10_sum, opponent_cs_at_10_sum
+    )
+    SELECT a.champion, a.role, b.champion, COUNT(*),
+           SUM(CASE WHEN a.game_result = 'WIN' THEN 1 ELSE 0 END),
+           COALESCE(SUM(a.gold_diff_at_10), 0), COALESCE(SUM(a.xp_diff_at_10), 0),
+           COALESCE(SUM(a.cs_at_10), 0), COALESCE(SUM(b.cs_at_10), 0)
+    FROM player_micro_skills a
+    JOIN player_micro_skills b
+      ON b.match_id = a.match_id AND b.role = a.role AND b.player_id <> a.player_id
+    WHERE a.champion IS NOT NULL AND b.champion IS NOT NULL
+    GROUP BY a.champion, a.role, b.champion
+"""
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a SQL script into statements, dropping -- comments first
+
+    Comments are stripped before splitting so a ';' inside a comment can
+    never cut a statement in half.
+    """
+    lines = [line.split('--', 1)[0] for line in sql.splitlines()]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def _schema_file(name: str) -> List[str]:
+    with open(os.path.join(SCHEMA_DIR, name), 'r') as f:
+        return split_statements(f.read())
+
+
+# Versioned, reversible steps. Each step lists its statements per dialect
+# ('sqlite', 'postgresql'); a callable is resolved when the step runs.
+MIGRATIONS: List[Dict] = [
+    {
+        'version': 1,
+        'name': 'base schema',
+        'up': {
+            'sqlite': lambda: _schema_file('sqlite_schema.sql'),
+            'postgresql': lambda: _schema_file('database_schema.sql'),
+        },
+        'down': {
+            'sqlite': [f'DROP TABLE IF EXISTS {table}' for table in BASE_TABLES],
+            'postgresql': [f'DROP TABLE IF EXISTS {table}' for table in BASE_TABLES],
+        },
+    },
+    {
+        'version': 2,
+        'name': 'player_micro_skills indexes',
+        # Every player endpoint filters by player_id and orders by created_at;
+        # role benchmarks and player averages read a handful of metric columns,
+        # so those indexes carry the columns and never touch the table
+        'up': {
+            'sqlite': [
+                'CREATE INDEX IF NOT EXISTS idx_pms_player_created ON player_micro_skills (player_id, created_at)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_role_metrics ON player_micro_skills '
+                '(role, cs_at_10, vision_score_per_min, kill_participation)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_player_metrics ON player_micro_skills '
+                '(player_id, cs_at_10, vision_score_per_min, kill_participation, damage_per_gold)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_champion ON player_micro_skills (champion)',
+            ],
+            'postgresql': [
+                'CREATE INDEX IF NOT EXISTS idx_pms_player_created ON player_micro_skills (player_id, created_at)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_role_metrics ON player_micro_skills (role) '
+                'INCLUDE (cs_at_10, vision_score_per_min, kill_participation)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_player_metrics ON player_micro_skills (player_id) '
+                'INCLUDE (cs_at_10, vision_score_per_min, kill_participation, damage_per_gold)',
+                'CREATE INDEX IF NOT EXISTS idx_pms_champion ON player_micro_skills (champion)',
+            ],
+        },
+        'down': {
+            dialect: [
+                f'DROP INDEX IF EXISTS {index}'
+                for index in ('idx_pms_champion', 'idx_pms_player_metrics',
+                              'idx_pms_role_metrics', 'idx_pms_player_created')
+            ]
+            for dialect in ('sqlite', 'postgresql')
+        },
+    },
+    {
+        'version': 3,
+        'name': 'postgres player_micro_skills column parity',
+        # The Postgres schema predates several metrics the SQLite schema and the
+        # shared queries read; SQLite already has them
+        'up': {
+            'sqlite': [],
+            'postgresql': [
+                f'ALTER TABLE player_micro_skills ADD COLUMN IF NOT EXISTS {name} {sql_type}'
+                for name, sql_type in PARITY_COLUMNS
+            ],
+        },
+        'down': {
+            'sqlite': [],
+            'postgresql': [
+                f'ALTER TABLE player_micro_skills DROP COLUMN IF EXISTS {name}'
+                for name, _ in reversed(PARITY_COLUMNS)
+            ],
+        },
+    },
+    {
+        'version': 4,
+        'name': 'ingestion_runs',
+        # One row per run_ingestion call; the summary columns feed trend
+        # dashboards and the full report is kept alongside as JSON
+        'up': {
+            dialect: [
+                f'''CREATE TABLE IF NOT EXISTS ingestion_runs (
+                    run_id VARCHAR(64) PRIMARY KEY,
+                    state_key VARCHAR(255) NOT NULL,
+                    status VARCHAR(20) NOT NULL,
+                    started_at TIMESTAMP NOT NULL,
+                    finished_at TIMESTAMP NOT NULL,
+                    wall_seconds FLOAT,
+                    series_processed INTEGER,
+                    series_skipped INTEGER,
+                    rows_loaded INTEGER,
+                    http_calls INTEGER,
+                    http_errors INTEGER,
+                    http_retries INTEGER,
+                    peak_memory_mb FLOAT,
+                    report {json_type}
+                )''',
+                'CREATE INDEX IF NOT EXISTS idx_ingestion_runs_started ON ingestion_runs (started_at)',
+            ]
+            for dialect, json_type in (('sqlite', 'TEXT'), ('postgresql', 'JSONB'))
+        },
+        'down': {
+            dialect: ['DROP INDEX IF EXISTS idx_ingestion_runs_started', 'DROP TABLE IF EXISTS ingestion_runs']
+            for dialect in ('sqlite', 'postgresql')
+        },
+    },
+    {
+        'version': 5,
+        'name': 'champion_matchups',
+        # Sparse per-role matchup matrix: counts and running sums per champion
+        # pair, incremented by the loader; existing rows are paired once here
+        'up': {
+            dialect: [
+                '''CREATE TABLE IF NOT EXISTS champion_matchups (
+                    champion VARCHAR(100) NOT NULL,
+                    role VARCHAR(50) NOT NULL,
+                    opponent VARCHAR(100) NOT NULL,
+                    games INTEGER NOT NULL DEFAULT 0,
+                    wins INTEGER NOT NULL DEFAULT 0,
+                    gold_diff_at_10_sum FLOAT NOT NULL DEFAULT 0,
+                    xp_diff_at_10_sum FLOAT NOT NULL DEFAULT 0,
+                    cs_at_10_sum FLOAT NOT NULL DEFAULT 0,
+                    opponent_cs_at_10_sum FLOAT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (champion, role, opponent)
+                )''',
+                MATCHUP_REBUILD_SQL,
+            ]
+            for dialect in ('sqlite', 'postgresql')
+        },
+        'down': {
+            dialect: ['DROP TABLE IF EXISTS champion_matchups']
+            for dialect in ('sqlite', 'postgresql')
+        },
+    },
+]
+
+LATEST_VERSION = max(step['version'] for step in MIGRATIONS)
+
+
+class SchemaMigrator:
+    """Applies MIGRATIONS in order and records them in schema_migrations
+
+    Each step runs in its own transaction together with its bookkeeping
+    row, so a failed step leaves the database at the previous version.
+    SQLite's driver commits before DDL on its own, so there the
+    transaction is opened with an explicit BEGIN. Databases created before
+    migrations existed are adopted as-is: the base step only uses IF NOT
+    EXISTS.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or create_engine(os.getenv('DATABASE_URL', 'sqlite:///micromentor.db'))
+        self.dialect = self.engine.dialect.name
+        if self.dialect not in ('sqlite', 'postgresql'):
+            raise NotImplementedError(f"Migrations are not defined for {self.dialect}")
+
+    def _ensure_table(self, conn):
+        conn.exec_driver_sql(
+            'CREATE TABLE IF NOT EXISTS schema_migrations ('
+            'version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TIMESTAMP NOT NULL)'
+        )
+
+    def applied(self) -> List[int]:
+        if not inspect(self.engine).has_table('schema_migrations'):
+            return []
+        with self.engine.connect() as conn:
+            return [row[0] for row in conn.execute(text('SELECT version FROM schema_migrations ORDER BY version'))]
+
+    def current_version(self) -> int:
+        applied = self.applied()
+        return applied[-1] if applied else 0
+
+    @contextmanager
+    def _transaction(self):
+        """A connection whose statements, DDL included, commit or roll back together"""
+        if self.dialect != 'sqlite':
+            with self.engine.begin() as conn:
+                yield conn
+            return
+        with self.engine.connect() as conn:
+            driver = conn.connection.driver_connection
+            isolation_level = driver.isolation_level
+            # Stop the driver's implicit transaction handling, which commits around DDL
+            driver.isolation_level = None
+            try:
+                # IMMEDIATE takes the write lock up front, so parallel migrators queue
+                conn.exec_driver_sql('BEGIN IMMEDIATE')
+                try:
+                    yield conn
+                except BaseException:
+                    conn.exec_driver_sql('ROLLBACK')
+                    raise
+                conn.exec_driver_sql('COMMIT')
+            finally:
+                driver.isolation_level = isolation_level
+
+    def _statements(self, step: Dict, direction: str) -> List[str]:
+        statements = step[direction][self.dialect]
+        return statements() if callable(statements) else statements
+
+    def upgrade(self, target: Optional[int] = None) -> List[int]:
+        """Apply pending steps up to target (default: latest); returns the versions applied"""
+        target = LATEST_VERSION if target is None else target
+        done = set(self.applied())
+        applied = []
+        for step in sorted(MIGRATIONS, key=lambda s: s['version']):
+            if step['version'] > target or step['version'] in done:
+                continue
+            try:
+                with self._transaction() as conn:
+                    self._ensure_table(conn)
+                    for statement in self._statements(step, 'up'):
+                        conn.exec_driver_sql(statement)
+                    conn.execute(
+                        text('INSERT INTO schema_migrations (version, name, applied_at) '
+                             'VALUES (:version, :name, :applied_at)'),
+                        {'version': step['version'], 'name': step['name'], 'applied_at': datetime.now(timezone.utc)}
+                    )
+            except IntegrityError:
+                # Another process (e.g. a parallel backfill worker) may have applied
+                # this step between our check and our insert; anything else is a
+                # genuine failure of the step itself
+                if step['version'] not in self.applied():
+                    raise
+                logger.info(f"Migration {step['version']} was applied concurrently")
+                continue
+            logger.info(f"Applied migration {step['version']}: {step['name']}")
+            applied.append(step['version'])
+        return applied
+
+    def downgrade(self, target: int = 0) -> List[int]:
+        """Revert applied steps above target, newest first; returns the versions reverted"""
+        done = set(self.applied())
+        reverted = []
+        for step in sorted(MIGRATIONS, key=lambda s: s['version'], reverse=True):
+            if step['version'] <= target or step['version'] not in done:
+                continue
+            with self._transaction() as conn:
+                for statement in self._statements(step, 'down'):
+                    conn.exec_driver_sql(statement)
+                conn.execute(text('DELETE FROM schema_migrations WHERE version = :version'),
+                             {'version': step['version']})
+            logger.info(f"Reverted migration {step['version']}: {step['name']}")
+            reverted.append(step['version'])
+        return reverted
+
+
+def migrate(engine=None, target: Optional[int] = None) -> List[int]:
+    """Bring a database up to date; safe to call on every start"""
+    return SchemaMigrator(engine).upgrade(target)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='Apply or revert MicroMentor schema migrations')
+    parser.add_argument('command', choices=['upgrade', 'downgrade', 'status'])
+    parser.add_argument('version', nargs='?', type=int, default=None)
+    parser.add_argument('--db-url', default=None)
+    args = parser.parse_args()
+
+    migrator = SchemaMigrator(create_engine(args.db_url) if args.db_url else None)
+    if args.command == 'upgrade':
+        print(f"Applied: {migrator.upgrade(args.version) or 'nothing'}")
+    elif args.command == 'downgrade':
+        if args.version is None:
+            sys.exit("downgrade needs a target version (0 reverts everything)")
+        print(f"Reverted: {migrator.downgrade(args.version) or 'nothing'}")
+    print(f"Schema version {migrator.current_version()} (latest {LATEST_VERSION})")
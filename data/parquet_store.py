@@ -0,0 +1,164 @@
+import os
+import json
+import uuid
+import shutil
+import pandas as pd
+from datetime import datetime, timezone
+from typing import List, Optional
+
+
+class ParquetStore:
+    """Parquet copy of player_micro_skills partitioned by role and month
+
+    Long-range analytics read only the columns and partitions they need
+    instead of scanning the whole table through pd.read_sql. The month is
+    the month the game was played. The dataset is append-only: the ETL
+    writes each load's inserted and updated rows, and export_from_database
+    seeds it with everything stored before it was enabled. Every write is
+    stamped with loaded_at, and reads keep only the latest version of each
+    (match_id, player_id).
+    """
+
+    PARTITION_COLS = ['role', 'month']
+    KEY_COLUMNS = ['match_id', 'player_id']
+    VERSION_COLUMN = 'loaded_at'
+    COMPLETE_FILE = '_EXPORTED'
+
+    def __init__(self, root: str = None):
+        if root is None:
+            root = os.getenv(
+                'PARQUET_DATASET_DIR',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parquet')
+            )
+        self.root = root
+
+    @staticmethod
+    def _pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.dataset
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("pyarrow is required for the Parquet dataset (pip install pyarrow)") from e
+        return pyarrow
+
+    def _partitioning(self):
+        pa = self._pyarrow()
+        return pa.dataset.partitioning(
+            pa.schema([('role', pa.string()), ('month', pa.string())]),
+            flavor='hive'
+        )
+
+    def write(self, df: pd.DataFrame) -> int:
+        """Append rows, partitioned on game_date; created_at (stamped with now where missing) stands in without it"""
+        if df.empty:
+            return 0
+        pa = self._pyarrow()
+
+        frame = df.copy()
+        if 'created_at' not in frame.columns:
+            frame['created_at'] = pd.Timestamp(datetime.now(timezone.utc)).tz_localize(None)
+        frame['created_at'] = pd.to_datetime(frame['created_at'])
+        # Always present, so every file has the column training reads
+        if 'game_date' not in frame.columns:
+            frame['game_date'] = pd.NaT
+        frame['game_date'] = pd.to_datetime(frame['game_date'], utc=True, errors='coerce').dt.tz_localize(None)
+        played = frame['game_date'].fillna(frame['created_at'])
+        frame['month'] = played.dt.strftime('%Y-%m')
+        frame[self.VERSION_COLUMN] = pd.Timestamp(datetime.now(timezone.utc)).tz_localize(None)
+        frame['role'] = frame['role'].astype(str)
+        # Categoricals become dictionary columns that differ file to file; store plain values
+        for col in frame.select_dtypes('category').columns:
+            frame[col] = frame[col].astype(str)
+
+        pa.parquet.write_to_dataset(
+            pa.Table.from_pandas(frame, preserve_index=False),
+            self.root,
+            partitioning=self._partitioning(),
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            compression='zstd'
+        )
+        return len(frame)
+
+    def is_complete(self) -> bool:
+        """True once export_from_database has seeded the dataset with the stored history"""
+        return os.path.exists(os.path.join(self.root, self.COMPLETE_FILE))
+
+    def export_from_database(self, engine=None, chunk_size: int = 100_000) -> int:
+        """Replace the dataset with every stored row, each with its match's game_date
+
+        Run it once when enabling PARQUET_DATASET_DIR on an existing database,
+        with ingestion paused; afterwards the ETL's appends keep it complete.
+        Returns the number of rows written.
+        """
+        from sqlalchemy import text
+        from data.queries import get_engine
+
+        engine = engine or get_engine()
+        if os.path.isdir(self.root):
+            shutil.rmtree(self.root)
+        query = text(
+            'SELECT s.*, m.game_date FROM player_micro_skills s LEFT JOIN matches m ON m.match_id = s.match_id'
+        )
+        written = 0
+        with engine.connect() as conn:
+            for chunk in pd.read_sql(query, conn, chunksize=chunk_size):
+                written += self.write(chunk.drop(columns=['id'], errors='ignore'))
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, self.COMPLETE_FILE), 'w') as f:
+            json.dump({'rows': written, 'exported_at': datetime.now(timezone.utc).isoformat()}, f)
+        return written
+
+    def read(self,
+             columns: Optional[List[str]] = None,
+             roles: Optional[List[str]] = None,
+             start_month: Optional[str] = None,
+             end_month: Optional[str] = None) -> pd.DataFrame:
+        """Read selected columns, pruning role and month (YYYY-MM, inclusive) partitions
+
+        Rows written more than once (re-synced or corrected games) come back
+        once, as their most recently loaded version.
+        """
+        pa = self._pyarrow()
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=columns or [])
+
+        dataset = pa.dataset.dataset(self.root, format='parquet', partitioning=self._partitioning())
+        versioned = self.VERSION_COLUMN in dataset.schema.names
+        read_columns = columns
+        if versioned and columns is not None:
+            extra = [c for c in self.KEY_COLUMNS + [self.VERSION_COLUMN] if c not in columns]
+            read_columns = list(columns) + extra
+        field = pa.dataset.field
+        conditions = []
+        if roles:
+            conditions.append(field('role').isin(list(roles)))
+        if start_month:
+            conditions.append(field('month') >= start_month)
+        if end_month:
+            conditions.append(field('month') <= end_month)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        df = dataset.to_table(columns=read_columns, filter=expression).to_pandas()
+        if versioned:
+            df = (df.sort_values(self.VERSION_COLUMN, kind='stable')
+                    .drop_duplicates(self.KEY_COLUMNS, keep='last')
+                    .sort_index())
+            df = df.reset_index(drop=True)
+        return df if columns is None else df[list(columns)]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Seed the Parquet dataset from the database')
+    parser.add_argument('command', choices=['export'])
+    parser.add_argument('--dataset-dir', default=None, help='Defaults to PARQUET_DATASET_DIR or data/parquet')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    store = ParquetStore(args.dataset_dir)
+    print(f"Exported {store.export_from_database(chunk_size=args.chunk_size)} rows to {store.root}")
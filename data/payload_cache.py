@@ -0,0 +1,61 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+
+class PayloadCache:
+    """Content-addressed, gzip-compressed store of raw GRID API responses
+
+    Entries are keyed by a hash of the request (endpoint, GraphQL query and
+    variables, or REST params), so the same request always maps to the same
+    file and re-running a sync can be served entirely from disk.
+    """
+
+    def __init__(self, root: str = None):
+        if root is None:
+            root = os.getenv(
+                'GRID_CACHE_DIR',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+            )
+        self.root = root
+
+    @staticmethod
+    def key(kind: str, url: str, request: Dict) -> str:
+        """Stable hash of a request; dict ordering does not matter"""
+        canonical = json.dumps(
+            {'kind': kind, 'url': url, 'request': request},
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f'{key[2:]}.json.gz')
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, key: str, value: Any):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temporary file of its own per write: threads of one process may
+        # store the same key at once, and os.replace keeps the last one whole
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+                                         suffix='.tmp', delete=False) as raw:
+            tmp_path = raw.name
+            try:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+            except BaseException:
+                raw.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
@@ -0,0 +1,169 @@
+import os
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional
+from sqlalchemy import Integer, String, bindparam, case, column, create_engine, func, literal_column, select, table
+
+# Only the columns the read paths touch; no reflection, so statements can be
+# built once at import and reused on any engine
+player_micro_skills = table(
+    'player_micro_skills',
+    column('match_id'), column('player_id'), column('player_name'), column('role'),
+    column('champion'), column('game_result'), column('created_at'),
+    column('cs_at_10'), column('gold_diff_at_10'), column('vision_score_per_min'),
+    column('kill_participation'), column('damage_per_gold'), column('kda'),
+    column('tower_damage_contribution'), column('first_blood_participation'),
+)
+_pms = player_micro_skills.c
+_player = _pms.player_id == bindparam('player_id', type_=String)
+
+matches = table('matches', column('match_id'), column('game_date'))
+
+ingestion_runs = table(
+    'ingestion_runs',
+    column('run_id'), column('state_key'), column('status'), column('started_at'), column('finished_at'),
+    column('wall_seconds'), column('series_processed'), column('series_skipped'), column('rows_loaded'),
+    column('http_calls'), column('http_errors'), column('http_retries'), column('peak_memory_mb'),
+    column('report'),
+)
+_runs = ingestion_runs.c
+
+champion_matchups = table(
+    'champion_matchups',
+    column('champion'), column('role'), column('opponent'), column('games'), column('wins'),
+    column('gold_diff_at_10_sum'), column('xp_diff_at_10_sum'), column('cs_at_10_sum'),
+    column('opponent_cs_at_10_sum'),
+)
+_matchups = champion_matchups.c
+
+# Every statement is a module-level Core construct with bound parameters.
+# SQLAlchemy caches each one's compiled form per dialect, so a request only
+# binds values and executes; nothing is formatted into SQL text.
+QUERIES = {
+    'player_profile': select(_pms.player_name, _pms.role).where(_player).limit(1),
+
+    'player_rows': select(literal_column('*')).select_from(player_micro_skills).where(_player),
+
+    'player_trends': select(
+        _pms.created_at.label('game_date'), _pms.cs_at_10, _pms.vision_score_per_min,
+        _pms.kill_participation, _pms.kda, _pms.game_result, _pms.champion
+    ).where(_player).order_by(_pms.created_at.asc()).limit(20),
+
+    'player_recent_form': select(
+        _pms.cs_at_10, _pms.vision_score_per_min, _pms.kill_participation, _pms.kda,
+        _pms.created_at.label('game_date'), _pms.gold_diff_at_10
+    ).where(_player).order_by(_pms.created_at.desc()).limit(20),
+
+    'player_last_match': select(
+        _pms.match_id, _pms.champion, _pms.game_result, _pms.cs_at_10, _pms.gold_diff_at_10,
+        _pms.kda, _pms.tower_damage_contribution, _pms.first_blood_participation
+    ).where(_player).order_by(_pms.created_at.desc()).limit(1),
+
+    'player_history': select(
+        _pms.created_at.label('game_date'), _pms.game_result, _pms.champion, _pms.kda, _pms.cs_at_10
+    ).where(_player).order_by(_pms.created_at.desc()).limit(10),
+
+    'player_champions': select(
+        _pms.champion,
+        func.count().label('games'),
+        func.avg(_pms.kda).label('avg_kda'),
+        func.avg(_pms.cs_at_10).label('avg_cs_at_10'),
+        (func.sum(case((_pms.game_result == 'WIN', 1), else_=0)) * 100.0 / func.count()).label('win_rate')
+    ).where(_player).group_by(_pms.champion).order_by(literal_column('games').desc()),
+
+    'role_averages': select(
+        func.avg(_pms.cs_at_10).label('cs_at_10_avg'),
+        func.avg(_pms.vision_score_per_min).label('vision_avg'),
+        func.avg(_pms.kill_participation).label('kp_avg')
+    ).where(_pms.role == bindparam('role', type_=String)),
+
+    'player_averages': select(
+        func.avg(_pms.cs_at_10).label('avg_cs_at_10'),
+        func.avg(_pms.vision_score_per_min).label('avg_vision'),
+        func.avg(_pms.kill_participation).label('avg_kp')
+    ).where(_player),
+
+    'player_style_vectors': select(
+        _pms.player_id,
+        func.avg(_pms.cs_at_10).label('cs'),
+        func.avg(_pms.vision_score_per_min).label('vision'),
+        func.avg(_pms.kill_participation).label('kp'),
+        func.avg(_pms.damage_per_gold).label('dpg')
+    ).group_by(_pms.player_id),
+
+    'ingestion_runs_recent': select(
+        _runs.run_id, _runs.state_key, _runs.status, _runs.started_at, _runs.finished_at, _runs.wall_seconds,
+        _runs.series_processed, _runs.series_skipped, _runs.rows_loaded, _runs.http_calls, _runs.http_errors,
+        _runs.http_retries, _runs.peak_memory_mb, _runs.report
+    ).order_by(_runs.started_at.desc()).limit(bindparam('limit', type_=Integer)),
+
+    'ingestion_run': select(_runs.report).where(_runs.run_id == bindparam('run_id', type_=String)),
+
+    # A primary-key prefix lookup; the matrix already holds the sums
+    'champion_matchups': select(
+        _matchups.role, _matchups.opponent, _matchups.games, _matchups.wins, _matchups.gold_diff_at_10_sum,
+        _matchups.xp_diff_at_10_sum, _matchups.cs_at_10_sum, _matchups.opponent_cs_at_10_sum
+    ).where(_matchups.champion == bindparam('champion', type_=String)),
+}
+
+
+@lru_cache(maxsize=None)
+def _engine_for(url: str):
+    return create_engine(url)
+
+
+def get_engine(url: Optional[str] = None):
+    """One pooled engine per database URL, shared by the API and the models"""
+    return _engine_for(url or os.getenv('DATABASE_URL', 'sqlite:///micromentor.db'))
+
+
+def read_query(name: str, engine=None, **params) -> pd.DataFrame:
+    """Execute a named statement with bound parameters into a DataFrame"""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(QUERIES[name], params)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+def recent_games(player_ids: List[str], per_player: int, engine=None) -> pd.DataFrame:
+    """Each player's latest `per_player` games, oldest first, with the columns training reads"""
+    if not player_ids:
+        return pd.DataFrame()
+    # Play order: the match's game_date, with ingestion time where it is missing
+    played = func.coalesce(matches.c.game_date, _pms.created_at)
+    ranked = select(
+        _pms.match_id, _pms.player_id, matches.c.game_date, _pms.created_at, _pms.kda, _pms.cs_at_10,
+        _pms.gold_diff_at_10, _pms.vision_score_per_min, _pms.kill_participation, _pms.damage_per_gold,
+        played.label('played'),
+        func.row_number().over(partition_by=_pms.player_id, order_by=played.desc()).label('recency')
+    ).select_from(
+        player_micro_skills.outerjoin(matches, matches.c.match_id == _pms.match_id)
+    ).where(_pms.player_id.in_(bindparam('player_ids', expanding=True))).subquery()
+    statement = select(*[c for c in ranked.c if c.name not in ('played', 'recency')]).where(
+        ranked.c.recency <= per_player
+    ).order_by(ranked.c.played)
+
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(statement, {'player_ids': list(player_ids)})
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+def similar_players(player_id: str, top_n: int = 5, engine=None) -> List[Dict]:
+    """Nearest players by Euclidean distance over average playstyle stats
+
+    The database only aggregates; distances are computed here so the query
+    needs no SQRT/POW, which SQLite builds do not always provide.
+    """
+    df = read_query('player_style_vectors', engine)
+    features = ['cs', 'vision', 'kp', 'dpg']
+    target = df[df['player_id'] == player_id]
+    if target.empty:
+        return []
+
+    others = df[df['player_id'] != player_id].copy()
+    values = others[features].astype(float).fillna(0).to_numpy()
+    origin = target[features].astype(float).fillna(0).to_numpy()[0]
+    others['similarity_score'] = np.sqrt(((values - origin) ** 2).sum(axis=1))
+    return others.sort_values('similarity_score', kind='stable').head(top_n).to_dict('records')
@@ -0,0 +1,235 @@
+import json
+import os
+import sys
+import time
+import uuid
+import threading
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import insert
+
+from data.queries import ingestion_runs
+
+logger = logging.getLogger(__name__)
+
+
+class HttpStats:
+    """Thread-safe counters for every GRID request a client sends
+
+    Only the most recent MAX_LATENCIES latencies are kept, so a long-lived
+    client stays bounded; a run with more calls than that reports
+    percentiles over its latest calls.
+    """
+
+    MAX_LATENCIES = 10_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.latencies = deque(maxlen=self.MAX_LATENCIES)
+
+    def record(self, seconds: float, status: Optional[int], retries: int = 0):
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            if status is None or status >= 400:
+                self.errors += 1
+            self.latencies.append(seconds)
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def mark(self) -> Dict:
+        """Position to diff against, so a shared client can report one run"""
+        with self._lock:
+            return {'calls': self.calls, 'errors': self.errors, 'retries': self.retries,
+                    'cache_hits': self.cache_hits}
+
+    def since(self, mark: Dict) -> Dict:
+        with self._lock:
+            # Every call records one latency; older ones may have been evicted
+            count = min(self.calls - mark['calls'], len(self.latencies))
+            latencies = np.array(list(self.latencies)[len(self.latencies) - count:]) * 1000
+            summary = {
+                'calls': self.calls - mark['calls'],
+                'errors': self.errors - mark['errors'],
+                'retries': self.retries - mark['retries'],
+                'cache_hits': self.cache_hits - mark['cache_hits'],
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            summary['latency_ms'] = {
+                'mean': round(float(latencies.mean()), 2), 'p50': round(float(p50), 2),
+                'p95': round(float(p95), 2), 'p99': round(float(p99), 2), 'max': round(float(latencies.max()), 2),
+                'samples': len(latencies),
+            }
+        return summary
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakMemorySampler:
+    """Highest resident set size seen while the block runs
+
+    RSS is polled from a background thread, so it covers NumPy buffers and
+    the database driver too, not only Python objects. Where /proc is not
+    available the process-wide peak from getrusage is reported instead.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self.start = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes() or 0)
+
+    def __enter__(self):
+        self.start = _rss_bytes()
+        self.peak = self.start or 0
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._sample, name='etl-memory', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes() or 0)
+        else:
+            import resource
+            # ru_maxrss is kilobytes on Linux and bytes on macOS
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = maxrss if sys.platform == 'darwin' else maxrss * 1024
+        return False
+
+    def summary(self) -> Dict:
+        return {
+            'start_mb': round(self.start / 2 ** 20, 1) if self.start else None,
+            'peak_mb': round(self.peak / 2 ** 20, 1),
+        }
+
+
+class IngestionRunReport:
+    """Per-stage timings and counts for one run_ingestion call
+
+    Stage time is the time spent inside the stage function. Stages overlap
+    in the streaming pipeline, so the stage times add up to more than the
+    wall time; the busiest stage is the bottleneck.
+    """
+
+    STAGES = ('extract', 'transform', 'load')
+
+    def __init__(self, state_key: str, params: Optional[Dict] = None):
+        self.run_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.state_key = state_key
+        self.params = params or {}
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {name: {'seconds': 0.0, 'batches': 0, 'series': 0, 'rows': 0} for name in self.STAGES}
+        self.result: Dict = {}
+
+    def record_stage(self, name: str, seconds: float, series: int = 0, rows: int = 0):
+        with self._lock:
+            stage = self.stages[name]
+            stage['seconds'] += seconds
+            stage['batches'] += 1
+            stage['series'] += series
+            stage['rows'] += rows
+
+    def finish(self, status: str, processed: int, skipped: int, rows: Dict,
+               http: Optional[Dict], memory: Optional[Dict], error: Optional[str] = None) -> Dict:
+        """Close the run; `rows` sums the loader's inserted/updated/skipped counts"""
+        wall = time.perf_counter() - self._started
+        stages = {}
+        for name, stage in self.stages.items():
+            seconds = stage['seconds']
+            stages[name] = {
+                **stage,
+                'seconds': round(seconds, 4),
+                'rows_per_second': round(stage['rows'] / seconds, 1) if seconds > 0 else None,
+                'share_of_wall': round(seconds / wall, 4) if wall > 0 else None,
+            }
+        self.result = {
+            'run_id': self.run_id,
+            'state_key': self.state_key,
+            'status': status,
+            'error': error,
+            'params': self.params,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'wall_seconds': round(wall, 4),
+            'series_processed': processed,
+            'series_skipped': skipped,
+            # Rows the database actually wrote, not rows handed to the loader
+            'rows_loaded': rows.get('inserted', 0) + rows.get('updated', 0),
+            'rows': rows,
+            'stages': stages,
+            'http': http or {},
+            'memory': memory or {},
+        }
+        return self.result
+
+
+def report_dir() -> str:
+    return os.getenv('INGESTION_REPORT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ingestion_runs'))
+
+
+def save_report(report: Dict, engine=None, directory: Optional[str] = None) -> Optional[str]:
+    """Write the report as <run_id>.json and as an ingestion_runs row; returns the file path
+
+    Either sink failing is logged, never raised: a finished ingestion must
+    not fail because its report could not be stored.
+    """
+    path = None
+    try:
+        directory = directory or report_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{report['run_id']}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        logger.error(f"Could not write ingestion report file: {e}")
+
+    if engine is not None:
+        try:
+            http = report.get('http', {})
+            with engine.begin() as conn:
+                conn.execute(insert(ingestion_runs).values(
+                    run_id=report['run_id'],
+                    state_key=report['state_key'],
+                    status=report['status'],
+                    started_at=datetime.fromisoformat(report['started_at']),
+                    finished_at=datetime.fromisoformat(report['finished_at']),
+                    wall_seconds=report['wall_seconds'],
+                    series_processed=report['series_processed'],
+                    series_skipped=report['series_skipped'],
+                    rows_loaded=report['rows_loaded'],
+                    http_calls=http.get('calls', 0),
+                    http_errors=http.get('errors', 0),
+                    http_retries=http.get('retries', 0),
+                    peak_memory_mb=report.get('memory', {}).get('peak_mb'),
+                    report=json.dumps(report),
+                ))
+        except Exception as e:
+            logger.error(f"Could not record ingestion run {report['run_id']}: {e}")
+    return path
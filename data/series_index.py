@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+import logging
+import numpy as np
+from typing import Iterable, List
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+class IngestedSeriesIndex:
+    """Sorted set of 64-bit hashes of series already in player_micro_skills
+
+    Membership is a binary search over a NumPy array, so a sync can drop
+    seen series before any extraction or GRID call for a few bytes per
+    series. Hash collisions are possible in principle but at 64 bits are
+    negligible for any realistic number of series. The index is a cache:
+    it can always be rebuilt from the database.
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = os.getenv(
+                'SERIES_INDEX_PATH',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'series_index.npy')
+            )
+        self.path = path
+        self._lock = threading.Lock()
+        self._keys = self._read()
+
+    @staticmethod
+    def _hash(series_ids: Iterable[str]) -> np.ndarray:
+        return np.fromiter(
+            (int.from_bytes(hashlib.blake2b(str(sid).encode(), digest_size=8).digest(), 'little')
+             for sid in series_ids),
+            dtype=np.uint64
+        )
+
+    def _read(self) -> np.ndarray:
+        if not os.path.exists(self.path):
+            return np.empty(0, dtype=np.uint64)
+        return np.load(self.path)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, series_id: str) -> bool:
+        return bool(self.contains([series_id])[0])
+
+    def contains(self, series_ids: Iterable[str]) -> np.ndarray:
+        """Boolean mask of which ids are already ingested"""
+        hashes = self._hash(series_ids)
+        keys = self._keys
+        if not len(keys) or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+        return keys[positions] == hashes
+
+    def new_ids(self, series_ids: List[str]) -> List[str]:
+        """The ids not yet ingested, in their original order"""
+        mask = self.contains(series_ids)
+        return [sid for sid, seen in zip(series_ids, mask) if not seen]
+
+    def add(self, series_ids: Iterable[str]):
+        hashes = self._hash(series_ids)
+        with self._lock:
+            self._keys = np.union1d(self._keys, hashes)
+
+    def _write(self, keys: np.ndarray):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp.npy'
+        np.save(tmp_path, keys)
+        os.replace(tmp_path, self.path)
+        self._keys = keys
+
+    def save(self):
+        """Write atomically, merging with the file in case another process added ids"""
+        with self._lock:
+            self._write(np.union1d(self._read(), self._keys))
+
+    def rebuild(self, engine) -> int:
+        """Replace the index with the distinct match ids currently in the database"""
+        series_ids = []
+        if inspect(engine).has_table('player_micro_skills'):
+            with engine.connect() as conn:
+                series_ids = [row[0] for row in conn.execute(
+                    text('SELECT DISTINCT match_id FROM player_micro_skills')
+                )]
+        with self._lock:
+            self._write(np.unique(self._hash(series_ids)))
+        logger.info(f"Rebuilt series index with {len(self._keys)} series")
+        return len(self._keys)
+
+    def sync_with(self, engine):
+        """Rebuild when the file is missing or the database was emptied underneath it"""
+        if not os.path.exists(self.path):
+            self.rebuild(engine)
+            return
+        if not len(self._keys):
+            return
+        has_rows = False
+        if inspect(engine).has_table('player_micro_skills'):
+            with engine.connect() as conn:
+                has_rows = conn.execute(text('SELECT 1 FROM player_micro_skills LIMIT 1')).first() is not None
+        if not has_rows:
+            self.rebuild(engine)
@@ -0,0 +1,76 @@
+import queue
+import threading
+import logging
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StreamingPipeline:
+    """Chain of stages, one thread each, connected by bounded queues
+
+    Every stage takes one item and returns the item for the next stage. A
+    full queue blocks the stage feeding it, so a slow loader throttles
+    extraction instead of letting fetched payloads pile up in memory. The
+    first exception stops the source, drains the stages and is re-raised
+    from run().
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any]]], queue_size: int = 4):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._error: Optional[BaseException] = None
+        self._failed = threading.Event()
+
+    def _run_stage(self, name: str, func: Callable, inbox: queue.Queue, outbox: Optional[queue.Queue]):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if self._failed.is_set():
+                # Keep draining so upstream stages never block on a dead consumer
+                continue
+            try:
+                result = func(item)
+            except BaseException as e:
+                logger.error(f"Stage '{name}' failed: {e}")
+                self._error = e
+                self._failed.set()
+                continue
+            if outbox is not None:
+                outbox.put(result)
+        if outbox is not None:
+            outbox.put(_DONE)
+
+    def run(self, source: Iterable):
+        """Feed every source item through the stages and wait for them to finish"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+        for index, (name, func) in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(name, func, queues[index], outbox),
+                name=f'etl-{name}',
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        try:
+            for item in source:
+                if self._failed.is_set():
+                    break
+                queues[0].put(item)
+        except BaseException as e:
+            self._error = self._error or e
+            self._failed.set()
+        finally:
+            queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
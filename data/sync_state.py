@@ -0,0 +1,61 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict
+
+
+class SyncStateStore:
+    """Persisted per-title sync watermarks and resume cursors
+
+    Each key maps to a small record:
+      watermark   - latest startTimeScheduled fully ingested
+      cursor      - endCursor of the last loaded page while a sync is unfinished
+      cursor_since - the start-time filter that cursor belongs to
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = os.getenv(
+                'SYNC_STATE_PATH',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sync_state.json')
+            )
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _write(self, state: Dict[str, Dict]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Dict:
+        with self._lock:
+            return dict(self._read().get(key, {}))
+
+    def update(self, key: str, **fields) -> Dict:
+        """Merge fields into a key's record and write the file atomically"""
+        with self._lock:
+            state = self._read()
+            record = state.get(key, {})
+            record.update(fields)
+            record['updated_at'] = datetime.now(timezone.utc).isoformat()
+            state[key] = record
+            self._write(state)
+            return dict(record)
+
+    def reset(self, key: str):
+        """Forget a key so the next sync starts from the beginning"""
+        with self._lock:
+            state = self._read()
+            if state.pop(key, None) is not None:
+                self._write(state)
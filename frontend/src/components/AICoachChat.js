@@ -1,5 +1,4 @@
 import React, { useState, useRef, useEffect } from 'react';
-import axios from 'axios';
 
 const API_BASE = process.env.REACT_APP_API_URL || 'http://localhost:5001/api';
 
@@ -62,29 +61,70 @@ const AICoachChat = ({ playerId }) => {
         scrollToBottom();
     }, [messages]);
 
-    const generateAIResponse = async (question) => {
+    const formatHypothetical = (prediction, scenarios) => {
+        let aiResponse = `**Strategic Analysis:**\n\n${prediction}\n\n`;
+
+        if (scenarios && scenarios.length > 0) {
+            aiResponse += "**Scenario Breakdown:**\n";
+            scenarios.forEach(scenario => {
+                const marker = scenario.probability > 50 ? '[HIGH]' : scenario.probability > 30 ? '[MED]' : '[LOW]';
+                aiResponse += `${marker} ${scenario.label}: ${scenario.probability}% - ${scenario.outcome}\n`;
+            });
+        }
+
+        return aiResponse;
+    };
+
+    // Reads the server-sent event stream: scenarios arrive first, then the
+    // prediction text in small chunks; onUpdate gets the text so far
+    const streamHypothetical = async (question, onUpdate) => {
+        const response = await fetch(`${API_BASE}/players/${playerId}/hypothetical/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+            body: JSON.stringify({ question })
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Stream failed with status ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let prediction = '';
+        let scenarios = [];
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+            for (const frame of frames) {
+                const event = frame.match(/^event: (.*)$/m)?.[1];
+                const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || '{}');
+                if (event === 'scenarios') {
+                    scenarios = data.scenarios || [];
+                } else if (event === 'token') {
+                    prediction += data.text;
+                } else if (event === 'error') {
+                    throw new Error(data.error);
+                }
+                onUpdate(formatHypothetical(prediction, scenarios));
+            }
+        }
+
+        return formatHypothetical(prediction, scenarios);
+    };
+
+    const generateAIResponse = async (question, onUpdate) => {
         const lowerQuestion = question.toLowerCase();
 
         if (lowerQuestion.includes('what if') || lowerQuestion.includes('should i have') ||
             lowerQuestion.includes('drake') || lowerQuestion.includes('baron') ||
             lowerQuestion.includes('contest') || lowerQuestion.includes('retake')) {
             try {
-                const response = await axios.post(`${API_BASE}/players/${playerId}/hypothetical`, {
-                    question: question
-                });
-
-                const data = response.data;
-                let aiResponse = `**Strategic Analysis:**\n\n${data.prediction}\n\n`;
-
-                if (data.scenarios && data.scenarios.length > 0) {
-                    aiResponse += "**Scenario Breakdown:**\n";
-                    data.scenarios.forEach(scenario => {
-                        const marker = scenario.probability > 50 ? '[HIGH]' : scenario.probability > 30 ? '[MED]' : '[LOW]';
-                        aiResponse += `${marker} ${scenario.label}: ${scenario.probability}% - ${scenario.outcome}\n`;
-                    });
-                }
-
-                return aiResponse;
+                return await streamHypothetical(question, onUpdate);
             } catch (error) {
                 return "I couldn't analyze that scenario. Please try rephrasing your question.";
             }
@@ -108,15 +148,25 @@ const AICoachChat = ({ playerId }) => {
     const handleSend = async () => {
         if (!input.trim()) return;
 
-        const userMessage = { type: 'user', text: input };
+        const question = input;
+        const userMessage = { type: 'user', text: question };
         setMessages(prev => [...prev, userMessage]);
         setInput('');
         setIsLoading(true);
 
-        const aiResponse = await generateAIResponse(input);
-
-        setMessages(prev => [...prev, { type: 'ai', text: aiResponse }]);
-        setIsLoading(false);
+        // The first update appends the AI message, later ones replace it in place
+        let started = false;
+        const showResponse = (text) => {
+            const replace = started;
+            started = true;
+            setIsLoading(false);
+            setMessages(prev => replace
+                ? [...prev.slice(0, -1), { type: 'ai', text }]
+                : [...prev, { type: 'ai', text }]);
+        };
+
+        const aiResponse = await generateAIResponse(question, showResponse);
+        showResponse(aiResponse);
     };
 
     const handleKeyPress = (e) => {
@@ -1,33 +1,60 @@
-import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
-from sqlalchemy import create_engine
+from data.queries import get_engine, read_query, similar_players
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class BenchmarkComparator:
     """Compare players against role-specific benchmarks"""
     
-    def __init__(self):
-        self.engine = create_engine(os.getenv('DATABASE_URL', 'sqlite:///micromentor.db'))
+    def __init__(self, engine=None):
+        self.engine = engine or get_engine()
+        # With a Parquet dataset configured, role benchmarks read one role partition.
+        # Until it has been seeded from the database it only holds recent loads,
+        # so percentiles would come from a partial sample: stay on the database.
+        self.parquet_store = None
+        if os.getenv('PARQUET_DATASET_DIR'):
+            from data.parquet_store import ParquetStore
+            store = ParquetStore()
+            if store.is_complete():
+                self.parquet_store = store
+            else:
+                logger.warning(f"Parquet dataset {store.root} has not been exported from the database "
+                               f"(python -m data.parquet_store export); role benchmarks use the database")
+
+    def _role_benchmarks_from_parquet(self, role: str) -> Dict:
+        """True percentiles computed over the role's partition, three columns only"""
+        df = self.parquet_store.read(
+            columns=['cs_at_10', 'vision_score_per_min', 'kill_participation'],
+            roles=[role]
+        )
+        if df.empty:
+            raise ValueError("No data for role")
+
+        benchmarks = {}
+        for prefix, column in (('cs_at_10', 'cs_at_10'), ('vision', 'vision_score_per_min'), ('kp', 'kill_participation')):
+            p50, p75, p90 = np.nanpercentile(df[column].to_numpy(dtype=np.float64), [50, 75, 90])
+            benchmarks.update({f'{prefix}_p50': p50, f'{prefix}_p75': p75, f'{prefix}_p90': p90})
+        return benchmarks
     
     def calculate_role_benchmarks(self, role: str) -> Dict:
         """Calculate percentile benchmarks for a specific role"""
+        if self.parquet_store is not None:
+            try:
+                return self._role_benchmarks_from_parquet(role)
+            except Exception as e:
+                logger.warning(f"Parquet role benchmarks for {role} failed ({type(e).__name__}: {e}); "
+                               f"falling back to the database")
+
         # SQLite doesn't have PERCENTILE_CONT, so we'll use a simplified version
         # In a real app with SQLite, we might fetch all and compute with numpy,
         # but for now we'll simulate it or use a more complex SQL if needed.
         # Let's try to fetch means and approximate percentiles for now.
-        query = f"""
-        SELECT 
-            AVG(cs_at_10) as cs_at_10_avg,
-            AVG(vision_score_per_min) as vision_avg,
-            AVG(kill_participation) as kp_avg
-        FROM player_micro_skills
-        WHERE role = '{role}'
-        """
-        
         try:
-            df = pd.read_sql(query, self.engine)
+            df = read_query('role_averages', self.engine, role=role)
             if df.empty or df.iloc[0]['cs_at_10_avg'] is None:
                 raise ValueError("No data for role")
             
@@ -57,17 +84,8 @@ class BenchmarkComparator:
         benchmarks = self.calculate_role_benchmarks(role)
         
         # Get player's average stats
-        query = f"""
-        SELECT 
-            AVG(cs_at_10) as avg_cs_at_10,
-            AVG(vision_score_per_min) as avg_vision,
-            AVG(kill_participation) as avg_kp
-        FROM player_micro_skills
-        WHERE player_id = '{player_id}'
-        """
-        
         try:
-            player_stats = pd.read_sql(query, self.engine).to_dict('records')[0]
+            player_stats = read_query('player_averages', self.engine, player_id=player_id).to_dict('records')[0]
         except Exception:
             player_stats = {'avg_cs_at_10': 75, 'avg_vision': 1.1, 'avg_kp': 60}
         
@@ -107,37 +125,7 @@ class BenchmarkComparator:
     
     def find_similar_players(self, player_id: str, top_n: int = 5) -> List[Dict]:
         """Find similar players based on playstyle"""
-        # Use cosine similarity on normalized stats
-        query = f"""
-        WITH player_stats AS (
-            SELECT 
-                player_id,
-                AVG(cs_at_10) as cs,
-                AVG(vision_score_per_min) as vision,
-                AVG(kill_participation) as kp,
-                AVG(damage_per_gold) as dpg
-            FROM player_micro_skills
-            GROUP BY player_id
-        )
-        SELECT 
-            p2.player_id,
-            p2.cs, p2.vision, p2.kp, p2.dpg,
-            -- Simple distance metric
-            SQRT(
-                POW(COALESCE(p1.cs,0) - COALESCE(p2.cs,0), 2) + 
-                POW(COALESCE(p1.vision,0) - COALESCE(p2.vision,0), 2) +
-                POW(COALESCE(p1.kp,0) - COALESCE(p2.kp,0), 2) +
-                POW(COALESCE(p1.dpg,0) - COALESCE(p2.dpg,0), 2)
-            ) as similarity_score
-        FROM player_stats p1
-        CROSS JOIN player_stats p2
-        WHERE p1.player_id = '{player_id}' AND p2.player_id != '{player_id}'
-        ORDER BY similarity_score ASC
-        LIMIT {top_n}
-        """
-        
         try:
-            df = pd.read_sql(query, self.engine)
-            return df.to_dict('records')
+            return similar_players(player_id, top_n, self.engine)
         except Exception:
             return []
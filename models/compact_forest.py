@@ -0,0 +1,159 @@
+import json
+import os
+import struct
+import numpy as np
+from typing import Dict
+
+
+MAGIC = b'MMFOREST'
+ALIGNMENT = 64
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+
+class CompactForest:
+    """Flattened tree ensemble backed by contiguous (optionally memory-mapped) arrays
+
+    All trees share one node table. Leaves point back at themselves and compare
+    against +inf, so every row can be walked a fixed number of steps without
+    branching on whether it already reached a leaf.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], n_features: int, max_depth: int):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.n_features_in_ = n_features
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'CompactForest':
+        """Flatten a fitted RandomForestRegressor (single output)"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold).astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.int32))
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        arrays = {
+            'feature': np.concatenate(features),
+            'threshold': np.concatenate(thresholds),
+            'left': np.concatenate(lefts),
+            'right': np.concatenate(rights),
+            'value': np.concatenate(values),
+            'roots': np.asarray(roots, dtype=np.int32)
+        }
+        return cls(arrays, int(model.n_features_in_), int(max_depth))
+
+    def predict(self, X) -> np.ndarray:
+        """Average leaf values over all trees for a batch of rows"""
+        # sklearn compares float32 inputs against float64 thresholds; do the same
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_trees = len(self.roots)
+        nodes = np.tile(self.roots, X.shape[0])
+        rows = np.repeat(np.arange(X.shape[0]), n_trees)
+        # (row, tree) walks still descending; leaves point to themselves, so a
+        # walk is done once its left child is its own node. Most trees are far
+        # shallower than the deepest one, and their walks drop out early.
+        active = np.arange(nodes.size)
+        while active.size:
+            current = nodes[active]
+            left = self.left[current]
+            descending = left != current
+            if not descending.all():
+                active, current, left = active[descending], current[descending], left[descending]
+                if not active.size:
+                    break
+            go_left = X[rows[active], self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, left, self.right[current])
+
+        return self.value[nodes].reshape(X.shape[0], n_trees).mean(axis=1)
+
+    def save(self, path: str):
+        """Write arrays at aligned offsets behind a small JSON header"""
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in ARRAY_NAMES}
+        layout = {}
+        # Offsets are relative to the end of the header so they can be computed up front
+        cursor = 0
+        for name, array in arrays.items():
+            cursor = -(-cursor // ALIGNMENT) * ALIGNMENT
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': cursor}
+            cursor += array.nbytes
+
+        header = json.dumps({
+            'n_features': self.n_features_in_,
+            'max_depth': self.max_depth,
+            'arrays': layout
+        }).encode()
+        prefix_len = len(MAGIC) + 4 + len(header)
+        data_start = -(-prefix_len // ALIGNMENT) * ALIGNMENT
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CompactForest':
+        """Open a saved forest; with mmap the pages are shared between processes"""
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            buffer = np.fromfile(path, dtype=np.uint8)
+
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a compact forest file")
+        (header_len,) = struct.unpack('<I', bytes(buffer[len(MAGIC):len(MAGIC) + 4]))
+        header_start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[header_start:header_start + header_len]))
+        data_start = -(-(header_start + header_len) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            arrays[name] = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=data_start + spec['offset']
+            ).reshape(spec['shape'])
+        return cls(arrays, header['n_features'], header['max_depth'])
+
+
+def export_forest(model, path: str) -> CompactForest:
+    """Flatten a fitted forest and save it for memory-mapped serving"""
+    forest = CompactForest.from_sklearn(model)
+    forest.save(path)
+    return forest
+
+
+if __name__ == '__main__':
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description='Export a pickled forest to the compact array format')
+    parser.add_argument('model_path', help='joblib file written by PerformancePredictor.save_model')
+    parser.add_argument('output_path')
+    args = parser.parse_args()
+
+    forest = export_forest(joblib.load(args.model_path), args.output_path)
+    print(f"Exported {len(forest.roots)} trees / {len(forest.value)} nodes to {args.output_path}")
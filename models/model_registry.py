@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import joblib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+class ModelRegistry:
+    """Versioned on-disk store for trained models with an active pointer for serving"""
+
+    ACTIVE_FILE = 'ACTIVE'
+    MODEL_FILE = 'model.joblib'
+    COMPACT_FILE = 'forest.bin'
+    METADATA_FILE = 'metadata.json'
+
+    def __init__(self, root: str = None):
+        if root is None:
+            root = os.getenv(
+                'MODEL_REGISTRY_DIR',
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'registry')
+            )
+        self.root = root
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def list_versions(self) -> List[str]:
+        """List registered versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        # Numeric order: v10000 comes after v9999
+        return sorted(
+            (name for name in os.listdir(self.root)
+             if name.startswith('v') and name[1:].isdigit()
+             and os.path.exists(os.path.join(self.root, name, self.MODEL_FILE))),
+            key=lambda name: int(name[1:])
+        )
+
+    def _next_version(self) -> str:
+        versions = self.list_versions()
+        last = int(versions[-1][1:]) if versions else 0
+        return f"v{last + 1:04d}"
+
+    def save(self, model: Any, metadata: Optional[Dict] = None, activate: bool = True) -> str:
+        """Write a new model version and optionally make it the serving version"""
+        version = self._next_version()
+        version_dir = self._version_dir(version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        joblib.dump(model, os.path.join(version_dir, self.MODEL_FILE))
+        record = {
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            **(metadata or {})
+        }
+        with open(os.path.join(version_dir, self.METADATA_FILE), 'w') as f:
+            json.dump(record, f, indent=2, default=str)
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def get_metadata(self, version: str) -> Dict:
+        """Read the metadata recorded alongside a version"""
+        with open(os.path.join(self._version_dir(version), self.METADATA_FILE), 'r') as f:
+            return json.load(f)
+
+    def active_version(self) -> Optional[str]:
+        """Version currently served; MODEL_VERSION overrides the ACTIVE pointer"""
+        override = os.getenv('MODEL_VERSION')
+        if override:
+            return override
+        active_path = os.path.join(self.root, self.ACTIVE_FILE)
+        if os.path.exists(active_path):
+            with open(active_path, 'r') as f:
+                return f.read().strip() or None
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def activate(self, version: str):
+        """Point serving at an existing version"""
+        if version not in self.list_versions():
+            raise FileNotFoundError(f"No model version {version} in {self.root}")
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f'.{self.ACTIVE_FILE}.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, self.ACTIVE_FILE))
+
+    def rollback(self) -> str:
+        """Activate the version registered before the current one"""
+        versions = self.list_versions()
+        current = self.active_version()
+        if current not in versions or versions.index(current) == 0:
+            raise ValueError(f"No version to roll back to from {current}")
+        previous = versions[versions.index(current) - 1]
+        self.activate(previous)
+        return previous
+
+    def prune(self, keep: int) -> List[str]:
+        """Delete the oldest versions beyond `keep`, never the active one; returns those removed"""
+        active = self.active_version()
+        stale = [v for v in self.list_versions()[:-keep or None] if v != active] if keep > 0 else []
+        for version in stale:
+            shutil.rmtree(self._version_dir(version), ignore_errors=True)
+        return stale
+
+    def model_path(self, version: Optional[str] = None) -> str:
+        version = version or self.active_version()
+        if not version:
+            raise FileNotFoundError(f"No models registered in {self.root}")
+        return os.path.join(self._version_dir(version), self.MODEL_FILE)
+
+    def compact_path(self, version: Optional[str] = None) -> str:
+        """Path of the flattened forest exported next to a version's joblib file"""
+        return os.path.join(os.path.dirname(self.model_path(version)), self.COMPACT_FILE)
+
+    def load(self, version: Optional[str] = None) -> Any:
+        """Load a model version (the active one by default)"""
+        path = self.model_path(version)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No model found at {path}")
+        return joblib.load(path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect and switch registered models')
+    parser.add_argument('--registry-dir', default=None)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    activate_parser = sub.add_parser('activate')
+    activate_parser.add_argument('version')
+    sub.add_parser('rollback')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry_dir)
+    if args.command == 'list':
+        active = registry.active_version()
+        for version in registry.list_versions():
+            metrics = registry.get_metadata(version).get('metrics', {})
+            marker = '*' if version == active else ' '
+            print(f"{marker} {version}  test_r2={metrics.get('test_r2')}  cv_r2={metrics.get('cv_r2')}")
+    elif args.command == 'activate':
+        registry.activate(args.version)
+        print(f"Active version: {args.version}")
+    elif args.command == 'rollback':
+        print(f"Rolled back to {registry.rollback()}")
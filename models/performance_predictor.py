@@ -1,62 +1,132 @@
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+import os
+import time
 import pandas as pd
 import joblib
 import numpy as np
-from typing import Tuple, List
+from typing import Dict, Optional, Tuple, List
+from models.model_registry import ModelRegistry
+from models.compact_forest import CompactForest, export_forest
+
+
+FEATURE_COLUMNS = [
+    'cs_at_10', 'gold_diff_at_10', 'vision_score_per_min',
+    'kill_participation', 'damage_per_gold'
+]
+# Everything train() reads, for column-projected loads
+TRAINING_COLUMNS = ['player_id', 'game_date', 'created_at', 'kda', *FEATURE_COLUMNS]
+# When a game was played, best first; created_at is only when it was ingested
+TIME_COLUMNS = ('game_date', 'created_at')
+ROLLING_WINDOWS = (3, 5)
+# Stored games per player that give new games their full rolling context
+HISTORY_GAMES = max(ROLLING_WINDOWS)
+
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [100, 200],
+    'max_depth': [None, 10, 20],
+    'min_samples_leaf': [1, 5]
+}
 
 
 class PerformancePredictor:
     """Predict future performance based on recent trends"""
     
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
+    def __init__(self, n_jobs: int = -1):
+        self.n_jobs = n_jobs
+        self.model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
         self.is_trained = False
+        self.version = None
     
-    def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare features for training"""
-        feature_cols = [
-            'cs_at_10', 'gold_diff_at_10', 'vision_score_per_min',
-            'kill_participation', 'damage_per_gold'
-        ]
-        
-        # Create rolling averages as features
-        for col in feature_cols:
+    @staticmethod
+    def _add_features(df: pd.DataFrame) -> pd.DataFrame:
+        """Rolling averages per player and the next game's KDA as the target"""
+        for col in FEATURE_COLUMNS:
             if col in df.columns:
-                df[f'{col}_rolling_3'] = df.groupby('player_id')[col].transform(
-                    lambda x: x.rolling(3, min_periods=1).mean()
-                )
-                df[f'{col}_rolling_5'] = df.groupby('player_id')[col].transform(
-                    lambda x: x.rolling(5, min_periods=1).mean()
-                )
-        
+                for window in ROLLING_WINDOWS:
+                    df[f'{col}_rolling_{window}'] = df.groupby('player_id')[col].transform(
+                        lambda x: x.rolling(window, min_periods=1).mean()
+                    )
+
         # Target: next game performance (overall score)
         if 'kda' in df.columns:
             df['next_game_kda'] = df.groupby('player_id')['kda'].shift(-1)
+        return df
+
+    @staticmethod
+    def _design(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        if 'next_game_kda' in df.columns:
             # Drop rows without target
             df = df.dropna(subset=['next_game_kda'])
             y = df['next_game_kda'].values
         else:
             y = np.array([])
-        
+
         feature_columns = [c for c in df.columns if '_rolling_' in c]
         X = df[feature_columns].values
-        
+
         return X, y
-    
-    def train(self, df: pd.DataFrame):
-        """Train the prediction model"""
+
+    def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Prepare features for training"""
+        return self._design(self._add_features(df))
+
+    @staticmethod
+    def sort_chronologically(df: pd.DataFrame) -> pd.DataFrame:
+        """Order games by when they were played so that splits never train on the future
+
+        Ingestion order is not play order once backfills run shards in
+        parallel or replays re-derive history, so the match's game_date
+        leads and created_at only fills in where it is missing.
+        """
+        played = None
+        for col in TIME_COLUMNS:
+            if col in df.columns:
+                times = pd.to_datetime(df[col], utc=True, errors='coerce', format='mixed')
+                played = times if played is None else played.fillna(times)
+        if played is None:
+            return df.reset_index(drop=True)
+        order = played.reset_index(drop=True).sort_values(kind='stable', na_position='last').index
+        return df.reset_index(drop=True).iloc[order].reset_index(drop=True)
+
+    def train(self,
+              df: pd.DataFrame,
+              param_grid: Optional[Dict[str, List]] = None,
+              n_splits: int = 5,
+              test_size: float = 0.2) -> Dict:
+        """Train the prediction model with a time-ordered hyperparameter search"""
+        df = self.sort_chronologically(df)
         X, y = self.prepare_features(df)
         
         if len(X) < 10:
             print("Not enough data to train")
-            return
+            return {}
+
+        # Hold out the most recent games instead of a random sample
+        split_at = int(len(X) * (1 - test_size))
+        X_train, X_test = X[:split_at], X[split_at:]
+        y_train, y_test = y[:split_at], y[split_at:]
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
+        # Folds are time-ordered too; trees inside the search stay single-threaded
+        # so the search itself can fan out across all cores
+        cv = TimeSeriesSplit(n_splits=max(2, min(n_splits, len(X_train) - 1)))
+        search = GridSearchCV(
+            RandomForestRegressor(random_state=42, n_jobs=1),
+            param_grid or DEFAULT_PARAM_GRID,
+            cv=cv,
+            scoring='r2',
+            n_jobs=self.n_jobs,
+            refit=False
         )
-        
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        search_seconds = time.perf_counter() - start
+
+        best_index = search.best_index_
+        self.model = RandomForestRegressor(random_state=42, n_jobs=self.n_jobs, **search.best_params_)
+        start = time.perf_counter()
         self.model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
         self.is_trained = True
         
         # Evaluate
@@ -65,15 +135,88 @@ class PerformancePredictor:
         
         print(f"Train R²: {train_score:.3f}")
         print(f"Test R²: {test_score:.3f}")
-    
+
+        return {
+            'params': search.best_params_,
+            'metrics': {
+                'cv_r2': float(search.cv_results_['mean_test_score'][best_index]),
+                'cv_r2_std': float(search.cv_results_['std_test_score'][best_index]),
+                'train_r2': float(train_score),
+                'test_r2': float(test_score)
+            },
+            'timing': {
+                'search_seconds': round(search_seconds, 3),
+                'fit_seconds': round(fit_seconds, 3),
+                'candidates': len(search.cv_results_['params']),
+                'cv_splits': cv.get_n_splits()
+            },
+            'n_train': len(X_train),
+            'n_test': len(X_test)
+        }
+
+    def partial_fit(self,
+                    df: pd.DataFrame,
+                    history: Optional[pd.DataFrame] = None,
+                    n_new_trees: int = 10,
+                    max_trees: int = 500) -> int:
+        """Grow the forest with trees fitted only on newly ingested games
+
+        `history` holds the players' earlier stored games (see HISTORY_GAMES).
+        Features are built over history plus the new games, and only targets
+        that involve a new game are kept: a new game's own next-game target,
+        or the last stored game whose next game just arrived. Existing trees
+        are kept (warm start) and the oldest ones are retired once the forest
+        exceeds max_trees, so the model tracks recent play without a full
+        refit. Returns the number of training rows used.
+        """
+        # History comes back oldest first and always predates the new games
+        frames = [self.sort_chronologically(df).assign(_new=True)]
+        if history is not None and not history.empty:
+            frames.insert(0, history.reset_index(drop=True).assign(_new=False))
+        df = self._add_features(pd.concat(frames, ignore_index=True))
+        next_is_new = df.groupby('player_id')['_new'].shift(-1).eq(True)
+        X, y = self._design(df[df['_new'] | next_is_new])
+        if len(X) == 0:
+            return 0
+
+        # Warm starting needs the sklearn estimator, not the compact export
+        if not self.is_trained or isinstance(self.model, CompactForest):
+            try:
+                self.load_from_registry(compact=False)
+            except Exception:
+                self.is_trained = False
+
+        if not self.is_trained:
+            # Nothing to warm start from; a compact forest left behind cannot be refit
+            self.model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=self.n_jobs)
+            self.model.fit(X, y)
+            self.is_trained = True
+            return len(X)
+
+        self.model.set_params(
+            warm_start=True,
+            n_estimators=len(self.model.estimators_) + n_new_trees,
+            n_jobs=self.n_jobs
+        )
+        self.model.fit(X, y)
+
+        if len(self.model.estimators_) > max_trees:
+            self.model.estimators_ = self.model.estimators_[-max_trees:]
+            self.model.set_params(n_estimators=max_trees)
+        self.version = None
+        return len(X)
+
     def predict_next_performance(self, player_recent_stats: pd.DataFrame) -> float:
         """Predict next game performance"""
         if not self.is_trained:
-            # Try to load model if not trained
+            # Try the registry's active version, then the legacy single file
             try:
-                self.load_model()
+                self.load_from_registry()
             except Exception:
-                return 0.0
+                try:
+                    self.load_model()
+                except Exception:
+                    return 0.0
         
         X, _ = self.prepare_features(player_recent_stats)
         if len(X) == 0:
@@ -95,4 +238,36 @@ class PerformancePredictor:
         else:
             raise FileNotFoundError(f"No model found at {path}")
 
-import os
+    def export_compact(self, path: str) -> CompactForest:
+        """Flatten the trained forest into a memory-mappable file"""
+        return export_forest(self.model, path)
+
+    def load_compact(self, path: str, mmap: bool = True):
+        """Serve predictions from a flattened forest instead of the pickled model"""
+        self.model = CompactForest.load(path, mmap=mmap)
+        self.is_trained = True
+
+    def save_to_registry(self, registry=None, metadata: Optional[Dict] = None, activate: bool = True) -> str:
+        """Save trained model as a new registry version, with its compact export"""
+        registry = registry or ModelRegistry()
+        self.version = registry.save(self.model, metadata, activate=False)
+        self.export_compact(registry.compact_path(self.version))
+        if activate:
+            registry.activate(self.version)
+        return self.version
+
+    def load_from_registry(self, registry=None, version: Optional[str] = None, compact: bool = True):
+        """Load a registry version (the active one by default)
+
+        The compact export is preferred when present: it maps in without
+        unpickling and skips sklearn's per-call validation.
+        """
+        registry = registry or ModelRegistry()
+        version = version or registry.active_version()
+        compact_path = registry.compact_path(version)
+        if compact and os.path.exists(compact_path):
+            self.load_compact(compact_path)
+        else:
+            self.model = registry.load(version)
+        self.version = version
+        self.is_trained = True
@@ -9,12 +9,14 @@ import os
 class MicroSkillScorer:
     """Calculate weighted micro-skill scores for players"""
     
-    def __init__(self, taxonomy_path: str = None):
-        if taxonomy_path is None:
-            taxonomy_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'micro_skills_taxonomy.json')
-        
-        with open(taxonomy_path, 'r') as f:
-            self.taxonomy = json.load(f)
+    def __init__(self, taxonomy_path: str = None, taxonomy: Dict = None):
+        if taxonomy is None:
+            if taxonomy_path is None:
+                taxonomy_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'micro_skills_taxonomy.json')
+            
+            with open(taxonomy_path, 'r') as f:
+                taxonomy = json.load(f)
+        self.taxonomy = taxonomy
         self.scaler = StandardScaler()
         self.weights = self._extract_weights()
     
@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+import argparse
+import pandas as pd
+from sqlalchemy import create_engine
+
+# Add the project root to sys.path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.performance_predictor import PerformancePredictor, TRAINING_COLUMNS
+from models.model_registry import ModelRegistry
+from data.parquet_store import ParquetStore
+
+
+def load_training_data(db_url: str, source: str = 'db', start_month: str = None) -> pd.DataFrame:
+    """Load ingested games for training, from the database or the Parquet dataset"""
+    if source == 'parquet':
+        store = ParquetStore()
+        if store.is_complete():
+            return store.read(columns=TRAINING_COLUMNS, start_month=start_month)
+        print(f"Parquet dataset at {store.root} was never exported (python -m data.parquet_store export); "
+              f"reading the database instead")
+    engine = create_engine(db_url)
+    # game_date lives on the match; the rest on the player's row
+    selected = ', '.join(f"{'m' if column == 'game_date' else 's'}.{column}" for column in TRAINING_COLUMNS)
+    return pd.read_sql(
+        f"SELECT {selected} FROM player_micro_skills s LEFT JOIN matches m ON m.match_id = s.match_id", engine
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the performance predictor and register a new version')
+    parser.add_argument('--db-url', default=os.getenv('DATABASE_URL', 'sqlite:///micromentor.db'))
+    parser.add_argument('--source', choices=['db', 'parquet'], default='db',
+                        help='Read training rows from the database or the partitioned Parquet dataset')
+    parser.add_argument('--start-month', default=None, help='Earliest YYYY-MM partition to read (parquet only)')
+    parser.add_argument('--registry-dir', default=None)
+    parser.add_argument('--n-splits', type=int, default=5, help='Time-ordered CV folds')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel workers (-1 uses all cores)')
+    parser.add_argument('--no-activate', action='store_true', help='Register without switching serving to it')
+    args = parser.parse_args(argv)
+
+    df = load_training_data(args.db_url, args.source, args.start_month)
+    print(f"Loaded {len(df)} rows")
+
+    predictor = PerformancePredictor(n_jobs=args.n_jobs)
+    report = predictor.train(df, n_splits=args.n_splits)
+    if not report:
+        return 1
+
+    registry = ModelRegistry(args.registry_dir)
+    version = predictor.save_to_registry(registry, report, activate=not args.no_activate)
+    print(json.dumps({'version': version, **report}, indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
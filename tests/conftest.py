@@ -0,0 +1,52 @@
+import os
+import sys
+from typing import Dict, List, Optional
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeGRIDClient:
+    """Serves `series` oldest-first, `page_size` per page
+
+    Honours the after cursor and the inclusive start_after/start_before
+    window the way GRID's seriesConnection does. Every page request is
+    recorded in `calls` as (after, start_after).
+    """
+
+    replay = False
+
+    def __init__(self, series: List[Dict], page_size: int = 2, tournament_id: Optional[str] = None):
+        self.series = series
+        self.page_size = page_size
+        self.tournament_id = tournament_id
+        self.calls = []
+
+    def iter_series(self, title_id=3, page_size=50, types='ESPORTS', after=None,
+                    start_after=None, start_before=None, order_direction='ASC'):
+        nodes = [s for s in self.series
+                 if (not start_after or s['startTimeScheduled'] >= start_after)
+                 and (not start_before or s['startTimeScheduled'] <= start_before)]
+        position = int(after) if after else 0
+        while True:
+            self.calls.append((after, start_after))
+            chunk = nodes[position:position + self.page_size]
+            position += len(chunk)
+            yield {
+                'totalCount': len(nodes),
+                'pageInfo': {'hasNextPage': position < len(nodes), 'endCursor': str(position)},
+                'edges': [{'cursor': str(position - len(chunk) + i + 1), 'node': node}
+                          for i, node in enumerate(chunk)]
+            }
+            if position >= len(nodes):
+                return
+            after = str(position)
+
+    def fetch_series_details(self, series_ids, batch_size=None):
+        details = {}
+        for s in self.series:
+            if s['id'] in series_ids:
+                details[s['id']] = {'id': s['id'], 'startTimeScheduled': s['startTimeScheduled']}
+                if self.tournament_id:
+                    details[s['id']]['tournament'] = {'id': self.tournament_id}
+        return details
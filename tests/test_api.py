@@ -1,3 +1,4 @@
+import json
 import pytest
 import os
 import sys
@@ -37,3 +38,35 @@ def test_benchmarks(client):
     response = client.get('/api/players/test_player/benchmarks?role=mid')
     assert response.status_code == 200
     assert 'cs_at_10' in response.json
+
+
+def _sse_events(body):
+    events = []
+    for frame in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in frame.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_hypothetical_stream_matches_plain_response(client):
+    question = {'question': 'What if we contested the Baron instead of pushing bot?'}
+    plain = client.post('/api/players/test_player/hypothetical', json=question).json
+
+    response = client.post('/api/players/test_player/hypothetical/stream', json=question)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    events = _sse_events(response.get_data(as_text=True))
+
+    # Scenarios first, then the prediction in order, then done
+    assert events[0] == ('scenarios', {'player_id': 'test_player', 'scenarios': plain['scenarios']})
+    assert events[-1][0] == 'done'
+    tokens = [data['text'] for name, data in events[1:-1]]
+    assert {name for name, _ in events[1:-1]} == {'token'}
+    assert ''.join(tokens) == plain['prediction']
+    assert len(tokens) > 1
+
+
+def test_hypothetical_stream_supports_event_source(client):
+    response = client.get('/api/players/test_player/hypothetical/stream?question=drake&chunk_words=100')
+    events = _sse_events(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ['scenarios', 'token', 'done']
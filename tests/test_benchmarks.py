@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import datasets
+from benchmarks.suite import compare, load_baseline, run_suite, save_baseline
+
+
+def _run(seconds, calibration=1.0, rows=1000):
+    return {
+        'scale': '10k', 'created_at': 'now', 'calibration_seconds': calibration,
+        'results': {name: {'rows': rows, 'seconds': value} for name, value in seconds.items()}
+    }
+
+
+def test_generated_frame_keeps_the_table_key_unique():
+    frame = datasets.skill_frame(5000)
+    assert len(frame) == 5000
+    assert not frame.duplicated(['match_id', 'player_id']).any()
+    assert frame['created_at'].is_monotonic_increasing
+
+    matches = datasets.raw_matches(100)
+    assert len(matches) == 10 and all(len(match['players']) == 10 for match in matches)
+
+
+def test_compare_flags_slowdowns_past_threshold():
+    baseline = _run({'fast': 1.0, 'steady': 1.0, 'slow': 1.0, 'tiny': 0.001, 'resized': 1.0})
+    run = _run({'fast': 0.5, 'steady': 1.1, 'slow': 1.5, 'tiny': 0.003, 'added': 1.0, 'resized': 9.0})
+    run['results']['resized']['rows'] = 2000
+
+    report = compare(run, baseline, threshold=0.25)
+    statuses = {name: case['status'] for name, case in report['cases'].items()}
+    assert statuses == {'fast': 'faster', 'steady': 'ok', 'slow': 'slower', 'tiny': 'ok',
+                        'added': 'new', 'resized': 'new'}
+    assert report['regressions'] == ['slow']
+
+
+def test_compare_scales_by_machine_speed():
+    baseline = _run({'case': 1.0}, calibration=1.0)
+    # Everything, calibration included, ran twice as slow: not a regression
+    assert compare(_run({'case': 2.0}, calibration=2.0), baseline)['regressions'] == []
+    assert compare(_run({'case': 2.0}, calibration=1.0), baseline)['regressions'] == ['case']
+
+
+def test_suite_runs_and_round_trips_baseline(tmp_path):
+    cases = ['etl.transform_to_dataframe', 'scorer.percentile_ranks',
+             'comparator.compare_to_role', 'comparator.similar_players', 'predictor.prepare_features']
+    run = run_suite(rows=2000, cases=cases, repeat=1)
+    assert list(run['results']) == cases
+    assert all(result['seconds'] > 0 and result['rows'] == 2000 for result in run['results'].values())
+
+    path = save_baseline(run, str(tmp_path / 'baseline.json'))
+    assert compare(run, load_baseline('10k', path))['regressions'] == []
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.db_loader import MicroSkillLoader
+from data.etl_pipeline import MicroSkillETL
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'loader.db'}")
+
+
+@pytest.fixture
+def rows():
+    etl = MicroSkillETL()
+    return etl.transform_to_dataframe([etl.extract_match_data('s1'), etl.extract_match_data('s2')])
+
+
+def test_resync_is_idempotent(engine, rows):
+    loader = MicroSkillLoader(engine, chunk_size=3)
+    first = loader.load(rows)
+    assert (first['inserted'], first['updated'], first['skipped']) == (4, 0, 0)
+
+    again = loader.load(rows)
+    assert (again['inserted'], again['updated'], again['skipped']) == (0, 0, 4)
+    assert pd.read_sql('SELECT COUNT(*) AS n FROM player_micro_skills', engine)['n'][0] == 4
+
+
+def test_changed_rows_are_updated_and_parents_upserted(engine, rows):
+    loader = MicroSkillLoader(engine)
+    loader.load(rows)
+
+    changed = rows.copy()
+    changed.loc[0, 'cs_at_10'] = 120
+    extra = changed.iloc[[0]].assign(match_id='s3')
+    stats = loader.load(pd.concat([changed, extra, changed.iloc[[1]]], ignore_index=True))
+    assert (stats['inserted'], stats['updated'], stats['skipped']) == (1, 1, 4)
+    assert stats['inserted_keys'] == [('s3', 'faker_id')]
+
+    cs = pd.read_sql(
+        "SELECT cs_at_10 FROM player_micro_skills WHERE match_id = 's1' AND player_id = 'faker_id'", engine
+    )
+    assert cs['cs_at_10'][0] == 120
+    assert set(pd.read_sql('SELECT match_id FROM matches', engine)['match_id']) == {'s1', 's2', 's3'}
+    assert set(pd.read_sql('SELECT player_id FROM players', engine)['player_id']) == {'faker_id', 'caps_id'}
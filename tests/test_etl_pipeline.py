@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import FakeGRIDClient
+from data.etl_pipeline import MicroSkillETL
+from data.sync_state import SyncStateStore
+from data.series_index import IngestedSeriesIndex
+from data.streaming import StreamingPipeline
+
+
+SERIES = [{'id': str(i), 'startTimeScheduled': f'2026-01-{i:02d}T12:00:00Z'} for i in range(1, 8)]
+
+
+@pytest.fixture
+def etl(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'etl.db'}")
+    monkeypatch.setenv('SERIES_INDEX_PATH', str(tmp_path / 'series_index.npy'))
+    monkeypatch.setenv('INGESTION_REPORT_DIR', str(tmp_path / 'ingestion_runs'))
+    pipeline = MicroSkillETL()
+    pipeline.client = FakeGRIDClient(SERIES, page_size=2, tournament_id='t1')
+    pipeline.sync_state = SyncStateStore(str(tmp_path / 'sync_state.json'))
+    return pipeline
+
+
+def test_ingestion_resumes_from_checkpoint(etl):
+    assert etl.run_ingestion(limit=3) == 3
+    state = etl.sync_state.get('title:3')
+    assert state['cursor'] == '3'
+    assert state['watermark'] == SERIES[2]['startTimeScheduled']
+
+    # The next run picks up after the third series instead of starting over
+    assert etl.run_ingestion(limit=None) == 4
+    state = etl.sync_state.get('title:3')
+    assert state['cursor'] is None
+    assert state['watermark'] == SERIES[-1]['startTimeScheduled']
+
+    matches = pd.read_sql('SELECT match_id, tournament_id, game_date FROM matches', etl.loader.engine)
+    assert len(matches) == len(SERIES)
+    assert set(matches['tournament_id']) == {'t1'}
+
+
+def test_regular_sync_starts_at_watermark(etl):
+    etl.sync_state.update('title:3', watermark=SERIES[5]['startTimeScheduled'])
+    assert etl.run_ingestion(limit=None) == 2
+    assert etl.client.calls[0] == (None, SERIES[5]['startTimeScheduled'])
+
+
+def test_scheduled_series_do_not_move_the_watermark(etl):
+    upcoming = {'id': 'upcoming', 'startTimeScheduled': '2999-01-01T12:00:00Z'}
+    etl.client.series = SERIES + [upcoming]
+    assert etl.run_ingestion(limit=None) == len(SERIES)
+    # Games played before the upcoming series are still ahead of the watermark
+    assert etl.sync_state.get('title:3')['watermark'] == SERIES[-1]['startTimeScheduled']
+    assert 'upcoming' not in etl.series_index
+
+
+def test_full_sync_skips_already_ingested_series(etl, monkeypatch):
+    assert etl.run_ingestion(limit=4) == 4
+    assert len(etl.series_index) == 4
+
+    extracted = []
+    original = etl.extract_many
+    monkeypatch.setattr(etl, 'extract_many', lambda ids: extracted.extend(ids) or original(ids))
+    assert etl.run_ingestion(limit=None, full_sync=True) == len(SERIES)
+    assert extracted == ['5', '6', '7']
+
+    # The persisted index survives a new pipeline instance
+    assert len(IngestedSeriesIndex()) == len(SERIES)
+
+
+def test_replay_rederives_already_ingested_series(etl, monkeypatch):
+    assert etl.run_ingestion(limit=None) == len(SERIES)
+
+    extracted = []
+    original = etl.extract_many
+    monkeypatch.setattr(etl, 'extract_many', lambda ids: extracted.extend(ids) or original(ids))
+    monkeypatch.setattr(etl.client, 'replay', True, raising=False)
+    assert etl.run_ingestion(limit=None) == len(SERIES)
+    assert extracted == [s['id'] for s in SERIES]
+
+
+def test_series_index_rebuilds_from_database(etl, tmp_path):
+    etl.run_ingestion(limit=None)
+    index = IngestedSeriesIndex(str(tmp_path / 'rebuilt.npy'))
+    index.sync_with(etl.loader.engine)
+    assert len(index) == len(SERIES)
+    assert '3' in index and 'unseen' not in index
+    assert index.new_ids(['1', 'x', '2', 'y']) == ['x', 'y']
+
+    # An emptied database invalidates the index instead of hiding new data
+    with etl.loader.engine.begin() as conn:
+        conn.exec_driver_sql('DELETE FROM player_micro_skills')
+    index.sync_with(etl.loader.engine)
+    assert len(index) == 0
+
+
+def test_every_run_leaves_a_report(etl, tmp_path, monkeypatch):
+    from api.app import create_app
+    from api.components import AppComponents
+
+    etl.run_ingestion(limit=None)
+    report = etl.last_run_report
+    assert report['status'] == 'success'
+    assert report['series_processed'] == len(SERIES)
+    assert report['rows_loaded'] == report['stages']['transform']['rows'] > 0
+    assert report['rows'] == {'inserted': report['rows_loaded'], 'updated': 0, 'skipped': 0}
+    assert report['stages']['load']['series'] == len(SERIES)
+    assert report['stages']['extract']['batches'] >= 1
+    assert report['memory']['peak_mb'] > 0
+    assert report['http'] == {}  # the fake client does not count calls
+    with open(tmp_path / 'ingestion_runs' / f"{report['run_id']}.json") as f:
+        assert json.load(f)['run_id'] == report['run_id']
+
+    # Re-deriving unchanged series hands the loader rows but writes none
+    etl.run_ingestion(limit=None, full_sync=True, skip_ingested=False)
+    rerun = etl.last_run_report
+    assert rerun['stages']['load']['rows'] == report['rows_loaded']
+    assert rerun['rows_loaded'] == 0 and rerun['rows']['skipped'] == report['rows_loaded']
+
+    monkeypatch.setattr(etl, 'extract_many', lambda ids: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        etl.run_ingestion(limit=None, full_sync=True, skip_ingested=False)
+    assert etl.last_run_report['status'] == 'failed'
+    assert 'ZeroDivisionError' in etl.last_run_report['error']
+
+    components = AppComponents()
+    components.engine = etl.loader.engine
+    client = create_app(components).test_client()
+    runs = client.get('/api/ingestion/runs').json
+    assert [run['status'] for run in runs] == ['failed', 'success', 'success']
+    assert [run['rows_loaded'] for run in runs[1:]] == [0, report['rows_loaded']]
+    assert runs[2]['stages']['load']['rows'] == report['rows_loaded']
+
+    assert client.get(f"/api/ingestion/runs/{report['run_id']}").json == report
+    assert client.get('/api/ingestion/runs/unknown').status_code == 404
+
+
+def test_online_updates_learn_from_single_game_batches(etl, tmp_path, monkeypatch):
+    from models.model_registry import ModelRegistry
+    from models.performance_predictor import PerformancePredictor
+
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path / 'registry'))
+    etl.predictor = PerformancePredictor(n_jobs=1)
+    etl.model_versions_kept = 2
+    for series_id in ('a', 'b'):
+        etl.load_to_database(etl.transform_to_dataframe([etl.extract_match_data(series_id)]))
+
+    # One new game per player: the stored previous game supplies the target
+    new_rows = etl.load_to_database(etl.transform_to_dataframe([etl.extract_match_data('c')]))
+    etl.update_model(new_rows)
+    registry = ModelRegistry()
+    assert len(registry.list_versions()) == 1
+
+    # Within the save interval updates stay in memory until flushed
+    for series_id in ('d', 'e', 'f'):
+        etl.update_model(etl.load_to_database(etl.transform_to_dataframe([etl.extract_match_data(series_id)])))
+    assert len(registry.list_versions()) == 1
+    assert etl.save_model_update(force=True) is not None
+    assert len(registry.list_versions()) == 2
+    assert etl.save_model_update(force=True) is None
+
+
+def test_columnar_transform_matches_per_player_calculation(etl):
+    matches = [etl.extract_match_data('a'), etl.extract_match_data('b')]
+    matches[1]['players'][0].pop('game_duration')
+    matches[1]['players'][1]['deaths'] = 4
+    df = etl.transform_to_dataframe(matches)
+
+    assert len(df) == 4
+    assert df['match_id'].tolist() == ['a', 'a', 'b', 'b']
+    assert df['role'].dtype == 'category'
+    assert df['kill_participation'].dtype == np.float32
+
+    for i, player in enumerate(p for match in matches for p in match['players']):
+        expected = etl.calculate_micro_skills(player)
+        for name, value in expected.items():
+            assert df[name].iloc[i] == pytest.approx(value, rel=1e-6), name
+
+
+def test_transform_handles_empty_input(etl):
+    assert etl.transform_to_dataframe([{'id': 'x', 'players': []}]).empty
+
+
+def test_streaming_pipeline_bounds_in_flight_items():
+    in_flight = []
+    peak = []
+
+    def source():
+        for i in range(50):
+            in_flight.append(i)
+            peak.append(len(in_flight))
+            yield i
+
+    def slow_load(item):
+        time.sleep(0.001)
+        in_flight.remove(item)
+        return item
+
+    StreamingPipeline([('transform', lambda x: x), ('load', slow_load)], queue_size=2).run(source())
+    assert not in_flight
+    # Two queues of two plus one item held by each stage and the producer
+    assert max(peak) <= 7
+
+
+def test_streaming_pipeline_reraises_stage_errors():
+    def fail(item):
+        if item == 3:
+            raise ValueError('boom')
+        return item
+
+    with pytest.raises(ValueError, match='boom'):
+        StreamingPipeline([('fail', fail), ('sink', lambda x: x)]).run(iter(range(100)))
@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.grid_client import GRIDClient
+from data.payload_cache import PayloadCache
+from data.run_report import HttpStats
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fails the first request of every path with a 503, then answers"""
+    seen = set()
+    calls = 0
+
+    def _respond(self):
+        FlakyHandler.calls += 1
+        if self.path not in FlakyHandler.seen:
+            FlakyHandler.seen.add(self.path)
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({'data': {'path': self.path}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond()
+
+    def do_GET(self):
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def grid_server():
+    FlakyHandler.seen = set()
+    FlakyHandler.calls = 0
+    server = HTTPServer(('127.0.0.1', 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def test_session_retries_transient_errors(grid_server):
+    client = GRIDClient(timeout=5, max_retries=2)
+    client.graphql_url = f'{grid_server}/graphql'
+    client.base_url = grid_server
+
+    assert client.execute_query('{ ping }') == {'data': {'path': '/graphql'}}
+    assert client.fetch_player_stats('p1') == {'data': {'path': '/players/p1/stats'}}
+    assert FlakyHandler.calls == 4
+    assert client.stats.calls == 2 and client.stats.retries == 2 and client.stats.errors == 0
+
+
+def test_http_stats_keep_a_bounded_window(monkeypatch):
+    monkeypatch.setattr(HttpStats, 'MAX_LATENCIES', 100)
+    stats = HttpStats()
+    for _ in range(500):
+        stats.record(1.0, 200)
+    mark = stats.mark()
+    for _ in range(30):
+        stats.record(0.002, 200)
+    assert len(stats.latencies) == 100
+    # A run only sees its own calls, and as many of them as are still kept
+    run = stats.since(mark)
+    assert run['calls'] == 30 and run['latency_ms']['samples'] == 30 and run['latency_ms']['max'] == 2.0
+    assert stats.since({'calls': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0})['latency_ms']['samples'] == 100
+
+
+def test_session_gives_up_after_max_retries(grid_server):
+    client = GRIDClient(timeout=5, max_retries=0)
+    client.graphql_url = f'{grid_server}/graphql'
+    assert client.execute_query('{ ping }') == {}
+
+
+def test_payload_cache_replays_without_network(grid_server, tmp_path):
+    cache = PayloadCache(str(tmp_path))
+    client = GRIDClient(timeout=5, max_retries=2, cache=cache)
+    client.graphql_url = f'{grid_server}/graphql'
+    client.execute_query('{ ping }', {'b': 1, 'a': 2})
+    calls = FlakyHandler.calls
+
+    replay = GRIDClient(cache=cache, replay=True)
+    replay.graphql_url = f'{grid_server}/graphql'
+    # Variable order does not change the content address
+    assert replay.execute_query('{ ping }', {'a': 2, 'b': 1}) == {'data': {'path': '/graphql'}}
+    assert replay.execute_query('{ other }') == {}
+    assert FlakyHandler.calls == calls
+
+
+def test_payload_cache_tolerates_concurrent_writes_of_one_key(tmp_path):
+    cache = PayloadCache(str(tmp_path))
+    key = cache.key('graphql', 'url', {'query': '{ ping }'})
+    payloads = [{'writer': i, 'rows': list(range(20_000))} for i in range(8)]
+    barrier = threading.Barrier(len(payloads))
+    errors = []
+
+    def write(payload):
+        barrier.wait()
+        try:
+            for _ in range(5):
+                cache.put(key, payload)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get(key) in payloads
+    assert not [name for name in os.listdir(os.path.dirname(cache.path(key))) if name.endswith('.tmp')]
+
+
+def test_batched_lookup_aliases_ids_and_splits_results(monkeypatch):
+    client = GRIDClient()
+    sent = []
+
+    def fake_execute(query, variables=None):
+        sent.append((query, variables))
+        return {'data': {f'r{i}': {'id': value} for i, value in enumerate(variables.values()) if value != 'missing'}}
+
+    monkeypatch.setattr(client, 'execute_query', fake_execute)
+    ids = ['s1', 's2', 's3', 'missing', 's1', 's5']
+    details = client.fetch_series_details(ids, batch_size=2)
+
+    # Duplicates collapse, so five unique IDs need three requests
+    assert len(sent) == 3
+    assert 'r1: series(id: $id1)' in sent[0][0]
+    assert sent[0][1] == {'id0': 's1', 'id1': 's2'}
+    assert details['s3'] == {'id': 's3'}
+    assert details['missing'] is None
+    assert set(details) == {'s1', 's2', 's3', 'missing', 's5'}
@@ -0,0 +1,131 @@
+import json
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.etl_pipeline import MicroSkillETL
+from data.db_loader import MicroSkillLoader
+from data.live_ingestion import FileEventSource, LiveIngestor
+
+
+PLAYERS = [
+    {'id': 'b_mid', 'name': 'Blue Mid', 'role': 'mid', 'champion': 'Ahri', 'team': 'blue'},
+    {'id': 'b_jg', 'name': 'Blue Jungle', 'role': 'jungle', 'champion': 'Vi', 'team': 'blue'},
+    {'id': 'r_mid', 'name': 'Red Mid', 'role': 'mid', 'champion': 'Syndra', 'team': 'red'},
+]
+
+EVENTS = [
+    {'type': 'game_start', 'match_id': 'm1', 'game_time': 0, 'players': PLAYERS},
+    *[{'type': 'cs', 'match_id': 'm1', 'game_time': 30 + i, 'player_id': 'b_mid'} for i in range(80)],
+    {'type': 'stats', 'match_id': 'm1', 'game_time': 599, 'player_id': 'b_mid', 'gold': 4000, 'xp': 5000},
+    {'type': 'stats', 'match_id': 'm1', 'game_time': 599, 'player_id': 'r_mid', 'gold': 3500, 'xp': 4700},
+    {'type': 'ward_placed', 'match_id': 'm1', 'game_time': 610, 'player_id': 'b_mid'},
+    {'type': 'ward_cleared', 'match_id': 'm1', 'game_time': 620, 'player_id': 'b_mid'},
+    # After 10:00, so it must not move cs_at_10
+    {'type': 'cs', 'match_id': 'm1', 'game_time': 700, 'player_id': 'b_mid', 'amount': 20},
+    {'type': 'kill', 'match_id': 'm1', 'game_time': 720, 'killer_id': 'b_mid',
+     'victim_id': 'r_mid', 'assist_ids': ['b_jg']},
+    {'type': 'kill', 'match_id': 'm1', 'game_time': 1000, 'killer_id': 'b_jg', 'victim_id': 'r_mid'},
+    {'type': 'stats', 'match_id': 'm1', 'game_time': 1500, 'player_id': 'b_mid', 'gold': 9000,
+     'xp': 11000, 'vision_score': 30, 'total_damage': 18000, 'gold_spent': 8000},
+    {'type': 'game_end', 'match_id': 'm1', 'game_time': 1800, 'winning_team': 'blue'},
+]
+
+
+class ListSink:
+    def __init__(self):
+        self.snapshots = []
+
+    def push(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+@pytest.fixture
+def event_file(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    path.write_text('\n'.join(json.dumps(event) for event in EVENTS) + '\n')
+    return str(path)
+
+
+def test_live_counters_and_snapshots(event_file):
+    sink = ListSink()
+    ingestor = LiveIngestor(sink, snapshot_interval=300)
+    ingestor.run(FileEventSource(event_file))
+
+    # Periodic pushes while the game runs, then exactly one final snapshot
+    assert len(sink.snapshots) > 1
+    assert [s['final'] for s in sink.snapshots].count(True) == 1
+    final = sink.snapshots[-1]
+    assert final['final'] and final['game_time'] == 1800
+    assert ingestor.matches == {}
+
+    mid = final['players']['b_mid']
+    assert mid['cs_at_10'] == 80
+    assert mid['gold_diff_at_10'] == 500
+    assert mid['xp_diff_at_10'] == 300
+    assert mid['wards_placed_total'] == 1 and mid['wards_cleared'] == 1
+    assert mid['kill_participation'] == pytest.approx(50.0)
+    assert mid['first_blood_participation'] is True
+    assert final['players']['b_jg']['kill_participation'] == pytest.approx(100.0)
+    assert final['players']['r_mid']['deaths_in_lane'] == 1
+
+    # The raw payload feeds the same columnar transform as batch ingestion
+    rows = {p['id']: p for p in final['match']['players']}
+    assert rows['b_mid']['game_result'] == 'WIN' and rows['r_mid']['game_result'] == 'LOSS'
+    transformed = MicroSkillETL().transform_to_dataframe([final['match']]).set_index('player_id')
+    assert transformed.loc['b_mid', 'cs_at_10'] == mid['cs_at_10']
+    assert transformed.loc['b_mid', 'kill_participation'] == pytest.approx(mid['kill_participation'])
+
+
+def test_final_snapshot_is_loaded_through_api(event_file, tmp_path, monkeypatch):
+    from api import app as api_module
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'live.db'}")
+    monkeypatch.setattr(api_module.etl, 'loader', MicroSkillLoader(engine))
+    monkeypatch.setattr(api_module.etl, 'parquet_store', None)
+    monkeypatch.setattr(api_module.etl, 'online_learning', False)
+    api_module.app.config['TESTING'] = True
+    client = api_module.app.test_client()
+
+    class TestClientSink:
+        def push(self, snapshot):
+            response = client.post(f"/api/live/matches/{snapshot['match_id']}", json=snapshot)
+            assert response.status_code == 200
+
+    class RecordingSink(TestClientSink):
+        def push(self, snapshot):
+            super().push(snapshot)
+            if not snapshot['final']:
+                live.append(client.get(f"/api/live/matches/{snapshot['match_id']}").json)
+
+    live = []
+    LiveIngestor(RecordingSink(), snapshot_interval=300).run(FileEventSource(event_file))
+
+    assert live and live[-1]['final'] is False and live[-1]['players']['b_mid']['cs_at_10'] == 80
+    # Once the final snapshot is loaded the match is served from the database only
+    assert client.get('/api/live/matches/m1').status_code == 404
+    assert 'm1' not in api_module.live_snapshots
+
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM player_micro_skills WHERE match_id = 'm1'")).scalar()
+    assert count == len(PLAYERS)
+    assert client.get('/api/live/matches/unknown').status_code == 404
+
+
+def test_abandoned_live_matches_expire(monkeypatch):
+    from api import app as api_module
+
+    monkeypatch.setenv('LIVE_SNAPSHOT_TTL_SECONDS', '60')
+    monkeypatch.setattr(api_module, 'live_snapshots', {})
+    client = api_module.app.test_client()
+    clock = iter([1000.0, 1050.0, 1100.0])
+    monkeypatch.setattr(api_module.time, 'monotonic', lambda: next(clock))
+
+    for match_id in ('stalled', 'other', 'latest'):
+        assert client.post(f'/api/live/matches/{match_id}', json={'match': {}, 'game_time': 60}).status_code == 200
+    assert sorted(api_module.live_snapshots) == ['latest', 'other']
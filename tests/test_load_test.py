@@ -0,0 +1,51 @@
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.app import create_app
+from api.components import AppComponents
+from benchmarks.load_test import PAGE_VIEWS, _route, run_load_test, seeded_database, summarize
+
+
+@pytest.fixture
+def api_server(tmp_path):
+    """The API on a real socket, backed by a freshly seeded database"""
+    with seeded_database(2000, str(tmp_path / 'load.db')) as db:
+        server = make_server('127.0.0.1', 0, create_app(AppComponents(db['url'])), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_port}', db['player_ids']
+        server.shutdown()
+
+
+def test_summarize_reports_percentiles_and_errors():
+    samples = [('GET /a', latency / 1000, 200) for latency in range(1, 101)]
+    samples += [('GET /a', 0.5, 500), ('page dashboard', 0.2, 200)]
+    summary = summarize(samples, seconds=2.0)
+
+    route = summary['routes']['GET /a']
+    assert route['requests'] == 101
+    assert route['errors'] == 1
+    assert route['p50_ms'] == pytest.approx(51.0)
+    assert route['p99_ms'] > route['p95_ms'] > route['p50_ms']
+    assert summary['throughput_rps'] == pytest.approx(50.5)
+    assert summary['pages']['dashboard']['requests'] == 1
+
+
+def test_load_test_replays_frontend_mix(api_server):
+    base_url, player_ids = api_server
+    report = run_load_test(base_url, player_ids, levels=[1, 2], duration=1.0, warmup=0)
+
+    assert [level['concurrency'] for level in report['levels']] == [1, 2]
+    known_routes = {_route(method, template) for views in PAGE_VIEWS.values() for method, template, _ in views}
+    for level in report['levels']:
+        assert level['requests'] > 0 and level['throughput_rps'] > 0
+        assert level['error_rate'] == 0.0
+        assert set(level['routes']) <= known_routes
+        assert set(level['pages']) <= set(PAGE_VIEWS)
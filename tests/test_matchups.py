@@ -0,0 +1,132 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.app import create_app
+from api.components import AppComponents
+from benchmarks import datasets
+from data.db_loader import MicroSkillLoader
+from data.matchups import PAIR_COLUMNS, SUM_COLUMNS, rebuild_matchups
+from data.migrations import SchemaMigrator
+
+
+def _matrix(engine):
+    df = pd.read_sql('SELECT * FROM champion_matchups', engine)
+    return df.sort_values(PAIR_COLUMNS).reset_index(drop=True)[PAIR_COLUMNS + SUM_COLUMNS]
+
+
+def _lane(match_id, champion, opponent, result, gold_diff, cs=80.0, opponent_cs=70.0):
+    row = {'match_id': match_id, 'role': 'mid', 'xp_diff_at_10': 0.0}
+    loser = 'LOSS' if result == 'WIN' else 'WIN'
+    return [
+        {**row, 'player_id': f'{match_id}-a', 'champion': champion, 'game_result': result,
+         'gold_diff_at_10': gold_diff, 'cs_at_10': cs},
+        {**row, 'player_id': f'{match_id}-b', 'champion': opponent, 'game_result': loser,
+         'gold_diff_at_10': -gold_diff, 'cs_at_10': opponent_cs},
+    ]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'matchups.db'}")
+
+
+def _assert_matches_rebuild(engine):
+    incremental = _matrix(engine)
+    rebuild_matchups(engine)
+    pd.testing.assert_frame_equal(incremental, _matrix(engine), check_dtype=False)
+    return incremental
+
+
+def test_incremental_updates_match_a_full_rebuild(engine):
+    frame = datasets.skill_frame(2000)
+    loader = MicroSkillLoader(engine, chunk_size=256)
+    # Overlapping batches: the repeated matches must not be counted twice
+    assert loader.load(frame.iloc[:1200])['matchups'] > 0
+    loader.load(frame.iloc[800:])
+    assert loader.load(frame)['matchups'] == 0
+    # Every pair is stored from both sides
+    assert _assert_matches_rebuild(engine)['games'].sum() % 2 == 0
+
+
+def test_updates_and_split_matches_keep_the_matrix_exact(engine):
+    frame = datasets.skill_frame(1000)
+    loader = MicroSkillLoader(engine, chunk_size=64)
+    # Half of each match's players first, the other half in a later load
+    first_half = frame.groupby('match_id').head(5)
+    loader.load(first_half)
+    loader.load(frame.drop(first_half.index))
+    _assert_matches_rebuild(engine)
+
+    # Re-sync with corrected values: a champion swap and new lane numbers
+    corrected = frame.iloc[:300].copy()
+    corrected['champion'] = corrected['champion'].where(corrected.index % 3 != 0, 'Teemo')
+    corrected['gold_diff_at_10'] += 100
+    corrected['game_result'] = corrected['game_result'].where(corrected.index % 7 != 0, 'LOSS')
+    stats = loader.load(corrected)
+    assert stats['updated'] > 0 and stats['matchups'] > 0
+    _assert_matches_rebuild(engine)
+
+
+def test_matrix_and_rows_commit_together(engine, monkeypatch):
+    frame = datasets.skill_frame(200)
+    loader = MicroSkillLoader(engine)
+    monkeypatch.setattr(loader, '_records', _failing_on_matchups(loader._records))
+    with pytest.raises(RuntimeError):
+        loader.load(frame)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql('SELECT COUNT(*) FROM player_micro_skills').scalar() == 0
+
+    # The retry still sees every row as new and counts it
+    monkeypatch.undo()
+    assert loader.load(frame)['inserted'] == len(frame)
+    _assert_matches_rebuild(engine)
+
+
+def _failing_on_matchups(records):
+    def wrapped(df, columns):
+        if 'opponent' in columns:
+            raise RuntimeError('matrix write failed')
+        return records(df, columns)
+    return wrapped
+
+
+def test_migration_pairs_existing_rows(engine):
+    MicroSkillLoader(engine).load(datasets.skill_frame(500))
+    expected = _matrix(engine)
+    migrator = SchemaMigrator(engine)
+    migrator.downgrade(4)
+    assert migrator.upgrade() == [5]
+    pd.testing.assert_frame_equal(_matrix(engine), expected, check_dtype=False)
+
+
+def test_matchups_endpoint_ranks_best_and_worst(engine):
+    rows = (
+        _lane('m1', 'Azir', 'Ahri', 'WIN', 500) + _lane('m2', 'Azir', 'Ahri', 'WIN', 300)
+        + _lane('m3', 'Azir', 'Syndra', 'WIN', 100) + _lane('m4', 'Azir', 'Syndra', 'LOSS', -200)
+        + _lane('m5', 'Azir', 'LeBlanc', 'LOSS', -400) + _lane('m6', 'Azir', 'LeBlanc', 'LOSS', -600)
+        + _lane('m7', 'Azir', 'Orianna', 'WIN', 0)
+    )
+    MicroSkillLoader(engine).load(pd.DataFrame(rows))
+    components = AppComponents()
+    components.engine = engine
+    client = create_app(components).test_client()
+
+    body = client.get('/api/champions/Azir/matchups?min_games=2&limit=1').json
+    assert body['role'] == 'mid' and body['matchups'] == 3
+    assert [m['opponent'] for m in body['best']] == ['Ahri']
+    assert body['best'][0] == {'opponent': 'Ahri', 'games': 2, 'win_rate': 100.0, 'avg_gold_diff_at_10': 400.0,
+                               'avg_xp_diff_at_10': 0.0, 'avg_cs_at_10': 80.0, 'avg_cs_diff_at_10': 10.0}
+    assert [m['opponent'] for m in body['worst']] == ['LeBlanc']
+
+    # The opponent's side of the same games
+    leblanc = client.get('/api/champions/LeBlanc/matchups?min_games=1').json
+    assert leblanc['best'][0]['opponent'] == 'Azir' and leblanc['best'][0]['win_rate'] == 100.0
+
+    assert client.get('/api/champions/Teemo/matchups').status_code == 404
@@ -0,0 +1,140 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+pytest.importorskip('pyarrow')
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.db_loader import MicroSkillLoader
+from data.etl_pipeline import MicroSkillETL
+from data.parquet_store import ParquetStore
+from models.benchmark_comparator import BenchmarkComparator
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    rows = pd.DataFrame({
+        'match_id': ['m1', 'm1', 'm2', 'm3'],
+        'player_id': ['a', 'b', 'a', 'c'],
+        'role': pd.Categorical(['mid', 'top', 'mid', 'mid']),
+        'cs_at_10': [80.0, 70.0, 90.0, 100.0],
+        'vision_score_per_min': [1.0, 0.8, 1.2, 1.4],
+        'kill_participation': [50.0, 40.0, 60.0, 70.0],
+        'created_at': pd.to_datetime(['2026-01-05', '2026-01-06', '2026-02-01', '2026-03-01'])
+    })
+    assert store.write(rows) == 4
+    return store
+
+
+def test_read_prunes_partitions_and_projects_columns(store):
+    df = store.read(columns=['player_id', 'cs_at_10'], roles=['mid'], start_month='2026-02')
+    assert list(df.columns) == ['player_id', 'cs_at_10']
+    assert sorted(df['cs_at_10']) == [90.0, 100.0]
+
+    top = store.read(roles=['top'])
+    assert top['month'].tolist() == ['2026-01']
+
+
+def test_months_come_from_game_date(tmp_path):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    store.write(pd.DataFrame({
+        'match_id': ['old', 'new'],
+        'player_id': ['a', 'a'],
+        'role': ['mid', 'mid'],
+        'cs_at_10': [80.0, 90.0],
+        # A backfill: ingested today, played years apart; one game has no date
+        'game_date': ['2023-05-02T12:00:00Z', None],
+        'created_at': pd.to_datetime(['2026-10-01', '2026-10-01']),
+    }))
+    months = store.read(columns=['match_id', 'month']).set_index('match_id')['month']
+    assert months.to_dict() == {'old': '2023-05', 'new': '2026-10'}
+    assert store.read(columns=['match_id'], end_month='2023-12')['match_id'].tolist() == ['old']
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'parquet.db'}")
+    etl = MicroSkillETL()
+    matches = [etl.extract_match_data(str(i)) for i in range(6)]
+    for i, match in enumerate(matches):
+        match['game_date'] = f'202{i % 3}-0{i % 9 + 1}-01T00:00:00Z'
+    MicroSkillLoader(engine).load(etl.transform_to_dataframe(matches))
+    return engine
+
+
+def test_export_seeds_the_full_history(engine, tmp_path):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    store.write(pd.DataFrame({'match_id': ['stale'], 'player_id': ['x'], 'role': ['mid']}))
+    assert not store.is_complete()
+
+    assert store.export_from_database(engine, chunk_size=5) == 12
+    assert store.is_complete()
+    df = store.read(columns=['match_id', 'month'])
+    assert len(df) == 12 and 'stale' not in set(df['match_id'])
+    assert sorted(df['month'].unique()) == ['2020-01', '2020-04', '2021-02', '2021-05', '2022-03', '2022-06']
+
+
+def test_role_benchmarks_use_parquet_only_once_exported(engine, tmp_path, monkeypatch):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    monkeypatch.setenv('PARQUET_DATASET_DIR', store.root)
+    store.write(pd.DataFrame({'match_id': ['m'], 'player_id': ['p'], 'role': ['mid'], 'cs_at_10': [10.0],
+                              'vision_score_per_min': [0.1], 'kill_participation': [5.0]}))
+    # Only the recent load is in the dataset: the database answers instead
+    comparator = BenchmarkComparator(engine)
+    assert comparator.parquet_store is None
+    assert comparator.calculate_role_benchmarks('mid')['cs_at_10_p50'] == pytest.approx(91.5)
+
+    store.export_from_database(engine)
+    benchmarks = BenchmarkComparator(engine).calculate_role_benchmarks('mid')
+    assert benchmarks['cs_at_10_p50'] == pytest.approx(91.5)
+    assert benchmarks['cs_at_10_p90'] == pytest.approx(95.0)
+
+
+def test_reads_keep_the_latest_version_of_a_row(tmp_path):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    first = pd.DataFrame({'match_id': ['m1', 'm1'], 'player_id': ['a', 'b'], 'role': ['mid', 'top'],
+                          'cs_at_10': [80.0, 70.0]})
+    store.write(first)
+    store.write(first.iloc[[0]].assign(cs_at_10=95.0))
+
+    df = store.read(columns=['cs_at_10'], roles=['mid'])
+    assert list(df.columns) == ['cs_at_10'] and df['cs_at_10'].tolist() == [95.0]
+    assert sorted(store.read()['cs_at_10']) == [70.0, 95.0]
+
+
+def test_updated_rows_reach_the_dataset(engine, tmp_path):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    store.export_from_database(engine)
+    etl = MicroSkillETL()
+    etl.loader = MicroSkillLoader(engine)
+    etl.parquet_store = store
+
+    # A corrected re-sync of an exported game updates rows rather than inserting them
+    corrected = etl.transform_to_dataframe([etl.extract_match_data('0')])
+    corrected['cs_at_10'] = corrected['cs_at_10'] + 7
+    assert etl.load_to_database(corrected).empty
+    assert etl.last_load_stats['updated'] == len(corrected)
+
+    df = store.read(columns=['match_id', 'player_id', 'cs_at_10'])
+    assert len(df) == 12
+    stored = pd.read_sql('SELECT match_id, player_id, cs_at_10 FROM player_micro_skills', engine)
+    merged = df.merge(stored, on=['match_id', 'player_id'], suffixes=('', '_db'))
+    assert (merged['cs_at_10'] == merged['cs_at_10_db']).all()
+
+
+def test_parquet_failures_are_logged_before_falling_back(engine, tmp_path, monkeypatch, caplog):
+    store = ParquetStore(str(tmp_path / 'dataset'))
+    store.export_from_database(engine)
+    monkeypatch.setenv('PARQUET_DATASET_DIR', store.root)
+    comparator = BenchmarkComparator(engine)
+    monkeypatch.setattr(comparator.parquet_store, 'read', lambda **kwargs: 1 / 0)
+
+    with caplog.at_level('WARNING', logger='models.benchmark_comparator'):
+        assert comparator.calculate_role_benchmarks('mid')['cs_at_10_p50'] == pytest.approx(91.5)
+    assert 'ZeroDivisionError' in caplog.text
@@ -0,0 +1,153 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.performance_predictor import HISTORY_GAMES, PerformancePredictor
+from models.model_registry import ModelRegistry
+from models.compact_forest import CompactForest
+
+
+@pytest.fixture
+def games():
+    rng = np.random.default_rng(0)
+    rows = []
+    for game in range(30):
+        for player in range(4):
+            rows.append({
+                'player_id': f'p{player}',
+                'created_at': pd.Timestamp('2026-01-01') + pd.Timedelta(hours=game),
+                'cs_at_10': rng.normal(80, 5),
+                'gold_diff_at_10': rng.normal(0, 300),
+                'vision_score_per_min': rng.normal(1.2, 0.2),
+                'kill_participation': rng.normal(60, 10),
+                'damage_per_gold': rng.normal(1.5, 0.3),
+                'kda': rng.normal(3, 1)
+            })
+    # Shuffle so training has to restore time order itself
+    return pd.DataFrame(rows).sample(frac=1, random_state=1)
+
+
+def test_train_reports_scores_and_timing(games):
+    predictor = PerformancePredictor(n_jobs=1)
+    report = predictor.train(games, param_grid={'n_estimators': [5], 'max_depth': [3, None]}, n_splits=3)
+    assert predictor.is_trained
+    assert set(report['metrics']) == {'cv_r2', 'cv_r2_std', 'train_r2', 'test_r2'}
+    assert report['timing']['candidates'] == 2
+    assert report['timing']['cv_splits'] == 3
+    assert report['n_train'] > report['n_test']
+
+
+def test_games_are_ordered_by_play_time_not_ingestion():
+    df = pd.DataFrame({
+        'match_id': ['backfilled', 'live', 'undated'],
+        # A backfill shard ingested an old game after a recent one
+        'created_at': pd.to_datetime(['2026-03-02', '2026-03-01', '2026-02-01']),
+        'game_date': [pd.Timestamp('2025-06-01'), pd.Timestamp('2026-02-28'), None],
+    })
+    ordered = PerformancePredictor.sort_chronologically(df)
+    assert ordered['match_id'].tolist() == ['backfilled', 'undated', 'live']
+
+
+def test_registry_versions_and_rollback(games, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    predictor = PerformancePredictor(n_jobs=1)
+    report = predictor.train(games, param_grid={'n_estimators': [5]}, n_splits=2)
+
+    first = predictor.save_to_registry(registry, report)
+    second = predictor.save_to_registry(registry, report)
+    assert registry.list_versions() == [first, second]
+    assert registry.active_version() == second
+    assert registry.get_metadata(second)['metrics'] == report['metrics']
+
+    assert registry.rollback() == first
+    served = PerformancePredictor(n_jobs=1)
+    served.load_from_registry(registry)
+    assert served.version == first
+    assert served.predict_next_performance(games[games['player_id'] == 'p0'].copy()) != 0.0
+
+
+def test_registry_orders_versions_numerically(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    for version in ('v9999', 'v10000', 'v0002'):
+        os.makedirs(tmp_path / version)
+        (tmp_path / version / ModelRegistry.MODEL_FILE).write_bytes(b'')
+    assert registry.list_versions() == ['v0002', 'v9999', 'v10000']
+    assert registry._next_version() == 'v10001'
+
+
+def test_compact_forest_matches_sklearn(games, tmp_path):
+    predictor = PerformancePredictor(n_jobs=1)
+    predictor.train(games, param_grid={'n_estimators': [10], 'max_depth': [None]}, n_splits=2)
+    X, _ = predictor.prepare_features(predictor.sort_chronologically(games))
+
+    path = str(tmp_path / 'forest.bin')
+    predictor.export_compact(path)
+    compact = CompactForest.load(path)
+    assert isinstance(compact.value, np.ndarray)
+    np.testing.assert_allclose(compact.predict(X), predictor.model.predict(X), rtol=1e-12)
+    np.testing.assert_allclose(compact.predict(X[-1]), predictor.model.predict(X[-1:]), rtol=1e-12)
+
+    # Walks stop at their leaves rather than running to the recorded depth
+    compact.max_depth = 10 ** 9
+    np.testing.assert_allclose(compact.predict(X), predictor.model.predict(X), rtol=1e-12)
+
+
+def test_partial_fit_adds_trees_for_new_games(games, tmp_path, monkeypatch):
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path))
+    predictor = PerformancePredictor(n_jobs=1)
+    predictor.train(games, param_grid={'n_estimators': [5]}, n_splits=2)
+    predictor.save_to_registry()
+
+    online = PerformancePredictor(n_jobs=1)
+    used = online.partial_fit(games.tail(40), n_new_trees=3, max_trees=7)
+    assert used > 0
+    # Warm-started from the registered model, then capped at max_trees
+    assert len(online.model.estimators_) == 7
+    assert online.predict_next_performance(games[games['player_id'] == 'p1'].copy()) != 0.0
+
+
+def test_partial_fit_pairs_new_games_with_stored_history(games, tmp_path, monkeypatch):
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path))
+    ordered = PerformancePredictor.sort_chronologically(games)
+    latest = ordered.groupby('player_id').tail(1)
+    history = ordered.drop(latest.index).groupby('player_id').tail(HISTORY_GAMES)
+
+    predictor = PerformancePredictor(n_jobs=1)
+    predictor.train(ordered.drop(latest.index), param_grid={'n_estimators': [5]}, n_splits=2)
+    predictor.save_to_registry()
+
+    online = PerformancePredictor(n_jobs=1)
+    # One new game per player has no next game of its own to learn from
+    assert online.partial_fit(latest.copy(), n_new_trees=2) == 0
+    # With history, each player's last stored game gets the new game as its target
+    assert online.partial_fit(latest.copy(), history, n_new_trees=2) == 4
+    assert len(online.model.estimators_) == 7
+
+
+def test_partial_fit_replaces_compact_forest_when_registry_is_empty(games, tmp_path, monkeypatch):
+    predictor = PerformancePredictor(n_jobs=1)
+    predictor.train(games, param_grid={'n_estimators': [5]}, n_splits=2)
+    path = str(tmp_path / 'forest.bin')
+    predictor.export_compact(path)
+
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path / 'empty'))
+    online = PerformancePredictor(n_jobs=1)
+    online.load_compact(path)
+    assert online.partial_fit(games.copy()) > 0
+    assert not isinstance(online.model, CompactForest)
+
+
+def test_registry_prune_keeps_newest_and_active(games, tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    predictor = PerformancePredictor(n_jobs=1)
+    predictor.train(games, param_grid={'n_estimators': [2]}, n_splits=2)
+    versions = [predictor.save_to_registry(registry) for _ in range(4)]
+    registry.activate(versions[0])
+
+    assert registry.prune(2) == [versions[1]]
+    assert registry.list_versions() == [versions[0], versions[2], versions[3]]
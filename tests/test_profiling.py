@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.app import create_app
+from api.components import AppComponents
+from api.profiling import PROFILE_HEADER, RequestProfiler
+from data.migrations import migrate
+
+TOKEN = 'secret'
+AUTH = {PROFILE_HEADER: TOKEN}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path / 'profiles'))
+    monkeypatch.delenv('PROFILE_SAMPLE_RATE', raising=False)
+    monkeypatch.setenv('PROFILE_TOKEN', TOKEN)
+    components = AppComponents(f"sqlite:///{tmp_path / 'profiling.db'}")
+    migrate(components.engine)
+    return create_app(components).test_client()
+
+
+def _assert_well_nested(profile):
+    stack, last = [], 0
+    for event in profile['events']:
+        assert event['at'] >= last
+        last = event['at']
+        if event['type'] == 'O':
+            stack.append(event['frame'])
+        else:
+            assert stack.pop() == event['frame']
+    assert stack == []
+
+
+def test_profiler_records_nested_calls():
+    def inner():
+        return sorted([3, 1, 2])
+
+    def outer():
+        return inner()
+
+    profiler = RequestProfiler()
+    profiler.start()
+    outer()
+    profiler.stop()
+
+    document = profiler.to_speedscope('test')
+    names = [frame['name'] for frame in document['shared']['frames']]
+    assert any(name.endswith('outer') for name in names)
+    assert any(name.endswith('inner') for name in names)
+    assert 'builtins.sorted' in names
+    _assert_well_nested(document['profiles'][0])
+
+
+def test_header_captures_a_speedscope_profile(client):
+    assert client.get('/api/players/faker/trends').headers.get('X-Profile-Id') is None
+
+    response = client.get('/api/players/faker/trends', headers=AUTH)
+    assert response.status_code == 200
+    assert sys.getprofile() is None
+    capture_id = response.headers['X-Profile-Id']
+
+    captures = client.get('/api/profiles', headers=AUTH).json['captures']
+    assert [c['id'] for c in captures] == [capture_id]
+    assert captures[0]['path'] == '/api/players/faker/trends'
+    assert captures[0]['duration_ms'] > 0
+
+    document = json.loads(client.get(f'/api/profiles/{capture_id}', headers=AUTH).data)
+    assert document['profiles'][0]['type'] == 'evented'
+    assert any(frame['name'] == 'read_query' for frame in document['shared']['frames'])
+    _assert_well_nested(document['profiles'][0])
+
+    assert client.get('/api/profiles/missing', headers=AUTH).status_code == 404
+
+
+def test_sampling_and_token(client, monkeypatch):
+    monkeypatch.setenv('PROFILE_SAMPLE_RATE', '1.0')
+    capture_id = client.get('/api/health').headers['X-Profile-Id']
+
+    monkeypatch.setenv('PROFILE_SAMPLE_RATE', '0')
+    assert 'X-Profile-Id' not in client.get('/api/health', headers={PROFILE_HEADER: '1'}).headers
+    assert client.get('/api/profiles').status_code == 403
+    assert client.get(f'/api/profiles/{capture_id}', headers={PROFILE_HEADER: 'guess'}).status_code == 403
+
+    # Without a token nobody can switch profiling on or read the captures
+    monkeypatch.delenv('PROFILE_TOKEN')
+    assert 'X-Profile-Id' not in client.get('/api/health', headers={PROFILE_HEADER: '1'}).headers
+    assert client.get('/api/profiles', headers={PROFILE_HEADER: '1'}).status_code == 403
+
+
+def test_old_captures_are_pruned(client, monkeypatch, tmp_path):
+    monkeypatch.setenv('PROFILE_MAX_FILES', '2')
+    ids = [client.get('/api/health', headers=AUTH).headers['X-Profile-Id'] for _ in range(4)]
+    listed = [c['id'] for c in client.get('/api/profiles', headers=AUTH).json['captures']]
+    assert len(listed) == 2 and set(listed) <= set(ids)
+    # The index shrinks with the files instead of growing forever
+    with open(tmp_path / 'profiles' / 'index.jsonl') as f:
+        assert sorted(json.loads(line)['id'] for line in f) == sorted(listed)
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.db_loader import MicroSkillLoader
+from data.queries import get_engine, read_query, recent_games, similar_players
+
+
+def _row(match_id, player_id, role, champion, cs, result='WIN'):
+    return {
+        'match_id': match_id, 'player_id': player_id, 'player_name': player_id.title(),
+        'role': role, 'champion': champion, 'game_result': result, 'cs_at_10': cs,
+        'vision_score_per_min': 1.0, 'kill_participation': 60.0, 'damage_per_gold': 1.2,
+        'kda': cs / 20, 'gold_diff_at_10': 100.0
+    }
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    rows = [
+        _row('m1', 'faker', 'mid', 'Azir', 80),
+        _row('m2', 'faker', 'mid', 'Ahri', 90, 'LOSS'),
+        _row('m3', 'faker', 'mid', 'Azir', 100),
+        _row('m1', 'chovy', 'mid', 'Syndra', 88),
+        _row('m2', 'zeus', 'top', 'Jayce', 40),
+    ]
+    MicroSkillLoader(engine).load(pd.DataFrame(rows))
+    return engine
+
+
+def test_player_queries_bind_parameters(engine):
+    profile = read_query('player_profile', engine, player_id='faker')
+    assert profile.to_dict('records') == [{'player_name': 'Faker', 'role': 'mid'}]
+
+    assert len(read_query('player_rows', engine, player_id='faker')) == 3
+    assert len(read_query('player_history', engine, player_id='faker')) == 3
+
+    champions = read_query('player_champions', engine, player_id='faker')
+    assert champions.iloc[0]['champion'] == 'Azir'
+    assert champions.iloc[0]['games'] == 2
+    assert champions.iloc[0]['win_rate'] == pytest.approx(100.0)
+
+    averages = read_query('role_averages', engine, role='mid').iloc[0]
+    assert averages['cs_at_10_avg'] == pytest.approx((80 + 90 + 100 + 88) / 4)
+
+
+def test_ids_are_never_interpolated(engine):
+    injected = "faker' OR '1'='1"
+    assert read_query('player_rows', engine, player_id=injected).empty
+    assert read_query('player_trends', engine, player_id=injected).empty
+
+
+def test_similar_players_ranks_by_distance(engine):
+    similar = similar_players('faker', top_n=2, engine=engine)
+    assert [p['player_id'] for p in similar] == ['chovy', 'zeus']
+    assert similar[0]['similarity_score'] == pytest.approx(2.0)
+    assert similar_players('nobody', engine=engine) == []
+
+
+def test_api_reads_database_instead_of_mock(engine, monkeypatch):
+    from api import app as api_module
+    from api.components import AppComponents
+
+    components = AppComponents()
+    components.engine = engine
+    monkeypatch.setitem(api_module.app.extensions, 'micromentor', components)
+    client = api_module.app.test_client()
+
+    trends = client.get('/api/players/faker/trends').json
+    assert [t['cs_at_10'] for t in trends] == [80, 90, 100]
+    assert client.get('/api/players/faker/profile').json['data_source'] == 'database'
+    assert client.get('/api/players/faker/history').status_code == 200
+    assert client.get('/api/players/faker/similar?top_n=1').json[0]['player_id'] == 'chovy'
+
+
+def test_engine_is_shared_per_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    assert get_engine(url) is get_engine(url)
+
+
+def test_recent_games_follow_game_date(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'recent.db'}")
+    rows = pd.DataFrame({
+        'match_id': ['old', 'new', 'older'], 'player_id': 'p', 'role': 'mid', 'kda': [1.0, 2.0, 3.0],
+        'game_date': pd.to_datetime(['2025-02-01', '2025-03-01', '2025-01-01']),
+    })
+    MicroSkillLoader(engine).load(rows)
+    # Ingested newest game first, as a reverse-ordered backfill would
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE player_micro_skills SET created_at = CASE match_id "
+            "WHEN 'new' THEN '2026-01-01' WHEN 'old' THEN '2026-01-02' ELSE '2026-01-03' END"
+        )
+    recent = recent_games(['p'], 2, engine)
+    assert recent['match_id'].tolist() == ['old', 'new']
@@ -0,0 +1,86 @@
+import json
+import os
+import sys
+import time
+import zipfile
+
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.reports import RosterReportJob, build_player_report, render_html
+
+
+def test_player_report_has_every_section():
+    report = build_player_report('ankit')
+    assert set(report['sections']) == {
+        'profile', 'micro_skills', 'benchmarks', 'insights', 'macro_review', 'improvement_plan'
+    }
+    assert report['sections']['profile']['player_id'] == 'ankit'
+    html = render_html(report).decode()
+    assert 'Improvement Plan' in html and '<script' not in html
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_roster_job_writes_archive_with_timings(tmp_path, processes):
+    job = RosterReportJob(['ankit', 'faker'], opponents=['chovy'], processes=processes,
+                          output_root=str(tmp_path))
+    summary = job.run()
+
+    assert summary['status'] == 'done'
+    assert [(p['group'], p['player_id']) for p in summary['players']] == [
+        ('roster', 'ankit'), ('roster', 'faker'), ('opponents', 'chovy')
+    ]
+    assert all(p['status'] == 'ok' and p['seconds'] >= 0 for p in summary['players'])
+
+    with zipfile.ZipFile(job.archive_path) as archive:
+        names = set(archive.namelist())
+        manifest = json.loads(archive.read('manifest.json'))
+    assert names == {'roster/ankit.html', 'roster/faker.html', 'opponents/chovy.html', 'manifest.json'}
+    assert manifest['job_id'] == job.job_id and len(manifest['players']) == 3
+    assert manifest['status'] == 'done'
+
+
+def test_job_is_done_only_after_its_archive_is_written(tmp_path, monkeypatch):
+    job = RosterReportJob(['ankit'], processes=1, output_root=str(tmp_path))
+    write_archive = job._write_archive
+    seen = []
+
+    def observed(manifest):
+        seen.append((job.status, job.archive_path))
+        return write_archive(manifest)
+
+    monkeypatch.setattr(job, '_write_archive', observed)
+    assert job.run()['status'] == 'done'
+    assert seen == [('running', None)]
+    assert os.path.exists(job.archive_path)
+
+
+def test_pdf_reports_render():
+    pytest.importorskip('matplotlib')
+    from api.reports import render_pdf
+    assert render_pdf(build_player_report('ankit')).startswith(b'%PDF')
+
+
+def test_report_endpoints(tmp_path, monkeypatch):
+    from api.app import app
+
+    monkeypatch.setenv('REPORT_OUTPUT_DIR', str(tmp_path))
+    client = app.test_client()
+    assert client.post('/api/reports/roster', json={}).status_code == 400
+    assert client.post('/api/reports/roster', json={'roster': ['a'], 'format': 'docx'}).status_code == 400
+
+    response = client.post('/api/reports/roster', json={'roster': ['ankit'], 'processes': 1})
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+
+    deadline = time.time() + 30
+    while client.get(f'/api/reports/{job_id}').json['status'] not in ('done', 'failed'):
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+    download = client.get(f'/api/reports/{job_id}/download')
+    assert download.status_code == 200
+    assert download.mimetype == 'application/zip'
+    assert client.get('/api/reports/missing').status_code == 404
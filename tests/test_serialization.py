@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import sys
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import create_engine
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import serialization
+from api.components import AppComponents
+from api.serialization import dumps, frame_payload
+from data.db_loader import MicroSkillLoader
+
+
+def test_frame_payload_formats_and_precision():
+    df = pd.DataFrame({
+        'game_date': pd.to_datetime(['2024-01-01', '2024-01-02']),
+        'kda': [3.14159, np.nan],
+        'games': np.array([3, 4], dtype='int64'),
+        'champion': ['Azir', None],
+    })
+
+    records = frame_payload(df, precision=2)
+    assert records == [
+        {'game_date': 'Mon, 01 Jan 2024 00:00:00 GMT', 'kda': 3.14, 'games': 3, 'champion': 'Azir'},
+        {'game_date': 'Tue, 02 Jan 2024 00:00:00 GMT', 'kda': None, 'games': 4, 'champion': None},
+    ]
+
+    columns = frame_payload(df, 'columns')
+    assert columns['columns'] == ['game_date', 'kda', 'games', 'champion']
+    assert columns['data']['kda'] == [3.14159, None]
+    assert columns['length'] == 2
+
+    with pytest.raises(ValueError):
+        frame_payload(df, 'rows')
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_dumps_emits_valid_json(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(serialization, 'orjson', None)
+    payload = {'kda': float('nan'), 'games': np.int64(3), 'when': pd.Timestamp('2024-01-01'),
+               'played': datetime(2024, 1, 2, 12, 30), 'day': date(2024, 1, 3)}
+    assert json.loads(dumps(payload)) == {
+        'kda': None, 'games': 3, 'when': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        'played': 'Tue, 02 Jan 2024 12:30:00 GMT', 'day': 'Wed, 03 Jan 2024 00:00:00 GMT'
+    }
+    # The same strings Flask's jsonify produced before the fast encoder
+    with Flask(__name__).app_context():
+        assert json.loads(dumps(payload))['played'] == json.loads(jsonify(payload['played']).data)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from api import app as api_module
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'serialization.db'}")
+    rows = [{
+        'match_id': f'm{i}', 'player_id': 'faker', 'player_name': 'Faker', 'role': 'mid',
+        'champion': 'Azir', 'game_result': 'WIN', 'cs_at_10': 80 + i / 3, 'kda': 4 + i / 7,
+        'vision_score_per_min': 1.0 + i / 9, 'kill_participation': 60.0
+    } for i in range(20)]
+    MicroSkillLoader(engine).load(pd.DataFrame(rows))
+    components = AppComponents()
+    components.engine = engine
+    monkeypatch.setitem(api_module.app.extensions, 'micromentor', components)
+    return api_module.app.test_client()
+
+
+def test_default_shape_is_unchanged(client):
+    trends = client.get('/api/players/faker/trends').json
+    assert isinstance(trends, list) and len(trends) == 20
+    assert set(trends[0]) == {'game_date', 'cs_at_10', 'vision_score_per_min', 'kill_participation',
+                              'kda', 'game_result', 'champion'}
+
+
+def test_columns_format_and_rounding(client):
+    response = client.get('/api/players/faker/trends?format=columns&precision=1')
+    body = response.json
+    assert body['length'] == 20
+    assert all(round(v, 1) == v for v in body['data']['kda'])
+
+    assert client.get('/api/players/faker/champions?format=columns').json['data']['games'] == [20]
+    assert client.get('/api/players/faker/history?format=xml').status_code == 400
+
+
+def test_large_responses_are_compressed(client, monkeypatch):
+    monkeypatch.setattr(serialization, 'MIN_COMPRESS_BYTES', 0)
+    plain = client.get('/api/players/faker/trends')
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed = client.get('/api/players/faker/trends', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['Vary'] == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(compressed.data)) == plain.json
+
+    refused = client.get('/api/players/faker/trends', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers